@@ -0,0 +1,40 @@
+"""one aggregate report row per user
+
+Revision ID: 3f1c9a7d2e45
+Revises: b9d042068fa2
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3f1c9a7d2e45'
+down_revision: Union[str, Sequence[str], None] = 'b9d042068fa2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Collapse duplicate report rows by rebuilding them from quiz_attempts
+    op.execute("DELETE FROM reports")
+    op.execute(
+        """
+        INSERT INTO reports (userId, totalAttempts, correctCount, awarenessScore)
+        SELECT userId,
+               COUNT(attemptId),
+               COALESCE(SUM(isCorrect), 0),
+               ROUND(COALESCE(SUM(isCorrect), 0) * 100.0 / COUNT(attemptId), 1)
+        FROM quiz_attempts
+        GROUP BY userId
+        """
+    )
+    op.create_unique_constraint('uq_reports_userId', 'reports', ['userId'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_reports_userId', 'reports', type_='unique')
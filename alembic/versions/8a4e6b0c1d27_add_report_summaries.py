@@ -0,0 +1,56 @@
+"""add report_summaries table
+
+Revision ID: 8a4e6b0c1d27
+Revises: 3f1c9a7d2e45
+Create Date: 2026-10-18 10:03:17.942260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '8a4e6b0c1d27'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2e45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('report_summaries',
+    sa.Column('department', sa.String(length=255), nullable=False),
+    sa.Column('participants', sa.Integer(), nullable=False),
+    sa.Column('totalAttempts', sa.Integer(), nullable=False),
+    sa.Column('correctCount', sa.Integer(), nullable=False),
+    sa.Column('scoreSum', sa.Float(), nullable=False),
+    sa.Column('averageScore', sa.Float(), nullable=False),
+    sa.Column('topUsers', sa.JSON(), nullable=True),
+    sa.Column('bottomUsers', sa.JSON(), nullable=True),
+    sa.Column('updatedAt', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('department')
+    )
+
+    # Seed the counters. The leaderboards are built by the first worker to
+    # start (its full summary rebuild), or up front by recompute_reports.py.
+    op.execute(
+        """
+        INSERT INTO report_summaries
+            (department, participants, totalAttempts, correctCount, scoreSum, averageScore)
+        SELECT COALESCE(u.department, ''),
+               COUNT(r.reportId),
+               SUM(r.totalAttempts),
+               SUM(r.correctCount),
+               SUM(r.awarenessScore),
+               ROUND(SUM(r.awarenessScore) / COUNT(r.reportId), 1)
+        FROM reports r
+        JOIN users u ON u.userId = r.userId
+        GROUP BY COALESCE(u.department, '')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('report_summaries')
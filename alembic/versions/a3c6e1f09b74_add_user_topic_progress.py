@@ -0,0 +1,39 @@
+"""add user_topic_progress table
+
+Revision ID: a3c6e1f09b74
+Revises: f1a8e03c5b92
+Create Date: 2026-10-18 14:21:47.205316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a3c6e1f09b74'
+down_revision: Union[str, Sequence[str], None] = 'f1a8e03c5b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema. Fill it from quiz_attempts with recompute_reports.py."""
+    op.create_table('user_topic_progress',
+    sa.Column('userId', sa.Integer(), nullable=False),
+    sa.Column('topicId', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('correctCount', sa.Integer(), nullable=False),
+    sa.Column('mastery', sa.Float(), nullable=False),
+    sa.Column('lastAttemptAt', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['userId'], ['users.userId'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['topicId'], ['topics.topicId'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('userId', 'topicId')
+    )
+    op.create_index('ix_user_topic_progress_topicId', 'user_topic_progress', ['topicId'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_topic_progress_topicId', table_name='user_topic_progress')
+    op.drop_table('user_topic_progress')
@@ -0,0 +1,31 @@
+"""add download_flush_batches table
+
+Revision ID: a8d3e6f1c725
+Revises: f2b7c4e8a913
+Create Date: 2026-10-18 19:27:13.350871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a8d3e6f1c725'
+down_revision: Union[str, Sequence[str], None] = 'f2b7c4e8a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('download_flush_batches',
+    sa.Column('batchId', sa.String(length=36), nullable=False),
+    sa.Column('appliedAt', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('batchId')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('download_flush_batches')
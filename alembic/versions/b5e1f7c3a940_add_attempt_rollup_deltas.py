@@ -0,0 +1,35 @@
+"""add attempt_rollup_deltas table
+
+Revision ID: b5e1f7c3a940
+Revises: a8d3e6f1c725
+Create Date: 2026-10-18 21:04:52.618307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b5e1f7c3a940'
+down_revision: Union[str, Sequence[str], None] = 'a8d3e6f1c725'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('attempt_rollup_deltas',
+    sa.Column('deltaId', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('scope', sa.String(length=20), nullable=False),
+    sa.Column('scopeKey', sa.String(length=255), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('correctCount', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('deltaId')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('attempt_rollup_deltas')
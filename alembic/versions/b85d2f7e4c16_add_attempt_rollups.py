@@ -0,0 +1,35 @@
+"""add attempt_rollups table
+
+Revision ID: b85d2f7e4c16
+Revises: a3c6e1f09b74
+Create Date: 2026-10-18 15:02:36.918442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b85d2f7e4c16'
+down_revision: Union[str, Sequence[str], None] = 'a3c6e1f09b74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema. Fill it from quiz_attempts with backfill_rollups.py."""
+    op.create_table('attempt_rollups',
+    sa.Column('period', sa.String(length=10), nullable=False),
+    sa.Column('scope', sa.String(length=20), nullable=False),
+    sa.Column('scopeKey', sa.String(length=255), nullable=False),
+    sa.Column('bucket', sa.Date(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('correctCount', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('period', 'scope', 'scopeKey', 'bucket')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('attempt_rollups')
@@ -0,0 +1,33 @@
+"""policy content hash, size and original filename
+
+Revision ID: c52d8e19f3a6
+Revises: 8a4e6b0c1d27
+Create Date: 2026-10-18 11:26:54.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c52d8e19f3a6'
+down_revision: Union[str, Sequence[str], None] = '8a4e6b0c1d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('policies', sa.Column('fileName', sa.String(length=255), nullable=True))
+    op.add_column('policies', sa.Column('fileSize', sa.Integer(), nullable=True))
+    op.add_column('policies', sa.Column('contentHash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_policies_contentHash'), 'policies', ['contentHash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_policies_contentHash'), table_name='policies')
+    op.drop_column('policies', 'contentHash')
+    op.drop_column('policies', 'fileSize')
+    op.drop_column('policies', 'fileName')
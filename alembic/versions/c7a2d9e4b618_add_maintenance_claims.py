@@ -0,0 +1,31 @@
+"""add maintenance_claims table
+
+Revision ID: c7a2d9e4b618
+Revises: b5e1f7c3a940
+Create Date: 2026-10-18 22:12:40.581934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c7a2d9e4b618'
+down_revision: Union[str, Sequence[str], None] = 'b5e1f7c3a940'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('maintenance_claims',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('claimedAt', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('maintenance_claims')
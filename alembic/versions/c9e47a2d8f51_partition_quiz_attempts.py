@@ -0,0 +1,97 @@
+"""partition quiz_attempts by month, add quiz_attempts_archive
+
+Revision ID: c9e47a2d8f51
+Revises: b85d2f7e4c16
+Create Date: 2026-10-18 15:48:12.503917
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c9e47a2d8f51'
+down_revision: Union[str, Sequence[str], None] = 'b85d2f7e4c16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3   # archive_attempts.py keeps adding them from here on
+
+
+def _month(day: date, months: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """
+    Upgrade schema.
+
+    MySQL only partitions tables whose unique keys all include the
+    partitioning column and which have no foreign keys, so quiz_attempts
+    loses its foreign keys (the application keeps them consistent) and
+    its primary key becomes (attemptId, createdAt). Rebuilds the table:
+    expect it to take a while on a large one.
+    """
+    op.create_table('quiz_attempts_archive',
+    sa.Column('attemptId', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('userId', sa.Integer(), nullable=False),
+    sa.Column('quizId', sa.Integer(), nullable=False),
+    sa.Column('selectedAnswer', sa.String(length=10), nullable=False),
+    sa.Column('isCorrect', sa.Integer(), nullable=False),
+    sa.Column('createdAt', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('attemptId'),
+    mysql_row_format='COMPRESSED'
+    )
+    op.create_index('ix_quiz_attempts_archive_quizId', 'quiz_attempts_archive', ['quizId'])
+    op.create_index('ix_quiz_attempts_archive_userId', 'quiz_attempts_archive', ['userId'])
+
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+
+    foreign_keys = bind.execute(sa.text(
+        "SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS "
+        "WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'quiz_attempts'"
+    )).scalars().all()
+    for name in foreign_keys:
+        op.drop_constraint(name, 'quiz_attempts', type_='foreignkey')
+
+    op.execute("UPDATE quiz_attempts SET createdAt = NOW() WHERE createdAt IS NULL")
+    op.execute(
+        "ALTER TABLE quiz_attempts "
+        "MODIFY createdAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+        "DROP PRIMARY KEY, ADD PRIMARY KEY (attemptId, createdAt)"
+    )
+
+    oldest = bind.execute(sa.text("SELECT MIN(createdAt) FROM quiz_attempts")).scalar()
+    month = _month((oldest or datetime.utcnow()).date())
+    last = _month(datetime.utcnow().date(), MONTHS_AHEAD)
+
+    parts = []
+    while month <= last:
+        parts.append(
+            f"PARTITION p{month:%Y%m} VALUES LESS THAN (TO_DAYS('{_month(month, 1)}'))"
+        )
+        month = _month(month, 1)
+    parts.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+
+    op.execute(
+        "ALTER TABLE quiz_attempts PARTITION BY RANGE (TO_DAYS(createdAt)) "
+        f"({', '.join(parts)})"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema. Archived attempts are not moved back."""
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute("ALTER TABLE quiz_attempts REMOVE PARTITIONING")
+        op.execute("ALTER TABLE quiz_attempts DROP PRIMARY KEY, ADD PRIMARY KEY (attemptId)")
+        op.create_foreign_key(None, 'quiz_attempts', 'users', ['userId'], ['userId'])
+        op.create_foreign_key(None, 'quiz_attempts', 'quizzes', ['quizId'], ['quizId'])
+
+    op.drop_index('ix_quiz_attempts_archive_userId', table_name='quiz_attempts_archive')
+    op.drop_index('ix_quiz_attempts_archive_quizId', table_name='quiz_attempts_archive')
+    op.drop_table('quiz_attempts_archive')
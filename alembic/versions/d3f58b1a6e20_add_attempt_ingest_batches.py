@@ -0,0 +1,34 @@
+"""add attempt_ingest_batches table
+
+Revision ID: d3f58b1a6e20
+Revises: c9e47a2d8f51
+Create Date: 2026-10-18 16:31:05.274190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd3f58b1a6e20'
+down_revision: Union[str, Sequence[str], None] = 'c9e47a2d8f51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('attempt_ingest_batches',
+    sa.Column('batchId', sa.String(length=36), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('appliedAt', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('batchId')
+    )
+    op.create_index('ix_attempt_ingest_batches_appliedAt', 'attempt_ingest_batches', ['appliedAt'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_attempt_ingest_batches_appliedAt', table_name='attempt_ingest_batches')
+    op.drop_table('attempt_ingest_batches')
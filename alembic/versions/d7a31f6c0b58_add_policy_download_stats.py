@@ -0,0 +1,34 @@
+"""add policy_download_stats table
+
+Revision ID: d7a31f6c0b58
+Revises: c52d8e19f3a6
+Create Date: 2026-10-18 12:08:03.671945
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd7a31f6c0b58'
+down_revision: Union[str, Sequence[str], None] = 'c52d8e19f3a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('policy_download_stats',
+    sa.Column('policyId', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['policyId'], ['policies.policyId'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('policyId', 'day', 'kind')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('policy_download_stats')
@@ -0,0 +1,33 @@
+"""policy pdf pipeline metadata
+
+Revision ID: e4b2c9d71a03
+Revises: d7a31f6c0b58
+Create Date: 2026-10-18 12:41:17.902514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e4b2c9d71a03'
+down_revision: Union[str, Sequence[str], None] = 'd7a31f6c0b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('policies', sa.Column('processingStatus', sa.String(length=20), nullable=True))
+    op.add_column('policies', sa.Column('pageCount', sa.Integer(), nullable=True))
+    op.add_column('policies', sa.Column('hasThumbnail', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('policies', sa.Column('processedAt', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('policies', 'processedAt')
+    op.drop_column('policies', 'hasThumbnail')
+    op.drop_column('policies', 'pageCount')
+    op.drop_column('policies', 'processingStatus')
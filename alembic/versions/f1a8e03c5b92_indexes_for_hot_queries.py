@@ -0,0 +1,55 @@
+"""secondary indexes for hot query paths
+
+Revision ID: f1a8e03c5b92
+Revises: e4b2c9d71a03
+Create Date: 2026-10-18 13:05:22.417830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f1a8e03c5b92'
+down_revision: Union[str, Sequence[str], None] = 'e4b2c9d71a03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) — mirrors the Index() entries in app/models.py.
+# On MySQL the composite indexes also take over from the implicit
+# single-column indexes created for the foreign keys.
+INDEXES = [
+    ('ix_quiz_attempts_userId_createdAt', 'quiz_attempts', ['userId', 'createdAt']),
+    ('ix_quiz_attempts_quizId', 'quiz_attempts', ['quizId']),
+    ('ix_quizzes_topicId', 'quizzes', ['topicId']),
+    ('ix_reports_createdAt', 'reports', ['createdAt', 'reportId']),
+    ('ix_users_department_role', 'users', ['department', 'role']),
+    ('ix_users_role', 'users', ['role']),
+    ('ix_policies_createdAt', 'policies', ['createdAt', 'policyId']),
+    ('ix_policies_filePath', 'policies', ['filePath']),
+    ('ix_policy_download_stats_day', 'policy_download_stats', ['day']),
+    ('ix_topics_category', 'topics', ['category']),
+    ('ix_awareness_tips_category', 'awareness_tips', ['category']),
+]
+
+# Foreign key columns that rely on the indexes above once they exist
+FK_COLUMNS = [('quiz_attempts', 'userId'), ('quiz_attempts', 'quizId'), ('quizzes', 'topicId')]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'mysql':
+        # MySQL refuses to drop the only index behind a foreign key:
+        # put back the single-column ones it created implicitly.
+        for table, column in FK_COLUMNS:
+            op.create_index(column, table, [column], unique=False)
+
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
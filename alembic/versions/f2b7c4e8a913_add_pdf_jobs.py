@@ -0,0 +1,31 @@
+"""add pdf_jobs table
+
+Revision ID: f2b7c4e8a913
+Revises: d3f58b1a6e20
+Create Date: 2026-10-18 19:02:44.618305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f2b7c4e8a913'
+down_revision: Union[str, Sequence[str], None] = 'd3f58b1a6e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pdf_jobs',
+    sa.Column('contentHash', sa.String(length=64), nullable=False),
+    sa.Column('claimedAt', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('contentHash')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('pdf_jobs')
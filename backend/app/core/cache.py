@@ -0,0 +1,179 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+# ============================================================
+# TTL / LRU CACHE
+# ============================================================
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float | None = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# ============================================================
+# RESPONSE CACHE (read-mostly catalog endpoints)
+# ============================================================
+class MemoryBackend:
+    """Per-process backend; invalidations are only seen by this worker."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize, ttl)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value):
+        self._entries.set(key, value)
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class RedisBackend:
+    """Shared backend: every worker sees the same entries and invalidations."""
+
+    def __init__(self, url: str, ttl: float):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = int(ttl)
+
+    def get(self, key):
+        raw = self._redis.get(f"cache:{key}")
+        return json.loads(raw) if raw else None
+
+    def set(self, key, value):
+        self._redis.set(f"cache:{key}", json.dumps(value), ex=self._ttl)
+
+    def generation(self, namespace: str) -> int:
+        return int(self._redis.get(f"cache-gen:{namespace}") or 0)
+
+    def bump(self, namespace: str):
+        self._redis.incr(f"cache-gen:{namespace}")
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(t.strip().removeprefix("W/") == etag for t in header.split(","))
+
+
+class ResponseCache:
+    """
+    Caches whole JSON responses per namespace + URL and answers
+    If-None-Match with 304. Writers call invalidate(namespace), which
+    bumps the namespace generation so stale keys are never read again.
+    """
+
+    KEPT_HEADERS = ("x-next-cursor",)
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def _key(self, request: Request, namespace: str) -> str:
+        query = "&".join(sorted(request.url.query.split("&")))
+        generation = self.backend.generation(namespace)
+        return f"{namespace}:{generation}:{request.url.path}?{query}"
+
+    def _respond(self, request: Request, entry: dict) -> Response:
+        headers = dict(entry["headers"])
+        headers["ETag"] = entry["etag"]
+        headers["Cache-Control"] = "no-cache"  # always revalidate, cheaply
+
+        if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(entry["body"], media_type="application/json", headers=headers)
+
+    def lookup(self, request: Request, namespace: str):
+        """
+        Returns (key, response-or-None). Pass the key back to store() so a
+        write that lands while the page is being built invalidates it.
+        """
+        key = self._key(request, namespace)
+        entry = self.backend.get(key)
+        return key, (self._respond(request, entry) if entry else None)
+
+    def store(self, request: Request, key: str, response: Response) -> Response:
+        if response.status_code != 200:
+            return response
+
+        body = response.body.decode()
+        entry = {
+            "body": body,
+            "etag": '"' + hashlib.sha1(body.encode()).hexdigest() + '"',
+            "headers": {k: v for k, v in response.headers.items() if k in self.KEPT_HEADERS},
+        }
+        self.backend.set(key, entry)
+        return self._respond(request, entry)
+
+    def cached(self, request: Request, namespace: str, build) -> Response:
+        key, hit = self.lookup(request, namespace)
+        if hit is not None:
+            return hit
+        return self.store(request, key, build())
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            self.backend.bump(namespace)
+
+
+def _backend():
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(settings.CACHE_URL, settings.CACHE_TTL)
+    return MemoryBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL)
+
+
+response_cache = ResponseCache(_backend())
@@ -1,14 +1,154 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+
+    # "sync" (PyMySQL + threadpool) or "async" (AsyncSession on the hot routes)
+    DB_MODE: str = "sync"
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800        # seconds; keep below MySQL wait_timeout
+    DB_POOL_TIMEOUT: int = 30          # seconds to wait for a free connection
+    DB_POOL_PRE_PING: str = "idle"     # always | idle | never
+    DB_POOL_PRE_PING_IDLE: int = 60    # seconds idle before an "idle" ping
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:3001"
 
+    # Startup: SCHEMA_MODE is "create" (create_all, development), "verify"
+    # (check alembic_version against the head revision) or "skip".
+    # SCHEMA_REVISION overrides the head read from alembic/versions.
+    SCHEMA_MODE: str = "create"
+    SCHEMA_REVISION: Optional[str] = None
+    LAZY_ROUTERS: bool = True
+    STARTUP_BUDGET_MS: int = 1000
+
+    # Request / SQL instrumentation exposed at GET /metrics (per worker).
+    # A request running one statement this many times is flagged as N+1.
+    # Scrapers send METRICS_TOKEN as a bearer token; without one set, only
+    # loopback clients may scrape. /api/metrics/* is SuperAdmin only.
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+    N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Auth: "db" (look the user up on every request), "claims" (trust the
+    # signed token) or "cached" (short-TTL in-process user cache)
+    AUTH_MODE: str = "db"
+    AUTH_USER_CACHE_TTL: int = 60
+    AUTH_USER_CACHE_SIZE: int = 10000
+
+    # Password hashing (bcrypt on a process pool; 0 workers = inline)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Response cache for catalog endpoints: "memory" (per worker) or "redis"
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: Optional[str] = None
+    CACHE_TTL: int = 300
+    CACHE_MAX_ENTRIES: int = 1024
+
+    # Policy uploads
+    POLICY_MAX_UPLOAD_BYTES: int = 50 * 1024 * 1024
+    POLICY_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+
+    # File delivery: "direct", "x-accel" (nginx) or "x-sendfile" (Apache)
+    FILE_DELIVERY_MODE: str = "direct"
+    FILE_ACCEL_PREFIX: str = "/protected/policies/"
+    FILE_CACHE_MAX_AGE: int = 30 * 24 * 3600
+
+    # Policy PDF pipeline: text, page count and first-page thumbnail are
+    # produced on a process pool after upload (0 workers = inline)
+    PDF_WORKERS: int = 1
+    PDF_TEXT_MAX_PAGES: int = 200
+    PDF_THUMBNAIL_WIDTH: int = 320
+    # A render claim older than this is presumed dead and may be retaken
+    PDF_CLAIM_TIMEOUT: int = 900
+
+    # Download hits are journalled to a local SQLite file (shared by the
+    # host's workers) and flushed to the database on this interval.
+    # NORMAL survives a killed process; FULL also survives power loss.
+    DOWNLOAD_FLUSH_INTERVAL: float = 10.0
+    DOWNLOAD_JOURNAL_PATH: str = "var/download-journal.sqlite"
+    DOWNLOAD_JOURNAL_SYNCHRONOUS: str = "NORMAL"
+
+    # Attempt ingestion: "sync" (write to the database in the request) or
+    # "queue" (grade from an in-memory answer key, append to a local SQLite
+    # WAL queue shared by the host's workers, answer 202; a background
+    # writer drains it in batches). When the oldest queued attempt is older
+    # than ATTEMPT_QUEUE_MAX_LAG seconds, requests fall back to sync.
+    ATTEMPT_INGEST_MODE: str = "sync"
+    ATTEMPT_QUEUE_PATH: str = "var/attempt-queue.sqlite"
+    ATTEMPT_QUEUE_SYNCHRONOUS: str = "FULL"   # FULL survives power loss, NORMAL only crashes
+    ATTEMPT_QUEUE_INTERVAL: float = 1.0
+    ATTEMPT_QUEUE_BATCH_SIZE: int = 2000
+    ATTEMPT_QUEUE_MAX_LAG: float = 30.0
+    ATTEMPT_QUEUE_CLAIM_TIMEOUT: float = 120.0  # retake a batch whose writer went quiet
+    ATTEMPT_QUEUE_MAX_FAILURES: int = 5         # then the batch moves to dead_letter
+    ATTEMPT_ANSWER_CACHE_TTL: int = 60
+
+    # Search index (per worker, rebuilt when older than the interval; 0 = never)
+    SEARCH_REINDEX_INTERVAL: int = 300
+
+    # Quiz sessions: per-topic question pools cached in memory (per worker)
+    QUIZ_POOL_TTL: int = 300
+    QUIZ_POOL_MAX_TOPICS: int = 512
+    QUIZ_SESSION_MAX_QUESTIONS: int = 50
+
+    # Reports
+    LEADERBOARD_SIZE: int = 10
+    # Department summaries are rebuilt off the submission path: they lag
+    # committed scores by up to this many seconds
+    SUMMARY_REFRESH_INTERVAL: float = 5.0
+    # A starting worker rebuilds every summary (covering marks a killed
+    # worker lost) unless another did within this many seconds
+    SUMMARY_FULL_REBUILD_WINDOW: int = 300
+    # Department and topic trend rows are folded in off the submission
+    # path too, on this interval; user rows stay current
+    ROLLUP_FOLD_INTERVAL: float = 5.0
+
+    # Topic mastery (0-100): each answer moves it MASTERY_RATE of the way
+    # towards 0 or 100; without practice it halves every MASTERY_HALF_LIFE_DAYS.
+    # Learners below MASTERY_WEAK_THRESHOLD count as weak in department views.
+    MASTERY_RATE: float = 0.2
+    MASTERY_HALF_LIFE_DAYS: float = 90
+    MASTERY_WEAK_THRESHOLD: float = 60
+
+    # GET /api/reports/trends: most buckets one request may ask for
+    TREND_MAX_POINTS: int = 2000
+
+    # GET /api/reports/export: rows fetched per server-side cursor batch
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # archive_attempts.py: attempts older than ARCHIVE_AFTER_DAYS (rounded
+    # down to whole months) move to quiz_attempts_archive, in batches.
+    # On MySQL, monthly partitions are kept PARTITION_MONTHS_AHEAD ahead.
+    ARCHIVE_AFTER_DAYS: int = 730
+    ARCHIVE_BATCH_SIZE: int = 5000
+    PARTITION_MONTHS_AHEAD: int = 3
+
+    # List endpoints (keyset pagination, opt-in via ?limit= or ?cursor=)
+    PAGE_DEFAULT_LIMIT: int = 100
+    PAGE_MAX_LIMIT: int = 1000
+
     @property
     def cors_origins(self) -> List[str]:
         return [o.strip() for o in self.ALLOWED_ORIGINS.split(",") if o.strip()]
 
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+
+        scheme, rest = self.DATABASE_URL.split("://", 1)
+        if scheme.startswith("mysql"):
+            return f"mysql+aiomysql://{rest}"
+        if scheme.startswith("sqlite"):
+            return f"sqlite+aiosqlite://{rest}"
+        return self.DATABASE_URL
+
     model_config = {
         "env_file": ".env",   # ✅ ENABLE .env
         "extra": "ignore"
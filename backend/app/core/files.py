@@ -0,0 +1,124 @@
+import os
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+
+
+# ============================================================
+# HEADER HELPERS
+# ============================================================
+def _disposition(kind: str, filename: str | None) -> str:
+    if not filename:
+        return kind
+    quoted = quote(filename)
+    if quoted == filename:
+        return f'{kind}; filename="{filename}"'
+    return f"{kind}; filename*=utf-8''{quoted}"
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    return any(t.strip().removeprefix("W/") == etag for t in header.split(","))
+
+
+def _not_modified(request: Request, etag: str, mtime: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return mtime.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def starts_at_zero(request: Request, response: Response) -> bool:
+    """
+    Whether `response` (from file_response) delivers the file from its
+    first byte: a full 200, or a range request, single or multi-range,
+    one of whose ranges starts at 0. False for 304s and for the later
+    ranges of a resumed download or PDF viewer.
+    """
+    if response.status_code != 200:
+        return False
+
+    header = request.headers.get("range")
+    if not header:
+        return True
+
+    if_range = request.headers.get("if-range")
+    if if_range and if_range not in (response.headers.get("etag"), response.headers.get("last-modified")):
+        return True     # stale validator: the whole file goes out
+
+    units, _, spec = header.partition("=")
+    if units.strip().lower() != "bytes":
+        return False
+    return any(part.partition("-")[0].strip() == "0" for part in spec.split(","))
+
+
+# ============================================================
+# FILE RESPONSE
+# ============================================================
+def file_response(
+    request: Request,
+    path: str,
+    *,
+    etag: str | None = None,
+    filename: str | None = None,
+    inline: bool = False,
+    media_type: str = "application/pdf",
+) -> Response:
+    """
+    Serve a file with validators, conditional GETs and byte ranges
+    (single ranges and multi-range requests alike, which get a multipart
+    206).
+
+    FILE_DELIVERY_MODE picks who moves the bytes:
+      direct     – uvicorn (zero-copy via the ASGI pathsend extension when
+                   the server offers it)
+      x-accel    – nginx, via X-Accel-Redirect to FILE_ACCEL_PREFIX
+      x-sendfile – Apache/lighttpd, via X-Sendfile
+    The proxy handles Range itself in the offload modes.
+
+    Pass a strong `etag` (e.g. a content hash) when one is known; otherwise
+    one is derived from mtime and size.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(404, "File not found")
+
+    etag = etag or f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+
+    mtime = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(mtime, usegmt=True),
+        "Cache-Control": f"private, max-age={settings.FILE_CACHE_MAX_AGE}",
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": _disposition("inline" if inline else "attachment", filename),
+    }
+
+    if _not_modified(request, etag, mtime):
+        return Response(status_code=304, headers=headers)
+
+    mode = settings.FILE_DELIVERY_MODE
+    if mode == "x-accel":
+        headers["X-Accel-Redirect"] = settings.FILE_ACCEL_PREFIX + os.path.basename(path)
+        return Response(headers=headers, media_type=media_type)
+    if mode == "x-sendfile":
+        headers["X-Sendfile"] = os.path.abspath(path)
+        return Response(headers=headers, media_type=media_type)
+
+    # Range and If-Range: one range is sent as a 206, several as a
+    # multipart/byteranges 206
+    return FileResponse(path, headers=headers, media_type=media_type, stat_result=stat)
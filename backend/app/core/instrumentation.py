@@ -0,0 +1,191 @@
+import logging
+import secrets
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import CounterFamily, GaugeFamily, HistogramFamily, render
+from app.core.pool import pool_snapshot
+
+log = logging.getLogger(__name__)
+
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+# ============================================================
+# METRIC FAMILIES (per worker process)
+# ============================================================
+REQUEST_SECONDS = HistogramFamily(
+    "http_request_duration_seconds", "Request latency by route", ("method", "route"),
+)
+REQUESTS = CounterFamily(
+    "http_requests_total", "Requests by route and status", ("method", "route", "status"),
+)
+IN_FLIGHT = GaugeFamily("http_requests_in_flight", "Requests being served")
+REQUEST_QUERIES = HistogramFamily(
+    "http_request_db_queries", "SQL statements per request", ("route",), COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = HistogramFamily(
+    "http_request_db_seconds", "Time spent in SQL per request", ("route",),
+)
+QUERY_SECONDS = HistogramFamily("db_query_duration_seconds", "SQL statement latency")
+N_PLUS_ONE = CounterFamily(
+    "http_n_plus_one_total",
+    "Requests that ran one statement N_PLUS_ONE_THRESHOLD+ times",
+    ("route",),
+)
+
+FAMILIES = [
+    REQUEST_SECONDS, REQUESTS, IN_FLIGHT,
+    REQUEST_QUERIES, REQUEST_DB_SECONDS, QUERY_SECONDS, N_PLUS_ONE,
+]
+
+
+# ============================================================
+# PER-REQUEST SQL ACCOUNTING
+# ============================================================
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements = {}   # SQL text -> executions, for N+1 detection
+
+
+# Run_in_threadpool copies the context, so sync handlers update the same object
+_current = ContextVar("request_stats", default=None)
+
+
+def install_query_hooks(engine):
+    """Time every statement and charge it to the request that issued it."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        elapsed = time.perf_counter() - started
+        QUERY_SECONDS.observe(value=elapsed)
+
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+            stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("query_started") if context.connection else None
+        if started:
+            started.pop()
+
+
+# ============================================================
+# ASGI MIDDLEWARE
+# ============================================================
+_flagged = set()   # (route, statement) pairs already logged as N+1
+
+
+def _route_label(scope) -> str:
+    # Templates, not raw paths, so ids do not explode the label set
+    path = getattr(scope.get("route"), "path", None)
+    if path is None:
+        return "unmatched"
+    # Depending on the FastAPI version an included route's path may or
+    # may not carry the prefix it was mounted under
+    prefix = scope.get("route_prefix", "")
+    return path if path.startswith(prefix) else prefix + path
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and SQL usage per route template. Plain ASGI
+    rather than BaseHTTPMiddleware, so streaming responses pass through
+    untouched and the per-request cost stays a few dictionary updates.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+        start = time.perf_counter()
+        IN_FLIGHT.inc(amount=1)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.inc(amount=-1)
+            _current.reset(token)
+
+            route = _route_label(scope)
+            method = scope["method"]
+            REQUEST_SECONDS.observe(method, route, value=elapsed)
+            REQUESTS.inc(method, route, str(status))
+            REQUEST_QUERIES.observe(route, value=stats.queries)
+            REQUEST_DB_SECONDS.observe(route, value=stats.db_seconds)
+            self._check_n_plus_one(route, stats)
+
+    @staticmethod
+    def _check_n_plus_one(route: str, stats: RequestStats):
+        threshold = settings.N_PLUS_ONE_THRESHOLD
+        if not threshold or stats.queries < threshold:
+            return
+
+        repeated = [(sql, n) for sql, n in stats.statements.items() if n >= threshold]
+        if not repeated:
+            return
+
+        N_PLUS_ONE.inc(route)
+        for sql, n in repeated:
+            if (route, sql) not in _flagged:
+                _flagged.add((route, sql))
+                log.warning("Possible N+1 on %s: statement ran %d times: %s", route, n, sql[:200])
+
+
+# ============================================================
+# EXPOSITION
+# ============================================================
+LOOPBACK = {"127.0.0.1", "::1"}
+
+
+def scrape_allowed(request) -> bool:
+    """A scrape bearing METRICS_TOKEN, or from loopback when none is set."""
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and secrets.compare_digest(token, settings.METRICS_TOKEN)
+    return request.client is not None and request.client.host in LOOPBACK
+
+
+def metrics_text(engines: dict) -> str:
+    """Everything above plus connection pool state, for GET /metrics."""
+    connections = GaugeFamily("db_pool_connections", "Pool connections by state", ("engine", "state"))
+    waits = CounterFamily("db_pool_waits_total", "Checkouts that found the pool exhausted", ("engine",))
+
+    for name, engine in engines.items():
+        snap = pool_snapshot(engine)
+        connections.set(name, "checked_out", value=snap["checkedOut"])
+        connections.set(name, "checked_in", value=snap["checkedIn"])
+        connections.set(name, "overflow", value=snap["overflow"])
+        waits.inc(name, amount=snap["waits"])
+
+    return render(FAMILIES + [connections, waits])
@@ -0,0 +1,114 @@
+import threading
+from bisect import bisect_left
+
+# Seconds; tuned for DB checkouts and HTTP handlers alike
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets, counts):
+            running += n
+            cumulative[str(bound)] = running
+        running += counts[-1]
+        cumulative["+Inf"] = running
+
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+
+# ============================================================
+# PROMETHEUS FAMILIES
+# ============================================================
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple, le: str = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class CounterFamily:
+    """Monotonic counters keyed by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name, self.help, self.labels = name, help, labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *values, amount: float = 1):
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for values, v in items:
+            yield f"{self.name}{_labels(self.labels, values)} {v}"
+
+
+class GaugeFamily(CounterFamily):
+    kind = "gauge"
+
+    def set(self, *values, value: float):
+        with self._lock:
+            self._values[values] = value
+
+
+class HistogramFamily:
+    """One Histogram per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def observe(self, *values, value: float):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, Histogram(self.buckets))
+        child.observe(value)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            snap = child.snapshot()
+            for bound, n in snap["buckets"].items():
+                yield f"{self.name}_bucket{_labels(self.labels, values, le=bound)} {n}"
+            yield f"{self.name}_sum{_labels(self.labels, values)} {snap['sum']}"
+            yield f"{self.name}_count{_labels(self.labels, values)} {snap['count']}"
+
+
+def render(families) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        lines.extend(family.samples())
+    return "\n".join(lines) + "\n"
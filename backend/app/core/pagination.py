@@ -0,0 +1,194 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Optional
+
+from fastapi import HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, or_
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+# ============================================================
+# QUERY PARAMETERS
+# ============================================================
+class PageParams:
+    """
+    `cursor`, `limit` and `fields` — shared by every list endpoint.
+
+    Paging is opt-in: without `limit` or `cursor` the whole list comes back
+    as a plain JSON array, as it always did. With either, the body becomes
+    {"items": [...], "next_cursor": ...} (`limit` defaults to
+    PAGE_DEFAULT_LIMIT when only a cursor is given).
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor"),
+        limit: Optional[int] = Query(None, ge=1, le=settings.PAGE_MAX_LIMIT),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    ):
+        self.cursor = cursor
+        self.paged = limit is not None or cursor is not None
+        self.limit = limit or (settings.PAGE_DEFAULT_LIMIT if self.paged else None)
+        self.fields = {f.strip() for f in fields.split(",") if f.strip()} if fields else None
+
+
+class DateRange:
+    """`created_from` / `created_to` filters on a createdAt column."""
+
+    def __init__(
+        self,
+        created_from: Optional[datetime] = Query(None),
+        created_to: Optional[datetime] = Query(None),
+    ):
+        self.created_from = created_from
+        self.created_to = created_to
+
+    def apply(self, query, column):
+        if self.created_from:
+            query = query.filter(column >= self.created_from)
+        if self.created_to:
+            query = query.filter(column < self.created_to)
+        return query
+
+
+# ============================================================
+# CURSORS
+# ============================================================
+def _encode(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([_encode(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+
+        decoded = []
+        for col, value in zip(columns, values):
+            kind = col.type.python_type
+            if kind is datetime:
+                value = datetime.fromisoformat(value)
+            elif kind is date:
+                value = date.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except (binascii.Error, ValueError, TypeError, NotImplementedError):
+        raise HTTPException(400, "Invalid cursor")
+
+
+def _after(columns: list, values: list, descending: bool):
+    """
+    Rows strictly after `values` in (columns) order, spelled out as
+    (a > x) OR (a = x AND b > y) so MySQL can range-scan the index.
+    """
+    clauses = []
+    for i, col in enumerate(columns):
+        step = col < values[i] if descending else col > values[i]
+        clauses.append(and_(*[c == v for c, v in zip(columns[:i], values[:i])], step))
+    return or_(*clauses)
+
+
+# ============================================================
+# PAGINATE
+# ============================================================
+def _check_fields(page: PageParams, schema):
+    if page.fields:
+        unknown = page.fields - schema.model_fields.keys()
+        if unknown:
+            raise HTTPException(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+
+
+def _respond(page: PageParams, items: list, next_cursor: Optional[str]):
+    """Paged requests get an envelope; the cursor is mirrored in X-Next-Cursor."""
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    if not page.paged:
+        return JSONResponse(items, headers=headers)
+    return JSONResponse({"items": items, "next_cursor": next_cursor}, headers=headers)
+
+
+def _page_query(query, page: PageParams, order_by: list, descending: bool):
+    """Seek past the cursor and order; paged requests fetch one extra row."""
+    if page.cursor:
+        query = query.filter(_after(order_by, decode_cursor(page.cursor, order_by), descending))
+
+    query = query.order_by(*[c.desc() if descending else c.asc() for c in order_by])
+    return query.limit(page.limit + 1) if page.paged else query
+
+
+def _page_out(rows: list, page: PageParams, schema, order_by: list):
+    next_cursor = None
+    if page.paged and len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = encode_cursor([getattr(rows[-1], c.key) for c in order_by])
+
+    items = [
+        schema.model_validate(r, from_attributes=True).model_dump(mode="json", include=page.fields)
+        for r in rows
+    ]
+    return _respond(page, items, next_cursor)
+
+
+def paginate(query, page: PageParams, schema, order_by: list, descending: bool = False):
+    """
+    Keyset-paginate an ORM query and serialize one page of `schema` rows.
+
+    `order_by` must end with a unique column (the primary key) so the order
+    is stable. Without paging parameters every row is returned, in the
+    same order.
+    """
+    _check_fields(page, schema)
+    rows = _page_query(query, page, order_by, descending).all()
+    return _page_out(rows, page, schema, order_by)
+
+
+async def apaginate(db, stmt, page: PageParams, schema, order_by: list, descending: bool = False):
+    """paginate() for a select() on an AsyncSession."""
+    _check_fields(page, schema)
+    rows = (await db.execute(_page_query(stmt, page, order_by, descending))).scalars().all()
+    return _page_out(rows, page, schema, order_by)
+
+
+def paginate_ranked(rank, page: PageParams, schema):
+    """
+    Paginate a ranking computed in memory (e.g. search results), where
+    there is no column to seek on: the cursor carries the offset instead.
+    `rank(n)` returns the best `n` items in order. A ranking has no
+    natural end, so unpaged requests still get PAGE_DEFAULT_LIMIT items.
+    """
+    _check_fields(page, schema)
+
+    offset = 0
+    if page.cursor:
+        try:
+            raw = base64.urlsafe_b64decode(page.cursor + "=" * (-len(page.cursor) % 4))
+            (offset,) = json.loads(raw)
+            if not isinstance(offset, int) or offset < 0:
+                raise ValueError
+        except (binascii.Error, ValueError, TypeError):
+            raise HTTPException(400, "Invalid cursor")
+
+    limit = page.limit or settings.PAGE_DEFAULT_LIMIT
+    rows = rank(offset + limit + 1)[offset:]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([offset + limit])
+
+    items = [schema.model_validate(r).model_dump(mode="json", include=page.fields) for r in rows]
+    return _respond(page, items, next_cursor)
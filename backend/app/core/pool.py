@@ -0,0 +1,133 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+
+# ============================================================
+# CHECKOUT STATS
+# ============================================================
+class PoolStats:
+    """Checkout latency and queueing for one engine's pool."""
+
+    def __init__(self):
+        self.checkout_latency = Histogram()
+        self.checkouts = 0
+        self.waits = 0          # checkouts that found the pool exhausted
+        self.wait_seconds = 0.0
+        self.pings = 0
+        self.ping_failures = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, waited: bool):
+        self.checkout_latency.observe(seconds)
+        with self._lock:
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += seconds
+
+    def record_ping(self, ok: bool):
+        with self._lock:
+            self.pings += 1
+            if not ok:
+                self.ping_failures += 1
+
+
+class _InstrumentedMixin:
+    stats: PoolStats
+
+    def _do_get(self):
+        waited = self.checkedin() == 0 and self.overflow() >= self._max_overflow
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.record(time.perf_counter() - start, waited)
+
+
+class InstrumentedQueuePool(_InstrumentedMixin, QueuePool):
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.stats = PoolStats()
+
+
+class InstrumentedAsyncPool(_InstrumentedMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.stats = PoolStats()
+
+
+# ============================================================
+# ENGINE OPTIONS
+# ============================================================
+def engine_options(is_async: bool = False) -> dict:
+    """create_engine() keyword arguments built from Settings."""
+    return {
+        "poolclass": InstrumentedAsyncPool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+def install_idle_ping(engine):
+    """
+    DB_POOL_PRE_PING=idle: only ping connections that sat in the pool for
+    longer than DB_POOL_PRE_PING_IDLE seconds, instead of on every checkout.
+    """
+    if settings.DB_POOL_PRE_PING != "idle":
+        return
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    stats = sync_engine.pool.stats
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checked_in(dbapi_connection, record):
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checked_out(dbapi_connection, record, proxy):
+        idle_since = record.info.get("checked_in_at")
+        if idle_since is None or time.monotonic() - idle_since < settings.DB_POOL_PRE_PING_IDLE:
+            return
+
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception:
+            stats.record_ping(ok=False)
+            # The pool discards this connection and retries with a fresh one
+            raise DisconnectionError()
+        stats.record_ping(ok=True)
+
+
+# ============================================================
+# SNAPSHOT
+# ============================================================
+def pool_snapshot(engine) -> dict:
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats = pool.stats
+
+    return {
+        "size": pool.size(),
+        "checkedIn": pool.checkedin(),
+        "checkedOut": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "maxOverflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "checkouts": stats.checkouts,
+        "waits": stats.waits,
+        "waitSeconds": round(stats.wait_seconds, 6),
+        "pings": stats.pings,
+        "pingFailures": stats.ping_failures,
+        "checkoutLatency": stats.checkout_latency.snapshot(),
+    }
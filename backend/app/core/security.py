@@ -0,0 +1,162 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+
+# ============================================================
+# WORKER SIDE (runs inside the hashing processes)
+# ============================================================
+_contexts = {}
+
+
+def _context(rounds: int) -> CryptContext:
+    ctx = _contexts.get(rounds)
+    if ctx is None:
+        ctx = _contexts[rounds] = CryptContext(
+            schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds
+        )
+    return ctx
+
+
+def _hash(plain: str, rounds: int) -> str:
+    return _context(rounds).hash(plain)
+
+
+def _hash_many(plains: list, rounds: int) -> list:
+    ctx = _context(rounds)
+    return [ctx.hash(p) for p in plains]
+
+
+def _verify_and_update(plain: str, hashed: str, rounds: int):
+    # Returns (valid, new_hash); new_hash is set when the stored hash uses
+    # another cost factor than the configured one.
+    return _context(rounds).verify_and_update(plain, hashed)
+
+
+# ============================================================
+# PASSWORD HASHER
+# ============================================================
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated process pool so hashing never holds the
+    GIL of a web worker. At most `max_pending` calls may be queued or
+    running; beyond that callers get a 503 instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_pending: int, rounds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.latency = Histogram()
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(503, "Password service busy, please retry")
+
+        with self._lock:
+            self.submitted += 1
+        start = time.perf_counter()
+
+        def _done(_):
+            self._slots.release()
+            self.latency.observe(time.perf_counter() - start)
+            with self._lock:
+                self.completed += 1
+
+        if self.workers <= 0:
+            # Inline mode (tests, scripts): same accounting, no pool
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+        else:
+            future = self._pool().submit(fn, *args)
+
+        future.add_done_callback(_done)
+        return future
+
+    # ---- blocking API (sync handlers, scripts) ----
+    def hash(self, plain: str) -> str:
+        return self._submit(_hash, plain, self.rounds).result()
+
+    def hash_many(self, plains: list) -> list:
+        """Hash a batch, spread over every worker process."""
+        if not plains:
+            return []
+        parts = max(1, min(self.workers, len(plains)))
+        size = -(-len(plains) // parts)
+        futures = [
+            self._submit(_hash_many, plains[i:i + size], self.rounds)
+            for i in range(0, len(plains), size)
+        ]
+        return [h for f in futures for h in f.result()]
+
+    def verify_and_update(self, plain: str, hashed: Optional[str]):
+        if not hashed:
+            return False, None
+        return self._submit(_verify_and_update, plain, hashed, self.rounds).result()
+
+    # ---- async API (async handlers) ----
+    async def ahash(self, plain: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, plain, self.rounds))
+
+    async def averify_and_update(self, plain: str, hashed: Optional[str]):
+        if not hashed:
+            return False, None
+        return await asyncio.wrap_future(
+            self._submit(_verify_and_update, plain, hashed, self.rounds)
+        )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            pending = self.submitted - self.completed
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "maxPending": self.max_pending,
+                "pending": pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "latency": self.latency.snapshot(),
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS,
+)
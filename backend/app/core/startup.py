@@ -0,0 +1,217 @@
+import importlib
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+
+from fastapi import APIRouter, FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.openapi.utils import get_openapi
+from sqlalchemy import text
+from starlette.routing import BaseRoute, Match, NoMatchFound, get_route_path
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+ALEMBIC_VERSIONS = Path(__file__).resolve().parents[3] / "alembic" / "versions"
+
+
+# ============================================================
+# SCHEMA CHECK
+# ============================================================
+def _alembic_head() -> str:
+    """Head revision of alembic/versions, read from the files without importing them."""
+    revisions, parents = set(), set()
+    for path in ALEMBIC_VERSIONS.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = re.search(r"^revision[^=]*=\s*['\"](\w+)['\"]", source, re.M)
+        if revision:
+            revisions.add(revision.group(1))
+        down = re.search(r"^down_revision[^=]*=\s*(.+)$", source, re.M)
+        if down:
+            parents.update(re.findall(r"['\"](\w+)['\"]", down.group(1)))
+
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected one Alembic head in {ALEMBIC_VERSIONS}, found {sorted(heads)}")
+    return heads.pop()
+
+
+def prepare_schema(engine):
+    """
+    SCHEMA_MODE:
+      create – create missing tables (development; every worker checks
+               the whole schema, so keep it out of production)
+      verify – one SELECT on alembic_version; refuse to start when the
+               database is not at the head revision the code expects
+      skip   – trust the deploy pipeline to have run the migrations
+    """
+    mode = settings.SCHEMA_MODE
+    if mode == "skip":
+        return
+
+    if mode == "create":
+        from app.db import Base
+        import app.models  # noqa: F401 — register every table
+
+        Base.metadata.create_all(bind=engine)
+        return
+
+    if mode != "verify":
+        raise RuntimeError(f"Unknown SCHEMA_MODE '{mode}'")
+
+    expected = settings.SCHEMA_REVISION or _alembic_head()
+    with engine.connect() as conn:
+        current = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, the code expects {expected}: "
+            "run `alembic upgrade head` first"
+        )
+
+
+# ============================================================
+# LAZY ROUTERS
+# ============================================================
+class LazyRouter(BaseRoute):
+    """
+    Stands in for a router module that is only imported when first
+    needed; from then on it just delegates to the module's routes.
+
+    A request reaching the prefix before then is claimed, the module is
+    imported in the threadpool (never on the event loop), and the request
+    is routed again from the top, now against the real routes.
+    """
+
+    def __init__(self, module: str, prefix: str, tags: list):
+        self.module = module
+        self.prefix = prefix
+        self.tags = tags
+        self._routes = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._routes is not None
+
+    def load(self) -> list:
+        if self._routes is None:
+            with self._lock:
+                if self._routes is None:
+                    router = APIRouter()
+                    router.include_router(
+                        importlib.import_module(self.module).router, prefix=self.prefix, tags=self.tags
+                    )
+                    self._routes = router.routes
+        return self._routes
+
+    def matches(self, scope):
+        path = get_route_path(scope)
+        if path != self.prefix and not path.startswith(self.prefix + "/"):
+            return Match.NONE, {}
+
+        if not self.loaded:
+            return Match.FULL, {"lazy_route": None, "route_prefix": self.prefix}
+
+        partial = None
+        for route in self._routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return Match.FULL, {**child_scope, "lazy_route": route, "route_prefix": self.prefix}
+            if match == Match.PARTIAL and partial is None:
+                partial = {**child_scope, "lazy_route": route, "route_prefix": self.prefix}
+        if partial is not None:
+            return Match.PARTIAL, partial
+        return Match.NONE, {}
+
+    async def handle(self, scope, receive, send):
+        if scope["lazy_route"] is None:
+            await run_in_threadpool(self.load)
+            await scope["router"].app(scope, receive, send)
+            return
+        await scope["lazy_route"].handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params):
+        for route in self.load():
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                continue
+        raise NoMatchFound(name, path_params)
+
+
+def _expand(routes: list) -> list:
+    return [r for route in routes for r in (route.load() if isinstance(route, LazyRouter) else [route])]
+
+
+def include_routers(app: FastAPI, routers: list):
+    """
+    Register (module, prefix, tags) routers in order, imported on first
+    use unless LAZY_ROUTERS is off. Building the OpenAPI schema loads them
+    all. Requests carry `route_prefix` for the metrics route labels.
+    """
+    lazy = [LazyRouter(module, prefix, tags) for module, prefix, tags in routers]
+    app.state.lazy_routers = lazy
+    if not settings.LAZY_ROUTERS:
+        for router in lazy:
+            router.load()
+    app.router.routes.extend(lazy)
+
+    def openapi():
+        if app.openapi_schema is None:
+            app.openapi_schema = get_openapi(
+                title=app.title, version=app.version, routes=_expand(app.routes)
+            )
+        return app.openapi_schema
+
+    app.openapi = openapi
+
+
+def warm_routers(app: FastAPI):
+    """Import the router modules no request has needed yet (off the event loop)."""
+    for router in app.state.lazy_routers:
+        router.load()
+
+
+# ============================================================
+# STARTUP BUDGET
+# ============================================================
+class StartupTimer:
+    """Phase timings from the first app import to accepting traffic."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.total_ms = None
+
+    def begin(self, started: float):
+        """Count from an earlier perf_counter() reading (the top of main.py)."""
+        self.started = started
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        last = sum(self.phases.values()) / 1000
+        self.phases[phase] = round((now - self.started - last) * 1000, 1)
+
+    def finish(self):
+        self.total_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        budget = settings.STARTUP_BUDGET_MS
+        if budget and self.total_ms > budget:
+            log.warning("Startup took %.0f ms (budget %d ms): %s", self.total_ms, budget, self.phases)
+        else:
+            log.info("Startup took %.0f ms: %s", self.total_ms, self.phases)
+
+    def snapshot(self) -> dict:
+        return {
+            "totalMs": self.total_ms,
+            "budgetMs": settings.STARTUP_BUDGET_MS,
+            "phases": self.phases,
+            "schemaMode": settings.SCHEMA_MODE,
+            "lazyRouters": settings.LAZY_ROUTERS,
+        }
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,51 @@
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+# Multipart framing and the small form fields that travel with the file
+FORM_OVERHEAD = 64 * 1024
+
+
+class BodyLimitMiddleware:
+    """
+    Caps request bodies on upload routes before anything parses them: a
+    declared Content-Length over the limit is refused outright, and a
+    body that streams in (chunked, or lying about its length) is counted
+    as it is received, so the multipart parser never spools more than the
+    limit to memory or disk.
+
+    `limits` maps (method, path) to a byte cap; paths match with or
+    without a trailing slash. Plain ASGI, like MetricsMiddleware.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = {(method, path.rstrip("/")): cap for (method, path), cap in limits.items()}
+
+    async def __call__(self, scope, receive, send):
+        cap = None
+        if scope["type"] == "http":
+            cap = self.limits.get((scope["method"], scope["path"].rstrip("/")))
+        if cap is None:
+            await self.app(scope, receive, send)
+            return
+
+        too_large = HTTPException(413, "File exceeds the maximum upload size")
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > cap:
+                response = JSONResponse({"detail": too_large.detail}, status_code=413)
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > cap:
+                    raise too_large   # surfaces through the route like any HTTPException
+            return message
+
+        await self.app(scope, limited_receive, send)
+
@@ -5,6 +5,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.core.config import settings
+from app.core.instrumentation import install_query_hooks
+from app.core.pool import engine_options, install_idle_ping
 
 # Base model
 Base = declarative_base()
@@ -15,8 +17,10 @@ SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 # Engine
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,
+    **engine_options(),
 )
+install_idle_ping(engine)
+install_query_hooks(engine)
 
 # Session
 SessionLocal = sessionmaker(
@@ -25,6 +29,26 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# Async engine + session (DB_MODE=async only)
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        **engine_options(is_async=True),
+    )
+    install_idle_ping(async_engine)
+    install_query_hooks(async_engine)
+
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -32,3 +56,41 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Upserts
+def upsert(db, table, values, index_elements: list, update):
+    """
+    INSERT `values` (one dict, or a list of dicts for a multi-row insert)
+    into `table`, or update the existing row on a key clash.
+
+    `update` receives the row that failed to insert and returns a list of
+    (column, expression) pairs. Expressions must read the *previous* row
+    values: MySQL applies assignments left to right, so list derived columns
+    before the columns they read.
+    """
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table).values(values)
+        stmt = stmt.on_duplicate_key_update(update(stmt.inserted))
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={col.name: expr for col, expr in update(stmt.excluded)},
+        )
+
+    return db.execute(stmt)
@@ -1,12 +1,19 @@
-from fastapi import FastAPI
+import threading
+import time
+
+BOOT = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.core.config import settings
-from app.db import Base, engine
-import app.models  # ensure models load
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.startup import include_routers, prepare_schema, startup_timer, warm_routers
+from app.core.uploads import FORM_OVERHEAD, BodyLimitMiddleware
+from app.db import async_engine, engine
 
-# Create tables (OK for now in development)
-Base.metadata.create_all(bind=engine)
+startup_timer.begin(BOOT)
 
 # Init FastAPI
 app = FastAPI(
@@ -15,6 +22,14 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# ============================================================
+# UPLOAD LIMITS (inside CORS, so a 413 still carries its headers)
+# ============================================================
+app.add_middleware(
+    BodyLimitMiddleware,
+    limits={("POST", "/api/policies"): settings.POLICY_MAX_UPLOAD_BYTES + FORM_OVERHEAD},
+)
+
 # ============================================================
 # CORS
 # ============================================================
@@ -29,8 +44,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# ============================================================
+# METRICS (outermost, so it times everything below it)
+# ============================================================
+if settings.METRICS_ENABLED:
+    from app.core.instrumentation import MetricsMiddleware, metrics_text, scrape_allowed
+
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics(request: Request):
+        if not scrape_allowed(request):
+            raise HTTPException(403, "Not allowed to scrape metrics")
+        engines = {"sync": engine}
+        if async_engine is not None:
+            engines["async"] = async_engine
+        return PlainTextResponse(metrics_text(engines), media_type="text/plain; version=0.0.4")
+
 # ============================================================
 # ROOT (IMPORTANT FOR RAILWAY)
 # ============================================================
@@ -41,36 +74,99 @@ def root():
         "service": "Cybersecurity Awareness API"
     }
 
-# ============================================================
-# ROUTERS
-# ============================================================
-from app.routers import (
-    auth,
-    staff,
-    topics,
-    quizzes,
-    attempts,
-    reports,
-    training,
-    awareness,
-    home,
-    policies,
-)
-
-app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
-app.include_router(staff.router, prefix="/api/staff", tags=["Staff"])
-app.include_router(topics.router, prefix="/api/topics", tags=["Topics"])
-app.include_router(quizzes.router, prefix="/api/quizzes", tags=["Quizzes"])
-app.include_router(attempts.router, prefix="/api/attempts", tags=["Attempts"])
-app.include_router(training.router, prefix="/api/training", tags=["Training"])
-app.include_router(awareness.router, prefix="/api/awareness", tags=["Awareness"])
-app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
-app.include_router(home.router, prefix="/api/home", tags=["Home"])
-app.include_router(policies.router, prefix="/api/policies", tags=["Policies"])
-
 # ============================================================
 # HEALTH CHECK
 # ============================================================
 @app.get("/api/ping")
 def ping():
     return {"message": "pong"}
+
+# ============================================================
+# ROUTERS (imported on first use unless LAZY_ROUTERS=false)
+# ============================================================
+ROUTERS = []
+
+# Async hot paths are registered first so they win the route match
+if settings.DB_MODE == "async":
+    ROUTERS += [
+        ("app.routers.aio.auth", "/api/auth", ["Auth"]),
+        ("app.routers.aio.quizzes", "/api/quizzes", ["Quizzes"]),
+    ]
+
+ROUTERS += [
+    ("app.routers.auth", "/api/auth", ["Auth"]),
+    ("app.routers.staff", "/api/staff", ["Staff"]),
+    ("app.routers.topics", "/api/topics", ["Topics"]),
+    ("app.routers.quizzes", "/api/quizzes", ["Quizzes"]),
+    ("app.routers.attempts", "/api/attempts", ["Attempts"]),
+    ("app.routers.training", "/api/training", ["Training"]),
+    ("app.routers.awareness", "/api/awareness", ["Awareness"]),
+    ("app.routers.reports", "/api/reports", ["Reports"]),
+    ("app.routers.home", "/api/home", ["Home"]),
+    ("app.routers.policies", "/api/policies", ["Policies"]),
+    ("app.routers.metrics", "/api/metrics", ["Metrics"]),
+    ("app.routers.search", "/api/search", ["Search"]),
+]
+
+include_routers(app, ROUTERS)
+startup_timer.mark("imports")
+
+
+# ============================================================
+# LIFECYCLE
+# ============================================================
+def start_services():
+    from app.services.attempt_queue import attempt_queue
+    from app.services.download_counter import download_counter
+    from app.services.pdf_pipeline import pdf_pipeline
+    from app.services.rollups import rollup_folder
+    from app.services.search import search_index
+    from app.services.summaries import summary_refresher
+
+    download_counter.start()
+    attempt_queue.start()     # replays attempts queued before a restart first
+    search_index.start()      # first build in the background, then every SEARCH_REINDEX_INTERVAL
+    summary_refresher.start()
+    rollup_folder.start()
+    pdf_pipeline.resume()     # uploads still pending from a previous run
+    warm_routers(app)         # so no request waits on a router import
+    startup_timer.mark("warmup")
+
+
+warmup = None
+
+
+@app.on_event("startup")
+def start_background_workers():
+    # SCHEMA_MODE=create (default) builds missing tables; production
+    # workers should use verify (one query) or skip
+    prepare_schema(engine)
+    startup_timer.mark("schema")
+
+    # Services and router modules import after the worker is up
+    global warmup
+    warmup = threading.Thread(target=start_services, name="warmup", daemon=True)
+    warmup.start()
+    startup_timer.finish()
+
+
+@app.on_event("shutdown")
+def stop_background_pools():
+    if warmup is not None:
+        warmup.join()
+
+    from app.core.security import hasher
+    from app.services.attempt_queue import attempt_queue
+    from app.services.download_counter import download_counter
+    from app.services.pdf_pipeline import pdf_pipeline
+    from app.services.rollups import rollup_folder
+    from app.services.search import search_index
+    from app.services.summaries import summary_refresher
+
+    search_index.stop()
+    summary_refresher.stop()  # rebuilds what is still marked
+    download_counter.stop()   # final flush of journalled download counts
+    attempt_queue.stop()      # drains what the writer can before exit
+    rollup_folder.stop()      # folds the deltas that drain left
+    hasher.shutdown()
+    pdf_pipeline.shutdown()
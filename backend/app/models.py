@@ -6,6 +6,11 @@ from sqlalchemy import (
     Text,
     ForeignKey,
     Float,
+    JSON,
+    Date,
+    Boolean,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -19,20 +24,72 @@ from app.db import Base
 # =====================================
 class Policy(Base):
     __tablename__ = "policies"
+    __table_args__ = (
+        Index("ix_policies_createdAt", "createdAt", "policyId"),  # list, newest first
+        Index("ix_policies_filePath", "filePath"),                # shared-file check on delete
+    )
 
     policyId = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(String(500))
     filePath = Column(String(500), nullable=False)
+    fileName = Column(String(255), nullable=True)      # original upload name
+    fileSize = Column(Integer, nullable=True)
+    contentHash = Column(String(64), nullable=True, index=True)  # SHA-256
     uploadedBy = Column(String(100))
     createdAt = Column(DateTime, default=datetime.utcnow)
     downloadCount = Column(Integer, default=0)
 
+    # Filled in by the PDF pipeline once the upload has been processed
+    processingStatus = Column(String(20), nullable=True)  # pending | ready | failed
+    pageCount = Column(Integer, nullable=True)
+    hasThumbnail = Column(Boolean, nullable=False, default=False)
+    processedAt = Column(DateTime, nullable=True)
+
+
+# =====================================
+# PDF PIPELINE CLAIMS (one renderer per file across workers)
+# =====================================
+class PdfJob(Base):
+    __tablename__ = "pdf_jobs"
+
+    contentHash = Column(String(64), primary_key=True)
+    claimedAt = Column(DateTime, nullable=False)
+
+# =====================================
+# POLICY DOWNLOAD STATS (per policy, day and kind)
+# =====================================
+class PolicyDownloadStat(Base):
+    __tablename__ = "policy_download_stats"
+    __table_args__ = (
+        Index("ix_policy_download_stats_day", "day"),  # date-range stats across policies
+    )
+
+    policyId = Column(Integer, ForeignKey("policies.policyId", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    kind = Column(String(20), primary_key=True)  # download | preview
+    count = Column(Integer, nullable=False, default=0)
+
+
+# =====================================
+# FLUSHED DOWNLOAD JOURNAL BATCHES (exactly-once flush)
+# =====================================
+class DownloadFlushBatch(Base):
+    __tablename__ = "download_flush_batches"
+
+    batchId = Column(String(36), primary_key=True)
+    appliedAt = Column(DateTime, nullable=False, server_default=func.now())
+
+
 # =====================================
 # USERS / STAFF
 # =====================================
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_department_role", "department", "role"),  # staff lists, reports joins
+        Index("ix_users_role", "role"),
+    )
 
     userId = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -44,6 +101,7 @@ class User(Base):
 
     attempts = relationship("QuizAttempt", back_populates="user", cascade="all, delete")
     reports = relationship("Report", back_populates="user", cascade="all, delete")
+    progress = relationship("UserTopicProgress", cascade="all, delete")
 
 
 # =====================================
@@ -51,6 +109,9 @@ class User(Base):
 # =====================================
 class Topic(Base):
     __tablename__ = "topics"
+    __table_args__ = (
+        Index("ix_topics_category", "category"),
+    )
 
     topicId = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -60,6 +121,7 @@ class Topic(Base):
     file_path = Column(String(500), nullable=True)
 
     quizzes = relationship("Quiz", back_populates="topic", cascade="all, delete")
+    progress = relationship("UserTopicProgress", cascade="all, delete")
 
 
 # =====================================
@@ -67,6 +129,9 @@ class Topic(Base):
 # =====================================
 class Quiz(Base):
     __tablename__ = "quizzes"
+    __table_args__ = (
+        Index("ix_quizzes_topicId", "topicId"),
+    )
 
     quizId = Column(Integer, primary_key=True, index=True)
     question = Column(Text, nullable=False)
@@ -87,18 +152,56 @@ class Quiz(Base):
 # =====================================
 class QuizAttempt(Base):
     __tablename__ = "quiz_attempts"
-
+    __table_args__ = (
+        Index("ix_quiz_attempts_userId_createdAt", "userId", "createdAt"),
+        Index("ix_quiz_attempts_quizId", "quizId"),
+    )
+
+    # On MySQL the table is partitioned by month of createdAt: its primary
+    # key is (attemptId, createdAt) and it has no foreign key constraints
+    # (see the quiz_attempts partitioning migration). The ForeignKeys here
+    # only drive the ORM relationships and create_all in development.
     attemptId = Column(Integer, primary_key=True, index=True)
     userId = Column(Integer, ForeignKey("users.userId"), nullable=False)
     quizId = Column(Integer, ForeignKey("quizzes.quizId"), nullable=False)
     selectedAnswer = Column(String(10), nullable=False)
     isCorrect = Column(Integer, default=0)
-    createdAt = Column(DateTime, server_default=func.now())
+    createdAt = Column(DateTime, nullable=False, server_default=func.now())
 
     user = relationship("User", back_populates="attempts")
     quiz = relationship("Quiz", back_populates="attempts")
 
 
+# =====================================
+# ARCHIVED QUIZ ATTEMPTS (older than ARCHIVE_AFTER_DAYS)
+# =====================================
+class QuizAttemptArchive(Base):
+    __tablename__ = "quiz_attempts_archive"
+    __table_args__ = (
+        Index("ix_quiz_attempts_archive_quizId", "quizId"),   # delete_quiz check
+        Index("ix_quiz_attempts_archive_userId", "userId"),   # user removal
+        {"mysql_row_format": "COMPRESSED"},
+    )
+
+    attemptId = Column(Integer, primary_key=True, autoincrement=False)
+    userId = Column(Integer, nullable=False)
+    quizId = Column(Integer, nullable=False)
+    selectedAnswer = Column(String(10), nullable=False)
+    isCorrect = Column(Integer, nullable=False, default=0)
+    createdAt = Column(DateTime, nullable=False)
+
+
+# =====================================
+# INGESTED ATTEMPT BATCHES (write-behind queue, exactly-once apply)
+# =====================================
+class AttemptIngestBatch(Base):
+    __tablename__ = "attempt_ingest_batches"
+
+    batchId = Column(String(36), primary_key=True)
+    attempts = Column(Integer, nullable=False)
+    appliedAt = Column(DateTime, nullable=False, server_default=func.now(), index=True)
+
+
 # =====================================
 # AWARENESS CONTENT
 # =====================================
@@ -117,6 +220,9 @@ class Awareness(Base):
 # =====================================
 class AwarenessTip(Base):
     __tablename__ = "awareness_tips"
+    __table_args__ = (
+        Index("ix_awareness_tips_category", "category"),
+    )
 
     tipId = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=True)
@@ -129,6 +235,10 @@ class AwarenessTip(Base):
 # =====================================
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        UniqueConstraint("userId", name="uq_reports_userId"),    # one report per user
+        Index("ix_reports_createdAt", "createdAt", "reportId"),  # list, newest first
+    )
 
     reportId = Column(Integer, primary_key=True, index=True)
     userId = Column(Integer, ForeignKey("users.userId"), nullable=False)
@@ -140,6 +250,81 @@ class Report(Base):
     user = relationship("User", back_populates="reports")
 
 
+# =====================================
+# REPORT SUMMARIES (one row per department)
+# =====================================
+class ReportSummary(Base):
+    __tablename__ = "report_summaries"
+
+    department = Column(String(255), primary_key=True)  # "" for users without one
+    participants = Column(Integer, nullable=False, default=0)
+    totalAttempts = Column(Integer, nullable=False, default=0)
+    correctCount = Column(Integer, nullable=False, default=0)
+    scoreSum = Column(Float, nullable=False, default=0.0)
+    averageScore = Column(Float, nullable=False, default=0.0)
+    topUsers = Column(JSON, nullable=True)
+    bottomUsers = Column(JSON, nullable=True)
+    updatedAt = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+# =====================================
+# MAINTENANCE CLAIMS (one worker runs a job per window)
+# =====================================
+class MaintenanceClaim(Base):
+    __tablename__ = "maintenance_claims"
+
+    name = Column(String(64), primary_key=True)
+    claimedAt = Column(DateTime, nullable=False)
+
+
+# =====================================
+# TOPIC PROGRESS (one row per user and topic)
+# =====================================
+class UserTopicProgress(Base):
+    __tablename__ = "user_topic_progress"
+    __table_args__ = (
+        Index("ix_user_topic_progress_topicId", "topicId"),
+    )
+
+    userId = Column(Integer, ForeignKey("users.userId", ondelete="CASCADE"), primary_key=True)
+    topicId = Column(Integer, ForeignKey("topics.topicId", ondelete="CASCADE"), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    correctCount = Column(Integer, nullable=False, default=0)
+    mastery = Column(Float, nullable=False, default=0.0)   # as of lastAttemptAt
+    lastAttemptAt = Column(DateTime, nullable=True)
+
+
+# =====================================
+# ATTEMPT ROLLUPS (time buckets per user / department / topic)
+# =====================================
+class AttemptRollup(Base):
+    __tablename__ = "attempt_rollups"
+
+    # Key order serves "one series over a date range" as a single range scan
+    period = Column(String(10), primary_key=True)      # day | week | month
+    scope = Column(String(20), primary_key=True)       # user | department | topic
+    scopeKey = Column(String(255), primary_key=True)   # userId, department ("" for none) or topicId
+    bucket = Column(Date, primary_key=True)            # first day: the day, Monday, 1st of month
+    attempts = Column(Integer, nullable=False, default=0)
+    correctCount = Column(Integer, nullable=False, default=0)
+
+
+class AttemptRollupDelta(Base):
+    """
+    Department and topic tallies a submission adds, appended in its own
+    transaction and folded into attempt_rollups in batches off the
+    request path (see rollups.RollupFolder).
+    """
+    __tablename__ = "attempt_rollup_deltas"
+
+    deltaId = Column(Integer, primary_key=True)
+    scope = Column(String(20), nullable=False)         # department | topic
+    scopeKey = Column(String(255), nullable=False)
+    day = Column(Date, nullable=False)
+    attempts = Column(Integer, nullable=False)
+    correctCount = Column(Integer, nullable=False)
+
+
 # =====================================
 # TRAINING
 # =====================================
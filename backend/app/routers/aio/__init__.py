@@ -0,0 +1,5 @@
+# Async variants of the hot routes, mounted ahead of the sync routers when
+# DB_MODE=async. Only handlers that await every query and hand blocking
+# work (bcrypt, cache backends) to a pool live here; the rest stay plain
+# `def` routes, which FastAPI already runs in its threadpool.
+__all__ = []
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import hasher
+from app.db import get_async_db
+from app import models, schemas
+from app.routers.auth import (
+    TokenUser,
+    credentials_exception,
+    decode_token,
+    login_response,
+    security,
+    user_cache,
+)
+
+router = APIRouter(tags=["Auth"])
+
+
+# ============================================================
+# LOGIN
+# ============================================================
+@router.post("/login")
+async def login(payload: schemas.LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    POST /api/auth/login
+    """
+
+    user = (
+        await db.execute(select(models.User).where(models.User.email == payload.email))
+    ).scalars().first()
+
+    if not user:
+        raise HTTPException(404, "User not found")
+
+    # bcrypt runs on the hashing process pool; the event loop just awaits it
+    valid, new_hash = await hasher.averify_and_update(payload.password, user.passwordHash)
+    if not valid:
+        raise HTTPException(401, "Invalid password")
+
+    if new_hash:
+        user.passwordHash = new_hash
+        await db.commit()
+
+    return login_response(user)
+
+
+# ============================================================
+# GET CURRENT LOGGED-IN USER
+# ============================================================
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+):
+    payload = decode_token(credentials.credentials)
+    email: str = payload["sub"]
+
+    if settings.AUTH_MODE == "claims":
+        return TokenUser.from_claims(payload)
+
+    if settings.AUTH_MODE == "cached":
+        cached = user_cache.get(email)
+        if cached is not None:
+            return cached
+
+    user = (
+        await db.execute(select(models.User).where(models.User.email == email))
+    ).scalars().first()
+    if user is None:
+        raise credentials_exception
+
+    if settings.AUTH_MODE == "cached":
+        user = TokenUser.from_model(user)
+        user_cache.set(email, user)
+
+    return user
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.pagination import PageParams, apaginate
+from app.db import get_async_db
+from app import models, schemas
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[schemas.QuizOut] | schemas.Page[schemas.QuizOut])
+async def list_quizzes(
+    request: Request,
+    topicId: int | None = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # The cache backend may be Redis: keep its round trips off the event loop
+    key, hit = await run_in_threadpool(response_cache.lookup, request, "quizzes")
+    if hit is not None:
+        return hit
+
+    query = select(models.Quiz)
+    if topicId:
+        query = query.where(models.Quiz.topicId == topicId)
+
+    response = await apaginate(db, query, page, schemas.QuizOut, [models.Quiz.quizId])
+    return await run_in_threadpool(response_cache.store, request, key, response)
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from ..db import get_db
 from app import models, schemas
+from app.services.attempt_queue import answer_key, attempt_queue
+from app.services.scores import apply_attempts
 
 # Router will mount at /api/attempts from main.py
 router = APIRouter()
@@ -11,8 +14,11 @@ router = APIRouter()
 # ============================================
 # CREATE / RECORD QUIZ ATTEMPT
 # ============================================
-@router.post("", response_model=schemas.AttemptOut)
-def record_attempt(payload: schemas.AttemptCreate, db: Session = Depends(get_db)):
+@router.post("", response_model=schemas.AttemptOut | schemas.AttemptQueuedOut)
+def record_attempt(payload: schemas.AttemptCreate, response: Response, db: Session = Depends(get_db)):
+
+    if attempt_queue.accepting():
+        return queue_attempt(payload, response, db)
 
     # Validate User
     user = db.get(models.User, payload.userId)
@@ -36,35 +42,118 @@ def record_attempt(payload: schemas.AttemptCreate, db: Session = Depends(get_db)
     )
 
     db.add(attempt)
-    db.commit()
-    db.refresh(attempt)
 
     # ============================
     # UPDATE or CREATE REPORT
     # ============================
-    report = (
-        db.query(models.Report)
-        .filter(models.Report.userId == user.userId)
-        .order_by(models.Report.createdAt.desc())
-        .first()
-    )
-
-    if not report:
-        report = models.Report(
-            userId=user.userId,
-            totalAttempts=0,
-            correctCount=0,
-            awarenessScore=0.0
-        )
-        db.add(report)
-
-    report.totalAttempts += 1
-    report.correctCount += is_correct
-    report.awarenessScore = round(
-        (report.correctCount / max(1, report.totalAttempts)) * 100.0, 1
-    )
+    apply_attempts(db, user, [(quiz.topicId, is_correct)])
 
     db.commit()
-    db.refresh(report)
+    db.refresh(attempt)
 
     return attempt
+
+
+def queue_attempt(payload: schemas.AttemptCreate, response: Response, db: Session):
+    """Queue ingest mode: grade from the answer key, append, answer 202."""
+    if not answer_key.user_exists(db, payload.userId):
+        raise HTTPException(400, "User not found")
+
+    key = answer_key.quizzes(db, [payload.quizId]).get(payload.quizId)
+    if not key:
+        raise HTTPException(400, "Quiz not found")
+
+    selected = payload.selectedAnswer.upper()
+    is_correct = 1 if selected == key[0] else 0
+    submitted = attempt_queue.enqueue([(payload.userId, payload.quizId, selected, is_correct)])
+
+    response.status_code = 202
+    return schemas.AttemptQueuedOut(
+        userId=payload.userId,
+        quizId=payload.quizId,
+        selectedAnswer=selected,
+        isCorrect=is_correct,
+        submittedAt=submitted,
+    )
+
+
+# ============================================
+# RECORD A WHOLE QUIZ SESSION
+# ============================================
+@router.post("/batch", response_model=schemas.AttemptBatchOut)
+def record_attempts_batch(
+    payload: schemas.AttemptBatchCreate, response: Response, db: Session = Depends(get_db)
+):
+    """
+    POST /api/attempts/batch
+
+    Scores every answer of a quiz session and stores them in one transaction:
+    one IN query for the quizzes, one bulk insert, one round of aggregate
+    updates. In queue ingest mode the session is graded from the answer
+    key and appended to the queue as one unit instead (202).
+    """
+
+    queued = attempt_queue.accepting()
+    if queued:
+        user = None
+        if not answer_key.user_exists(db, payload.userId):
+            raise HTTPException(400, "User not found")
+    else:
+        user = db.get(models.User, payload.userId)
+        if not user:
+            raise HTTPException(400, "User not found")
+
+    quiz_ids = {a.quizId for a in payload.answers}
+    if queued:
+        key = answer_key.quizzes(db, quiz_ids)
+    else:
+        key = {
+            quiz_id: (answer, topic_id)
+            for quiz_id, answer, topic_id in db.query(
+                models.Quiz.quizId, models.Quiz.correctAnswer, models.Quiz.topicId
+            ).filter(models.Quiz.quizId.in_(quiz_ids))
+        }
+
+    missing = sorted(quiz_ids - key.keys())
+    if missing:
+        raise HTTPException(400, f"Quiz not found: {', '.join(map(str, missing))}")
+
+    rows = []
+    results = []
+    scored = []
+    for answer in payload.answers:
+        correct_answer, topic_id = key[answer.quizId]
+        selected = answer.selectedAnswer.upper()
+        is_correct = 1 if selected == correct_answer.upper() else 0
+        scored.append((topic_id, is_correct))
+
+        rows.append({
+            "userId": payload.userId,
+            "quizId": answer.quizId,
+            "selectedAnswer": selected,
+            "isCorrect": is_correct,
+        })
+        results.append(schemas.AttemptResult(
+            quizId=answer.quizId,
+            selectedAnswer=selected,
+            isCorrect=is_correct,
+        ))
+
+    correct = sum(r["isCorrect"] for r in rows)
+
+    if queued:
+        attempt_queue.enqueue([
+            (r["userId"], r["quizId"], r["selectedAnswer"], r["isCorrect"]) for r in rows
+        ])
+        response.status_code = 202
+    else:
+        db.execute(insert(models.QuizAttempt), rows)
+        apply_attempts(db, user, scored)
+        db.commit()
+
+    return schemas.AttemptBatchOut(
+        userId=payload.userId,
+        totalAttempts=len(rows),
+        correctCount=correct,
+        results=results,
+    )
@@ -4,9 +4,12 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
 
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.security import hasher
 from ..db import get_db
 from .. import models, schemas
 
@@ -23,8 +26,6 @@ SECRET_KEY = "CHANGE_THIS_TO_A_LONG_RANDOM_SECRET_KEY_987654321"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 security = HTTPBearer()
 
 
@@ -42,6 +43,45 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def login_response(user: models.User):
+    access_token = create_access_token(
+        data={
+            "sub": user.email,
+            "role": user.role,
+            "userId": user.userId,
+            "department": user.department,
+        }
+    )
+
+    return {
+        "token": access_token,
+        "user": {
+            "userId": user.userId,
+            "name": user.name,
+            "email": user.email,
+            "role": user.role,
+            "department": user.department,
+        },
+    }
+
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid or expired authentication token",
+)
+
+
+def decode_token(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+
 # ============================================================
 # CREATE FIRST SUPERADMIN (RUN ONLY ONCE)
 # ============================================================
@@ -59,7 +99,7 @@ def init_superadmin(db: Session = Depends(get_db)):
     superadmin = models.User(
         name="Super Admin",
         email="superadmin@system.com",
-        passwordHash=pwd.hash("SuperAdmin@123"),
+        passwordHash=hasher.hash("SuperAdmin@123"),
         role="SuperAdmin",
         department="IT",
     )
@@ -85,53 +125,78 @@ def login(payload: schemas.LoginRequest, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(404, "User not found")
 
-    if not pwd.verify(payload.password, user.passwordHash):
+    valid, new_hash = hasher.verify_and_update(payload.password, user.passwordHash)
+    if not valid:
         raise HTTPException(401, "Invalid password")
 
-    access_token = create_access_token(
-        data={
-            "sub": user.email,
-            "role": user.role,
-            "userId": user.userId,
-            "department": user.department,
-        }
-    )
+    # Stored hash predates the configured cost factor: upgrade it in place
+    if new_hash:
+        user.passwordHash = new_hash
+        db.commit()
 
-    return {
-        "token": access_token,
-        "user": {
-            "userId": user.userId,
-            "name": user.name,
-            "email": user.email,
-            "role": user.role,
-            "department": user.department,
-        },
-    }
+    return login_response(user)
 
 
 # ============================================================
 # GET CURRENT LOGGED-IN USER
 # ============================================================
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-):
-    token = credentials.credentials
+class TokenUser:
+    """The authenticated user, built from token claims or a cached row."""
 
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid or expired authentication token",
- )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+    __slots__ = ("userId", "email", "name", "role", "department")
+
+    def __init__(self, userId, email, role, department, name=None):
+        self.userId = userId
+        self.email = email
+        self.name = name
+        self.role = role
+        self.department = department
+
+    @classmethod
+    def from_claims(cls, payload: dict):
+        if payload.get("userId") is None or payload.get("role") is None:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        return cls(payload["userId"], payload["sub"], payload["role"], payload.get("department"))
+
+    @classmethod
+    def from_model(cls, user: models.User):
+        return cls(user.userId, user.email, user.role, user.department, user.name)
+
 
+# Keyed by email (the token subject). Per worker: other workers only see a
+# change once their entry expires, so keep AUTH_USER_CACHE_TTL short.
+user_cache = TTLCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+def invalidate_user(*emails: str):
+    """Drop cached users; call whenever a user is changed or removed."""
+    for email in emails:
+        user_cache.pop(email)
+
+
+def _load_user(db: Session, email: str):
     user = db.query(models.User).filter(models.User.email == email).first()
     if user is None:
         raise credentials_exception
-
     return user
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+):
+    payload = decode_token(credentials.credentials)
+    email: str = payload["sub"]
+
+    # Signed claims only — no database round trip
+    if settings.AUTH_MODE == "claims":
+        return TokenUser.from_claims(payload)
+
+    if settings.AUTH_MODE == "cached":
+        user = user_cache.get(email)
+        if user is None:
+            user = TokenUser.from_model(await run_in_threadpool(_load_user, db, email))
+            user_cache.set(email, user)
+        return user
+
+    return await run_in_threadpool(_load_user, db, email)
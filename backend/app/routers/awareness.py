@@ -1,16 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
+from ..core.cache import response_cache
+from ..core.pagination import PageParams, paginate
+from ..services.search import search_index
 from ..db import get_db
-from app import models
+from app import models, schemas
 
 router = APIRouter()
 
 
 # GET /api/awareness/tips
-@router.get("/tips")
-def list_tips(db: Session = Depends(get_db)):
-    return db.query(models.AwarenessTip).order_by(models.AwarenessTip.tipId.desc()).all()
+@router.get("/tips", response_model=list[schemas.TipOut] | schemas.Page[schemas.TipOut])
+def list_tips(
+    request: Request,
+    category: Optional[str] = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    def build():
+        query = db.query(models.AwarenessTip)
+        if category:
+            query = query.filter(models.AwarenessTip.category == category)
+        return paginate(query, page, schemas.TipOut, [models.AwarenessTip.tipId], descending=True)
+
+    return response_cache.cached(request, "tips", build)
 
 
 # POST /api/awareness/tips (NO TITLE REQUIRED)
@@ -30,6 +46,8 @@ def add_tip(payload: dict, db: Session = Depends(get_db)):
     db.add(tip)
     db.commit()
     db.refresh(tip)
+    response_cache.invalidate("tips")
+    search_index.add("tip", tip)
     return tip
 
 
@@ -50,6 +68,8 @@ def update_tip(tip_id: int, payload: dict, db: Session = Depends(get_db)):
 
     db.commit()
     db.refresh(tip)
+    response_cache.invalidate("tips")
+    search_index.add("tip", tip)
     return tip
 
 
@@ -62,4 +82,6 @@ def delete_tip(tip_id: int, db: Session = Depends(get_db)):
 
     db.delete(tip)
     db.commit()
+    response_cache.invalidate("tips")
+    search_index.remove("tip", tip_id)
     return {"deleted": True}
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.pool import pool_snapshot
+from app.core.security import hasher
+from app.core.startup import startup_timer
+from app.db import async_engine, engine
+from app.routers.auth import get_current_user
+from app.services.attempt_queue import attempt_queue
+
+
+def require_superadmin(current_user=Depends(get_current_user)):
+    if current_user.role != "SuperAdmin":
+        raise HTTPException(403, "Only SuperAdmin can view metrics")
+
+
+router = APIRouter(dependencies=[Depends(require_superadmin)])
+
+
+# GET /api/metrics/pool
+@router.get("/pool")
+def pool_metrics():
+    """Connection pool occupancy, queueing and checkout latency for this worker."""
+    pools = {"sync": pool_snapshot(engine)}
+    if async_engine is not None:
+        pools["async"] = pool_snapshot(async_engine)
+    return pools
+
+
+# GET /api/metrics/hashing
+@router.get("/hashing")
+def hashing_metrics():
+    """Password hashing pool: queue depth, rejections and latency."""
+    return hasher.snapshot()
+
+
+# GET /api/metrics/startup
+@router.get("/startup")
+def startup_metrics():
+    """How long this worker took from import to accepting traffic, by phase."""
+    return startup_timer.snapshot()
+
+
+# GET /api/metrics/ingest
+@router.get("/ingest")
+def ingest_metrics():
+    """Attempt ingest mode, queue depth and lag, and what this worker's writer applied."""
+    return attempt_queue.snapshot()
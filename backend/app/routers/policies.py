@@ -1,8 +1,7 @@
 # app/routers/policies.py
 
 import os
-import shutil
-import uuid
+from datetime import date
 from typing import Optional
 
 from fastapi import (
@@ -12,21 +11,25 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Request,
     status,
 )
-from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.files import file_response, starts_at_zero
+from app.core.pagination import DateRange, PageParams, paginate
 from app.db import get_db
 from app import models, schemas
 from app.routers.auth import get_current_user
+from app.services.download_counter import download_counter
+from app.services.pdf_pipeline import pdf_pipeline
+from app.services.policy_storage import StoredFile, derived_path, remove_derived, save_upload
+from app.services.search import search_index
 
 # ✅ NO prefix here
 router = APIRouter(tags=["Policies"])
 
-UPLOAD_DIR = "app/uploads/policies"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 
 # ================= HELPERS =================
 def validate_pdf(file: UploadFile):
@@ -34,13 +37,47 @@ def validate_pdf(file: UploadFile):
         raise HTTPException(400, "Only PDF files are allowed")
 
 
-def generate_filename(original: str) -> str:
-    return f"{uuid.uuid4()}_{original}"
+def download_name(policy: models.Policy) -> str:
+    return policy.fileName or os.path.basename(policy.filePath)
+
+
+def policy_etag(policy: models.Policy) -> Optional[str]:
+    return f'"{policy.contentHash}"' if policy.contentHash else None
+
+
+def count_delivery(policy_id: int, kind: str, request: Request, response):
+    # One hit per real delivery: not for 304s, nor for every range request
+    # of a resumed download / PDF viewer — only the one starting at byte 0.
+    if starts_at_zero(request, response):
+        download_counter.hit(policy_id, kind)
+    return response
+
+
+def create_policy(db: Session, title, description, stored: StoredFile, filename, email):
+    policy = models.Policy(
+        title=title,
+        description=description,
+        filePath=stored.path,
+        fileName=filename,
+        fileSize=stored.size,
+        contentHash=stored.sha256,
+        uploadedBy=email,
+        processingStatus="pending",
+    )
+
+    db.add(policy)
+    db.commit()
+    db.refresh(policy)
+    search_index.add("policy", policy)
+
+    # Text, page count and thumbnail are filled in by the pipeline
+    pdf_pipeline.submit(stored.path, stored.sha256)
+    return policy
 
 
 # ================= UPLOAD =================
 @router.post("/", response_model=schemas.PolicyOut)
-def upload_policy(
+async def upload_policy(
     title: str = Form(...),
     description: Optional[str] = Form(None),
     file: UploadFile = File(...),
@@ -50,40 +87,72 @@ def upload_policy(
     if current_user.role != "SuperAdmin":
         raise HTTPException(403, "Only SuperAdmin can upload policies")
 
+    # Body size is capped by BodyLimitMiddleware before the form is parsed
     validate_pdf(file)
 
-    filename = generate_filename(file.filename)
-    path = os.path.join(UPLOAD_DIR, filename)
-
-    with open(path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Chunked, hashed and deduplicated by content
+    stored = await save_upload(file)
 
-    policy = models.Policy(
-        title=title,
-        description=description,
-        filePath=path,
-        uploadedBy=current_user.email,
+    return await run_in_threadpool(
+        create_policy, db, title, description, stored, file.filename, current_user.email
     )
 
-    db.add(policy)
-    db.commit()
-    db.refresh(policy)
-    return policy
-
 
 # ================= LIST =================
-@router.get("/", response_model=list[schemas.PolicyOut])
+@router.get("/", response_model=list[schemas.PolicyOut] | schemas.Page[schemas.PolicyOut])
 def list_policies(
+    created: DateRange = Depends(),
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    return db.query(models.Policy).order_by(models.Policy.createdAt.desc()).all()
+    query = created.apply(db.query(models.Policy), models.Policy.createdAt)
+
+    return paginate(
+        query,
+        page,
+        schemas.PolicyOut,
+        [models.Policy.createdAt, models.Policy.policyId],
+        descending=True,
+    )
+
+
+# ================= DOWNLOAD STATS =================
+@router.get("/stats", response_model=list[schemas.PolicyDownloadStatOut])
+def download_stats(
+    policyId: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    GET /api/policies/stats — per-day download / preview counts.
+    Counts reach the table on the next flush (DOWNLOAD_FLUSH_INTERVAL).
+    """
+    if current_user.role not in ("Admin", "SuperAdmin"):
+        raise HTTPException(403, "Only admins can view download stats")
+
+    query = db.query(models.PolicyDownloadStat)
+    if policyId is not None:
+        query = query.filter(models.PolicyDownloadStat.policyId == policyId)
+    if date_from:
+        query = query.filter(models.PolicyDownloadStat.day >= date_from)
+    if date_to:
+        query = query.filter(models.PolicyDownloadStat.day <= date_to)
+
+    return query.order_by(
+        models.PolicyDownloadStat.day,
+        models.PolicyDownloadStat.policyId,
+        models.PolicyDownloadStat.kind,
+    ).all()
 
 
 # ================= DOWNLOAD =================
 @router.get("/{policyId}/download")
 def download_policy(
     policyId: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -91,11 +160,13 @@ def download_policy(
     if not policy:
         raise HTTPException(404, "Policy not found")
 
-    return FileResponse(
+    response = file_response(
+        request,
         policy.filePath,
-        filename=os.path.basename(policy.filePath),
-        media_type="application/pdf",
+        etag=policy_etag(policy),
+        filename=download_name(policy),
     )
+    return count_delivery(policyId, "download", request, response)
 
 
 # ================= UPDATE =================
@@ -119,6 +190,7 @@ def update_policy(
 
     db.commit()
     db.refresh(policy)
+    search_index.add("policy", policy)
     return policy
 
 
@@ -136,11 +208,22 @@ def delete_policy(
     if not policy:
         raise HTTPException(404, "Policy not found")
 
-    if os.path.exists(policy.filePath):
-        os.remove(policy.filePath)
+    # Identical uploads share one file: only remove it with its last user
+    shared = (
+        db.query(models.Policy.policyId)
+        .filter(models.Policy.filePath == policy.filePath)
+        .filter(models.Policy.policyId != policyId)
+        .first()
+    )
+    if not shared:
+        if os.path.exists(policy.filePath):
+            os.remove(policy.filePath)
+        if policy.contentHash:
+            remove_derived(policy.contentHash)
 
     db.delete(policy)
     db.commit()
+    search_index.remove("policy", policyId)
     return {"deleted": True}
 
 
@@ -148,6 +231,7 @@ def delete_policy(
 @router.get("/{policyId}/preview")
 def preview_policy(
     policyId: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -155,4 +239,34 @@ def preview_policy(
     if not policy:
         raise HTTPException(404, "Policy not found")
 
-    return FileResponse(policy.filePath, media_type="application/pdf")
+    response = file_response(
+        request,
+        policy.filePath,
+        etag=policy_etag(policy),
+        inline=True,
+    )
+    return count_delivery(policyId, "preview", request, response)
+
+
+# ================= THUMBNAIL =================
+@router.get("/{policyId}/thumbnail")
+def policy_thumbnail(
+    policyId: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """First-page PNG, so lists can show a document without fetching it."""
+    policy = db.get(models.Policy, policyId)
+    if not policy:
+        raise HTTPException(404, "Policy not found")
+    if not policy.hasThumbnail:
+        raise HTTPException(404, "Thumbnail not available")
+
+    return file_response(
+        request,
+        derived_path(policy.contentHash, "png"),
+        etag=f'"{policy.contentHash}-thumb"',
+        inline=True,
+        media_type="image/png",
+    )
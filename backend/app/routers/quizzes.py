@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
+from ..core.cache import response_cache
+from ..core.pagination import PageParams, paginate
 from ..db import get_db
+from ..services.archive import quiz_has_attempts
+from ..services.attempt_queue import answer_key
+from ..services.quiz_pool import quiz_pool
 from app import models, schemas
 
 router = APIRouter()
@@ -10,17 +15,23 @@ router = APIRouter()
 # =======================================
 # LIST QUIZZES
 # =======================================
-@router.get("", response_model=list[schemas.QuizOut])
-def list_quizzes(
-    topicId: int | None = None,
-    db: Session = Depends(get_db)
-):
+def quiz_page(db: Session, topicId: int | None, page: PageParams):
     query = db.query(models.Quiz)
 
     if topicId:
         query = query.filter(models.Quiz.topicId == topicId)
 
-    return query.order_by(models.Quiz.quizId).all()
+    return paginate(query, page, schemas.QuizOut, [models.Quiz.quizId])
+
+
+@router.get("", response_model=list[schemas.QuizOut] | schemas.Page[schemas.QuizOut])
+def list_quizzes(
+    request: Request,
+    topicId: int | None = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db)
+):
+    return response_cache.cached(request, "quizzes", lambda: quiz_page(db, topicId, page))
 
 
 # =======================================
@@ -41,6 +52,8 @@ def create_quiz(
     db.add(quiz)
     db.commit()
     db.refresh(quiz)
+    response_cache.invalidate("quizzes")
+    quiz_pool.invalidate(quiz.topicId)
 
     return quiz
 
@@ -70,10 +83,13 @@ def update_quiz(
     quiz.optionC = payload.optionC
     quiz.optionD = payload.optionD
     quiz.correctAnswer = payload.correctAnswer
-    quiz.topicId = payload.topicId
+    previous_topic, quiz.topicId = quiz.topicId, payload.topicId
 
     db.commit()
     db.refresh(quiz)
+    response_cache.invalidate("quizzes")
+    quiz_pool.invalidate(previous_topic, quiz.topicId)
+    answer_key.invalidate_quizzes(quiz.quizId)
 
     return quiz
 
@@ -91,20 +107,18 @@ def delete_quiz(
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    # Check if quiz has attempts → prevent delete if used
-    attempts_exist = (
-        db.query(models.QuizAttempt)
-        .filter(models.QuizAttempt.quizId == quizId)
-        .first()
-    )
-
-    if attempts_exist:
+    # Check if quiz has attempts (archived ones too) → prevent delete if used
+    if quiz_has_attempts(db, quizId):
         raise HTTPException(
             status_code=400,
             detail="Cannot delete quiz: attempts exist"
         )
 
+    topic_id = quiz.topicId
     db.delete(quiz)
     db.commit()
+    response_cache.invalidate("quizzes")
+    quiz_pool.invalidate(topic_id)
+    answer_key.invalidate_quizzes(quizId)
 
     return {"deleted": True}
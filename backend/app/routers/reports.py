@@ -1,51 +1,243 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from ..core.config import settings
+from ..core.pagination import DateRange, PageParams, paginate
 from ..db import get_db
 from .. import models, schemas
 from ..routers.auth import get_current_user
+from ..services import exports, rollups, summaries
+from ..services.archive import attempt_history
+
+# Range served when the caller gives no date_from
+DEFAULT_SPAN = {"day": timedelta(days=90), "week": timedelta(weeks=52), "month": timedelta(days=730)}
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[schemas.ReportOut])
+@router.get("", response_model=list[schemas.ReportOut] | schemas.Page[schemas.ReportOut])
 def list_reports(
+    department: Optional[str] = None,
+    created: DateRange = Depends(),
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     role = (current_user.role or "").lower()
+    query = db.query(models.Report)
 
     # =====================================
-    # SUPERADMIN → sees ALL reports
+    # SUPERADMIN → sees ALL reports (optionally one department)
     # =====================================
     if role == "superadmin":
-        return (
-            db.query(models.Report)
-            .order_by(models.Report.createdAt.desc())
-            .all()
-        )
+        if department is not None:
+            query = (
+                query.join(models.User, models.Report.userId == models.User.userId)
+                .filter(models.User.department == department)
+            )
 
     # =====================================
     # ADMIN → sees reports of their department
     # =====================================
-    if role == "admin":
-        return (
-            db.query(models.Report)
-            .join(models.User, models.Report.userId == models.User.userId)
+    elif role == "admin":
+        query = (
+            query.join(models.User, models.Report.userId == models.User.userId)
             .filter(models.User.department == current_user.department)
-            .order_by(models.Report.createdAt.desc())
-            .all()
         )
 
     # =====================================
     # STAFF → sees their own reports only
     # =====================================
-    if role in ("staff", "user"):
-        return (
-            db.query(models.Report)
-            .filter(models.Report.userId == current_user.userId)
-            .order_by(models.Report.createdAt.desc())
-            .all()
+    elif role in ("staff", "user"):
+        query = query.filter(models.Report.userId == current_user.userId)
+
+    else:
+        raise HTTPException(status_code=403, detail="Invalid role")
+
+    query = created.apply(query, models.Report.createdAt)
+
+    return paginate(
+        query,
+        page,
+        schemas.ReportOut,
+        [models.Report.createdAt, models.Report.reportId],
+        descending=True,
+    )
+
+
+# =====================================
+# SUMMARY — precomputed department / org rollups
+# =====================================
+@router.get("/summary", response_model=schemas.ReportSummaryResponse)
+def report_summary(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    GET /api/reports/summary
+
+    Served from `report_summaries` (one row per department), so the cost
+    does not depend on headcount. Rows are rebuilt in the background and
+    trail submissions by up to SUMMARY_REFRESH_INTERVAL seconds.
+    """
+    role = (current_user.role or "").lower()
+
+    if role == "superadmin":
+        rows = summaries.department_summaries(db)
+        return {
+            "organization": summaries.organization_summary(rows),
+            "departments": [summaries.department_out(r) for r in rows],
+        }
+
+    if role == "admin":
+        rows = summaries.department_summaries(db, current_user.department or "")
+        return {"departments": [summaries.department_out(r) for r in rows]}
+
+    raise HTTPException(status_code=403, detail="Only admins can view summaries")
+
+
+# =====================================
+# TRENDS — day / week / month buckets from attempt_rollups
+# =====================================
+@router.get("/trends", response_model=schemas.TrendOut)
+def report_trends(
+    period: str = Query("week", pattern="^(day|week|month)$"),
+    scope: str = Query("organization", pattern="^(organization|department|topic|user)$"),
+    key: Optional[str] = Query(None, description="Department, topicId or userId for that scope"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    GET /api/reports/trends
+
+    Attempts and accuracy per bucket, zero-filled. Reads one precomputed
+    row per bucket, so multi-year ranges cost the same as a week.
+    """
+    role = (current_user.role or "").lower()
+
+    if scope == "organization":
+        key = None
+    elif key is None:
+        if role == "admin" and scope == "department":
+            key = current_user.department or ""
+        elif role in ("staff", "user") and scope == "user":
+            key = str(current_user.userId)
+        else:
+            raise HTTPException(400, f"key is required for scope '{scope}'")
+
+    # SuperAdmin: everything. Admin: their department and its users.
+    # Staff: themselves.
+    if role == "admin":
+        if scope == "department" and key != (current_user.department or ""):
+            raise HTTPException(403, "Admins can only view their own department")
+        if scope == "user":
+            user = db.get(models.User, int(key)) if key.isdigit() else None
+            if user is None or user.department != current_user.department:
+                raise HTTPException(403, "Admins can only view users of their department")
+        if scope in ("organization", "topic"):
+            raise HTTPException(403, "Only SuperAdmin can view organization-wide trends")
+    elif role in ("staff", "user"):
+        if scope != "user" or key != str(current_user.userId):
+            raise HTTPException(403, "Staff can only view their own trend")
+    elif role != "superadmin":
+        raise HTTPException(403, "Invalid role")
+
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - DEFAULT_SPAN[period]
+    if date_from > date_to:
+        raise HTTPException(400, "date_from must not be after date_to")
+    if rollups.bucket_count(period, date_from, date_to) > settings.TREND_MAX_POINTS:
+        raise HTTPException(400, f"Range too long: at most {settings.TREND_MAX_POINTS} {period} buckets")
+
+    return {
+        "period": period,
+        "scope": scope,
+        "key": key,
+        "points": rollups.trend(db, period, scope, key, date_from, date_to),
+    }
+
+
+# =====================================
+# EXPORT — streamed CSV / XLSX for audits
+# =====================================
+Report, User, Quiz = models.Report, models.User, models.Quiz
+History = attempt_history("attempts").c     # archived attempts are exported too
+
+# dataset -> (statement, columns carrying userId / createdAt)
+EXPORTS = {
+    "reports": (
+        select(
+            Report.reportId, Report.userId, User.name, User.email, User.department,
+            Report.totalAttempts, Report.correctCount, Report.awarenessScore, Report.createdAt,
         )
+        .join(User, Report.userId == User.userId)
+        .order_by(Report.reportId),
+        Report.__table__.c,
+    ),
+    "attempts": (
+        select(
+            History.attemptId, History.userId, User.name, User.email, User.department,
+            History.quizId, Quiz.topicId, History.selectedAnswer, History.isCorrect, History.createdAt,
+        )
+        .join(User, History.userId == User.userId)
+        .join(Quiz, History.quizId == Quiz.quizId)
+        .order_by(History.attemptId),
+        History,
+    ),
+}
+
+
+@router.get("/export")
+def export_reports(
+    dataset: str = Query("reports", pattern="^(reports|attempts)$"),
+    fmt: str = Query("csv", alias="format", pattern="^(csv|xlsx)$"),
+    department: Optional[str] = None,
+    created: DateRange = Depends(),
+    current_user = Depends(get_current_user)
+):
+    """
+    GET /api/reports/export?dataset=reports|attempts&format=csv|xlsx
+
+    Streams every matching row, read in EXPORT_BATCH_SIZE batches from a
+    server-side cursor, so memory does not grow with the row count.
+    Scoped like the report list: SuperAdmin all (or one department),
+    Admin their department, Staff their own rows.
+    """
+    role = (current_user.role or "").lower()
+    stmt, columns = EXPORTS[dataset]
+
+    if role == "superadmin":
+        if department is not None:
+            stmt = stmt.where(User.department == department)
+    elif role == "admin":
+        stmt = stmt.where(User.department == current_user.department)
+    elif role in ("staff", "user"):
+        stmt = stmt.where(columns.userId == current_user.userId)
+    else:
+        raise HTTPException(status_code=403, detail="Invalid role")
+
+    stmt = created.apply(stmt, columns.createdAt)
+    header = [c.name for c in stmt.selected_columns]
+
+    if fmt == "xlsx":
+        try:
+            exports.check_xlsx()
+        except exports.ExportFormatError as exc:
+            raise HTTPException(400, str(exc))
+        body = exports.stream_xlsx(stmt, header, dataset)
+    else:
+        body = exports.stream_csv(stmt, header)
 
-    raise HTTPException(status_code=403, detail="Invalid role")
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    return StreamingResponse(
+        body,
+        media_type=exports.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
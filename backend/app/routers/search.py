@@ -0,0 +1,36 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.pagination import PageParams, paginate_ranked
+from app import models, schemas
+from app.routers.auth import get_current_user
+from app.services.search import SOURCES, search_index
+
+router = APIRouter()
+
+
+# GET /api/search?q=phishing&types=topic,policy
+@router.get("/", response_model=list[schemas.SearchHit] | schemas.Page[schemas.SearchHit])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(None, description="Comma-separated: topic, tip, training, policy"),
+    page: PageParams = Depends(),
+    current_user: models.User = Depends(get_current_user),
+):
+    kinds = None
+    if types:
+        kinds = {t.strip() for t in types.split(",") if t.strip()}
+        unknown = kinds - SOURCES.keys()
+        if unknown:
+            raise HTTPException(400, f"Unknown types: {', '.join(sorted(unknown))}")
+
+    search_index.ensure()
+
+    def rank(n):
+        return [
+            {"type": doc.kind, "id": doc.id, "title": doc.title, "snippet": doc.snippet, "score": round(score, 4)}
+            for score, doc in search_index.search(q, kinds, n)
+        ]
+
+    return paginate_ranked(rank, page, schemas.SearchHit)
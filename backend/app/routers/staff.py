@@ -1,34 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 
+from app.core.pagination import DateRange, PageParams, paginate
+from app.core.security import hasher
 from app.db import get_db
 from app import models, schemas
-from .auth import get_current_user
+from .auth import get_current_user, invalidate_user
+from app.services import progress, summaries
+from app.services.archive import forget_user
+from app.services.attempt_queue import answer_key
+from app.services.staff_import import ImportFormatError, import_staff, read_sheet
 
 router = APIRouter()   # ❗ remove prefix and tags here
-pwd = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 # ----------------------
 # LIST STAFF
 # ----------------------
-@router.get("", response_model=list[schemas.UserOut])
+@router.get("", response_model=list[schemas.UserOut] | schemas.Page[schemas.UserOut])
 def list_staff(
+    department: Optional[str] = None,
+    role: Optional[str] = None,
+    created: DateRange = Depends(),
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),   # no models.User type here
 ):
-    # SuperAdmin sees everyone
-    if current_user.role == "SuperAdmin":
-        return db.query(models.User).order_by(models.User.userId).all()
+    query = db.query(models.User)
 
+    # SuperAdmin sees everyone (optionally one department)
     # Admin sees only their department
-    return (
-        db.query(models.User)
-        .filter(models.User.department == current_user.department)
-        .order_by(models.User.userId)
-        .all()
-    )
+    if current_user.role != "SuperAdmin":
+        query = query.filter(models.User.department == current_user.department)
+    elif department is not None:
+        query = query.filter(models.User.department == department)
+
+    if role:
+        query = query.filter(models.User.role == role)
+    query = created.apply(query, models.User.createdAt)
+
+    return paginate(query, page, schemas.UserOut, [models.User.userId])
 
 
 # ----------------------
@@ -51,7 +64,7 @@ def create_staff(
         payload.department = current_user.department
 
     # Hash password if provided
-    password_hash = pwd.hash(payload.password) if payload.password else None
+    password_hash = hasher.hash(payload.password) if payload.password else None
 
     new_user = models.User(
         name=payload.name,
@@ -67,6 +80,75 @@ def create_staff(
     return new_user
 
 
+# ----------------------
+# BULK IMPORT STAFF (CSV / XLSX)
+# ----------------------
+@router.post("/import", response_model=schemas.StaffImportReport)
+def import_staff_file(
+    file: UploadFile = File(...),
+    start_row: int = Form(2),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    POST /api/staff/import
+
+    Columns: name, email, department, role, password. Rows are read and
+    committed in chunks; pass the returned `nextRow` as `start_row` to
+    resume an interrupted import.
+    """
+    if current_user.role not in ("Admin", "SuperAdmin"):
+        raise HTTPException(403, "Only admins can import staff")
+
+    try:
+        records = read_sheet(file.file, file.filename)
+        return import_staff(db, records, current_user, start_row=start_row)
+    except ImportFormatError as exc:
+        raise HTTPException(400, str(exc))
+
+
+# ----------------------
+# TOPIC PROGRESS
+# ----------------------
+@router.get("/progress", response_model=schemas.DepartmentProgressOut)
+def department_progress(
+    department: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Per-topic mastery of a department (SuperAdmin: any, or everyone)."""
+    if current_user.role == "Admin":
+        department = current_user.department
+    elif current_user.role != "SuperAdmin":
+        raise HTTPException(403, "Forbidden")
+
+    return {"department": department, "topics": progress.department_progress(db, department)}
+
+
+@router.get("/{userId}/progress", response_model=schemas.StaffProgressOut)
+def staff_progress(
+    userId: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    user = db.get(models.User, userId)
+    if not user:
+        raise HTTPException(404, "User not found")
+
+    # Admin: own department; Staff: themselves only
+    if current_user.role == "Admin" and user.department != current_user.department:
+        raise HTTPException(403, "Forbidden")
+    if current_user.role not in ("SuperAdmin", "Admin") and user.userId != current_user.userId:
+        raise HTTPException(403, "Forbidden")
+
+    return {
+        "userId": user.userId,
+        "name": user.name,
+        "department": user.department,
+        "topics": progress.user_progress(db, userId),
+    }
+
+
 # ----------------------
 # UPDATE STAFF
 # ----------------------
@@ -85,6 +167,8 @@ def update_staff(
     if current_user.role == "Admin" and user.department != current_user.department:
         raise HTTPException(403, "Forbidden")
 
+    old_department, old_name, old_email = user.department, user.name, user.email
+
     user.name = payload.name
     user.email = payload.email
 
@@ -96,9 +180,17 @@ def update_staff(
 
     # Update password if provided
     if payload.password:
-        user.passwordHash = pwd.hash(payload.password)
+        user.passwordHash = hasher.hash(payload.password)
+
+    # Keep report summaries / leaderboards in step with the move or rename
+    if user.department != old_department or user.name != old_name:
+        db.flush()
+        summaries.rebuild_department(db, old_department)
+        if user.department != old_department:
+            summaries.rebuild_department(db, user.department)
 
     db.commit()
+    invalidate_user(old_email, payload.email)
     db.refresh(user)
     return user
 
@@ -120,6 +212,13 @@ def delete_staff(
     if current_user.role == "Admin" and user.department != current_user.department:
         raise HTTPException(403, "Forbidden")
 
+    department, email = user.department, user.email
+
+    forget_user(db, userId)   # the ORM cascade only reaches hot attempts
     db.delete(user)
+    db.flush()
+    summaries.rebuild_department(db, department)
     db.commit()
+    invalidate_user(email)
+    answer_key.invalidate_user(userId)
     return {"deleted": True}
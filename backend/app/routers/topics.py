@@ -1,6 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.pagination import PageParams, paginate
+from app.services.archive import forget_topic
+from app.services.attempt_queue import answer_key
+from app.services.quiz_pool import quiz_pool
+from app.services.search import search_index
 from app.db import get_db
 from app import models, schemas
 
@@ -8,9 +17,20 @@ router = APIRouter(tags=["Topics"])
 
 
 # GET /api/topics
-@router.get("/", response_model=list[schemas.TopicOut])
-def list_topics(db: Session = Depends(get_db)):
-    return db.query(models.Topic).order_by(models.Topic.topicId.desc()).all()
+@router.get("/", response_model=list[schemas.TopicOut] | schemas.Page[schemas.TopicOut])
+def list_topics(
+    request: Request,
+    category: Optional[str] = None,
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    def build():
+        query = db.query(models.Topic)
+        if category:
+            query = query.filter(models.Topic.category == category)
+        return paginate(query, page, schemas.TopicOut, [models.Topic.topicId], descending=True)
+
+    return response_cache.cached(request, "topics", build)
 
 
 # POST /api/topics
@@ -20,6 +40,8 @@ def create_topic(payload: schemas.TopicCreate, db: Session = Depends(get_db)):
     db.add(topic)
     db.commit()
     db.refresh(topic)
+    response_cache.invalidate("topics")
+    search_index.add("topic", topic)
     return topic
 
 
@@ -38,6 +60,8 @@ def update_topic(topicId: int, payload: schemas.TopicCreate, db: Session = Depen
 
     db.commit()
     db.refresh(topic)
+    response_cache.invalidate("topics")
+    search_index.add("topic", topic)
     return topic
 
 
@@ -48,8 +72,13 @@ def delete_topic(topicId: int, db: Session = Depends(get_db)):
     if not topic:
         raise HTTPException(404, "Topic not found")
 
+    forget_topic(db, topicId)   # the ORM cascade only reaches hot attempts
     db.delete(topic)
     db.commit()
+    response_cache.invalidate("topics", "quizzes")  # quizzes cascade with the topic
+    quiz_pool.invalidate(topicId)
+    answer_key.invalidate_quizzes()
+    search_index.remove("topic", topicId)
     return {"deleted": True}
 
 
@@ -60,3 +89,21 @@ def get_topic(topicId: int, db: Session = Depends(get_db)):
     if not topic:
         raise HTTPException(404, "Topic not found")
     return topic
+
+
+# GET /api/topics/{topicId}/quiz-session
+@router.get("/{topicId}/quiz-session", response_model=schemas.QuizSessionOut)
+def quiz_session(
+    topicId: int,
+    count: int = Query(10, ge=1, le=settings.QUIZ_SESSION_MAX_QUESTIONS),
+    seed: Optional[int] = Query(None, ge=0, description="Repeat a previous session"),
+    db: Session = Depends(get_db),
+):
+    """
+    `count` random questions of the topic with shuffled options and no
+    answers, sampled from the in-memory pool (no query on a warm pool).
+    """
+    pool = quiz_pool.get(db, topicId)
+    if pool is None:
+        raise HTTPException(404, "Topic not found")
+    return quiz_pool.session(pool, topicId, count, seed)
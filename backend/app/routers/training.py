@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
+from ..core.cache import response_cache
+from ..core.pagination import DateRange, PageParams, paginate
+from ..services.search import search_index
 from ..db import get_db
 from app import models, schemas
 
@@ -10,9 +13,18 @@ router = APIRouter()
 # ================================
 # GET ALL TRAININGS
 # ================================
-@router.get("", response_model=list[schemas.TrainingOut])
-def list_trainings(db: Session = Depends(get_db)):
-    return db.query(models.Training).order_by(models.Training.trainingId.desc()).all()
+@router.get("", response_model=list[schemas.TrainingOut] | schemas.Page[schemas.TrainingOut])
+def list_trainings(
+    request: Request,
+    created: DateRange = Depends(),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    def build():
+        query = created.apply(db.query(models.Training), models.Training.createdAt)
+        return paginate(query, page, schemas.TrainingOut, [models.Training.trainingId], descending=True)
+
+    return response_cache.cached(request, "trainings", build)
 
 
 # ================================
@@ -27,6 +39,8 @@ def create_training(payload: schemas.TrainingBase, db: Session = Depends(get_db)
     db.add(new_training)
     db.commit()
     db.refresh(new_training)
+    response_cache.invalidate("trainings")
+    search_index.add("training", new_training)
     return new_training
 
 
@@ -41,4 +55,6 @@ def delete_training(trainingId: int, db: Session = Depends(get_db)):
 
     db.delete(t)
     db.commit()
+    response_cache.invalidate("trainings")
+    search_index.remove("training", trainingId)
     return {"deleted": True}
@@ -1,6 +1,18 @@
-from pydantic import BaseModel, EmailStr
-from datetime import datetime
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from datetime import date, datetime
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+# =============================
+# PAGINATION
+# =============================
+class Page(BaseModel, Generic[T]):
+    """Body of a paged list request (one that sent cursor or limit)."""
+    items: list[T]
+    next_cursor: Optional[str] = None
+
 
 # =============================
 # TOPICS
@@ -26,12 +38,28 @@ class PolicyOut(BaseModel):
     title: str
     description: Optional[str] = None
     filePath: str
+    fileName: Optional[str] = None
+    fileSize: Optional[int] = None
+    contentHash: Optional[str] = None
     uploadedBy: Optional[str] = None
     createdAt: datetime
     downloadCount: int 
+    processingStatus: Optional[str] = None
+    pageCount: Optional[int] = None
+    hasThumbnail: bool = False
 class Config:
         from_attributes = True
 
+class PolicyDownloadStatOut(BaseModel):
+    policyId: int
+    day: date
+    kind: str
+    count: int
+
+    class Config:
+        from_attributes = True
+
+
 # =============================
 # USERS / STAFF
 # =============================
@@ -62,6 +90,20 @@ class UserOut(BaseModel):
         from_attributes = True
 
 
+class ImportRowError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    error: str
+
+
+class StaffImportReport(BaseModel):
+    created: int
+    skipped: int
+    failed: int
+    nextRow: int
+    errors: list[ImportRowError]
+
+
 # =============================
 # AUTH
 # =============================
@@ -97,6 +139,24 @@ class QuizOut(QuizBase):
         from_attributes = True
 
 
+class QuizOption(BaseModel):
+    key: str           # original letter: submit this as selectedAnswer
+    text: str
+
+
+class SessionQuestion(BaseModel):
+    quizId: int
+    question: str
+    options: list[QuizOption]
+
+
+class QuizSessionOut(BaseModel):
+    topicId: int
+    seed: int          # pass back to get the same session again
+    poolSize: int
+    questions: list[SessionQuestion]
+
+
 # =============================
 # QUIZ ATTEMPTS
 # =============================
@@ -118,6 +178,39 @@ class AttemptOut(BaseModel):
         from_attributes = True
 
 
+class AttemptQueuedOut(BaseModel):
+    """202 body in queue ingest mode: graded, stored once the queue drains."""
+    userId: int
+    quizId: int
+    selectedAnswer: str
+    isCorrect: int
+    submittedAt: datetime
+    status: str = "queued"
+
+
+class AttemptAnswer(BaseModel):
+    quizId: int
+    selectedAnswer: str
+
+
+class AttemptBatchCreate(BaseModel):
+    userId: int
+    answers: list[AttemptAnswer] = Field(..., min_length=1, max_length=200)
+
+
+class AttemptResult(BaseModel):
+    quizId: int
+    selectedAnswer: str
+    isCorrect: int
+
+
+class AttemptBatchOut(BaseModel):
+    userId: int
+    totalAttempts: int
+    correctCount: int
+    results: list[AttemptResult]
+
+
 # =============================
 # REPORTS
 # =============================
@@ -133,6 +226,90 @@ class ReportOut(BaseModel):
         from_attributes = True
 
 
+class LeaderboardEntry(BaseModel):
+    userId: int
+    name: str
+    score: float
+
+
+class ReportSummaryOut(BaseModel):
+    scope: str
+    participants: int
+    totalAttempts: int
+    correctCount: int
+    averageScore: float
+    top: list[LeaderboardEntry]
+    bottom: list[LeaderboardEntry]
+
+
+class ReportSummaryResponse(BaseModel):
+    organization: Optional[ReportSummaryOut] = None
+    departments: list[ReportSummaryOut]
+
+
+class TrendPoint(BaseModel):
+    bucket: date            # first day of the day / week / month
+    attempts: int
+    correctCount: int
+    accuracy: Optional[float] = None   # None for buckets without attempts
+
+
+class TrendOut(BaseModel):
+    period: str
+    scope: str
+    key: Optional[str] = None
+    points: list[TrendPoint]
+
+
+# =============================
+# TOPIC PROGRESS
+# =============================
+class TopicProgressOut(BaseModel):
+    topicId: int
+    title: str
+    attempts: int
+    correctCount: int
+    accuracy: float
+    mastery: float        # 0-100, faded since lastAttemptAt
+    lastAttemptAt: Optional[datetime] = None
+
+
+class StaffProgressOut(BaseModel):
+    userId: int
+    name: str
+    department: Optional[str] = None
+    topics: list[TopicProgressOut]
+
+
+class DepartmentTopicProgressOut(BaseModel):
+    topicId: int
+    title: str
+    learners: int
+    attempts: int
+    correctCount: int
+    accuracy: float
+    averageMastery: float
+    weakLearners: int     # mastery below MASTERY_WEAK_THRESHOLD
+
+
+class DepartmentProgressOut(BaseModel):
+    department: Optional[str] = None   # None: whole organization
+    topics: list[DepartmentTopicProgressOut]
+
+
+# =============================
+# AWARENESS TIPS
+# =============================
+class TipOut(BaseModel):
+    tipId: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 # =============================
 # TRAINING
 # =============================
@@ -146,3 +323,14 @@ class TrainingOut(TrainingBase):
 
     class Config:
         from_attributes = True
+
+
+# =============================
+# SEARCH
+# =============================
+class SearchHit(BaseModel):
+    type: str          # topic | tip | training | policy
+    id: int
+    title: str
+    snippet: str
+    score: float
@@ -0,0 +1,2 @@
+# Make this folder a normal Python package
+__all__ = []
@@ -0,0 +1,152 @@
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, exists, insert, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+attempts = models.QuizAttempt.__table__
+archive = models.QuizAttemptArchive.__table__
+quizzes = models.Quiz.__table__
+
+COLUMNS = ["attemptId", "userId", "quizId", "selectedAnswer", "isCorrect", "createdAt"]
+
+
+# ============================================
+# READING BOTH TABLES
+# ============================================
+def attempt_history(name: str = "attempt_history"):
+    """
+    Hot and archived attempts as one subquery with the quiz_attempts
+    columns. Full rebuilds read this; request paths stay on the hot table.
+    """
+    return union_all(
+        select(*(attempts.c[c] for c in COLUMNS)),
+        select(*(archive.c[c] for c in COLUMNS)),
+    ).subquery(name)
+
+
+def quiz_has_attempts(db: Session, quiz_id: int) -> bool:
+    return bool(
+        db.scalar(select(exists().where(attempts.c.quizId == quiz_id)))
+        or db.scalar(select(exists().where(archive.c.quizId == quiz_id)))
+    )
+
+
+def forget_user(db: Session, user_id: int):
+    """Archived rows have no foreign keys: remove them with their user."""
+    db.execute(delete(archive).where(archive.c.userId == user_id))
+
+
+def forget_topic(db: Session, topic_id: int):
+    """Same for a topic's quizzes; call before the quizzes are deleted."""
+    db.execute(delete(archive).where(
+        archive.c.quizId.in_(select(quizzes.c.quizId).where(quizzes.c.topicId == topic_id))
+    ))
+
+
+# ============================================
+# MOVING ATTEMPTS
+# ============================================
+def _month(day: date, months: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def archive_cutoff(today: date | None = None) -> date:
+    """
+    First day of the month ARCHIVE_AFTER_DAYS ago. Whole months move at
+    once, so on MySQL their partitions empty out and can be dropped.
+    """
+    today = today or datetime.utcnow().date()
+    return _month(today - timedelta(days=settings.ARCHIVE_AFTER_DAYS))
+
+
+def archive_attempts(db: Session, cutoff: date) -> int:
+    """
+    Move attempts created before `cutoff` into the archive. Each batch is
+    copied and deleted in one transaction, so attempt_history() never sees
+    a row twice or not at all. Walks the primary key; returns rows moved.
+    """
+    moved, last = 0, 0
+    while True:
+        ids = db.scalars(
+            select(attempts.c.attemptId)
+            .where(attempts.c.attemptId > last, attempts.c.createdAt < cutoff)
+            .order_by(attempts.c.attemptId)
+            .limit(settings.ARCHIVE_BATCH_SIZE)
+        ).all()
+        if not ids:
+            return moved
+
+        batch = attempts.c.attemptId.in_(ids)
+        db.execute(insert(archive).from_select(
+            COLUMNS, select(*(attempts.c[c] for c in COLUMNS)).where(batch)
+        ))
+        db.execute(delete(attempts).where(batch))
+        db.commit()
+
+        moved += len(ids)
+        last = ids[-1]
+        log.info("Archived %d attempts (up to attemptId %d)", moved, last)
+
+
+# ============================================
+# MYSQL MONTHLY PARTITIONS
+# ============================================
+def partition_name(month: date) -> str:
+    """pYYYYMM holds that month; pmax catches anything past the last one."""
+    return f"p{month:%Y%m}"
+
+
+def _monthly_partitions(db: Session) -> list:
+    if db.get_bind().dialect.name != "mysql":
+        return []
+    names = db.scalars(text(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'quiz_attempts' "
+        "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+    )).all()
+    return [date(int(n[1:5]), int(n[5:7]), 1) for n in names if n != "pmax"]
+
+
+def add_partitions(db: Session, today: date | None = None) -> list:
+    """Split pmax so months up to PARTITION_MONTHS_AHEAD ahead have their own partition."""
+    months = _monthly_partitions(db)
+    if not months:
+        return []
+
+    target = _month(today or datetime.utcnow().date(), settings.PARTITION_MONTHS_AHEAD)
+    new, month = [], _month(months[-1], 1)
+    while month <= target:
+        new.append(month)
+        month = _month(month, 1)
+
+    if new:
+        parts = ", ".join(
+            f"PARTITION {partition_name(m)} VALUES LESS THAN (TO_DAYS('{_month(m, 1)}'))" for m in new
+        )
+        db.execute(text(
+            f"ALTER TABLE quiz_attempts REORGANIZE PARTITION pmax INTO "
+            f"({parts}, PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        ))
+    return [partition_name(m) for m in new]
+
+
+def drop_partitions(db: Session, cutoff: date) -> list:
+    """Drop monthly partitions that end by `cutoff` and have been emptied."""
+    dropped = []
+    for month in _monthly_partitions(db):
+        if _month(month, 1) > cutoff:
+            break
+        name = partition_name(month)
+        if db.execute(text(f"SELECT 1 FROM quiz_attempts PARTITION ({name}) LIMIT 1")).first():
+            log.warning("Partition %s still has attempts; not dropping it", name)
+            continue
+        db.execute(text(f"ALTER TABLE quiz_attempts DROP PARTITION {name}"))
+        dropped.append(name)
+    return dropped
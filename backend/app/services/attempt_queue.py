@@ -0,0 +1,422 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError, InterfaceError, OperationalError
+
+from app import models
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db import SessionLocal
+from app.services.scores import apply_attempts
+
+log = logging.getLogger(__name__)
+
+batches = models.AttemptIngestBatch.__table__
+quizzes = models.Quiz.__table__
+users = models.User.__table__
+
+# Lost connections, lock waits, deadlocks: retried forever, never dead-lettered
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    seq            INTEGER PRIMARY KEY AUTOINCREMENT,
+    userId         INTEGER NOT NULL,
+    quizId         INTEGER NOT NULL,
+    selectedAnswer TEXT    NOT NULL,
+    isCorrect      INTEGER NOT NULL,
+    submittedAt    TEXT    NOT NULL,
+    batchId        TEXT,
+    claimedAt      REAL
+);
+CREATE INDEX IF NOT EXISTS ix_queue_batchId ON queue (batchId);
+
+-- Batches applied and removed here, whose ids can now leave attempt_ingest_batches
+CREATE TABLE IF NOT EXISTS applied (batchId TEXT PRIMARY KEY);
+
+CREATE TABLE IF NOT EXISTS failures (
+    batchId   TEXT PRIMARY KEY,
+    failures  INTEGER NOT NULL,
+    lastError TEXT
+);
+
+-- Batches that failed ATTEMPT_QUEUE_MAX_FAILURES times; requeue by hand
+CREATE TABLE IF NOT EXISTS dead_letter (
+    seq            INTEGER PRIMARY KEY,
+    userId         INTEGER NOT NULL,
+    quizId         INTEGER NOT NULL,
+    selectedAnswer TEXT    NOT NULL,
+    isCorrect      INTEGER NOT NULL,
+    submittedAt    TEXT    NOT NULL,
+    batchId        TEXT,
+    error          TEXT,
+    failedAt       REAL
+);
+"""
+
+
+# ============================================
+# ANSWER KEY (per worker)
+# ============================================
+class AnswerKey:
+    """
+    quizId -> (correctAnswer, topicId) and known userIds, so queued
+    submissions are graded without a database round trip once warm. Quiz
+    and staff writers invalidate their entries; ATTEMPT_ANSWER_CACHE_TTL
+    bounds what other workers may still serve.
+    """
+
+    def __init__(self, ttl: float):
+        self._quizzes = TTLCache(100_000, ttl)
+        self._users = TTLCache(100_000, ttl)
+
+    def quizzes(self, db, quiz_ids) -> dict:
+        found = {q: self._quizzes.get(q) for q in quiz_ids}
+        missing = [q for q, entry in found.items() if entry is None]
+        if missing:
+            rows = db.execute(
+                select(quizzes.c.quizId, quizzes.c.correctAnswer, quizzes.c.topicId)
+                .where(quizzes.c.quizId.in_(missing))
+            ).all()
+            for quiz_id, answer, topic_id in rows:
+                found[quiz_id] = (answer.upper(), topic_id)
+                self._quizzes.set(quiz_id, found[quiz_id])
+        return {q: entry for q, entry in found.items() if entry is not None}
+
+    def user_exists(self, db, user_id: int) -> bool:
+        if self._users.get(user_id):
+            return True
+        if db.scalar(select(users.c.userId).where(users.c.userId == user_id)) is None:
+            return False
+        self._users.set(user_id, True)
+        return True
+
+    def invalidate_quizzes(self, *quiz_ids: int):
+        """No ids: drop every quiz (e.g. a topic and its quizzes went away)."""
+        if not quiz_ids:
+            self._quizzes.clear()
+        for quiz_id in quiz_ids:
+            self._quizzes.pop(quiz_id)
+
+    def invalidate_user(self, user_id: int):
+        self._users.pop(user_id)
+
+
+# ============================================
+# QUEUE
+# ============================================
+class AttemptQueue:
+    """
+    Durable write-behind queue for scored attempts: a SQLite file in WAL
+    mode on local disk, shared by the workers of one host.
+
+    A writer thread per worker claims up to ATTEMPT_QUEUE_BATCH_SIZE rows
+    under a batch id and applies them to the database in one transaction
+    that also inserts the batch id into attempt_ingest_batches. A batch
+    that was applied but not yet removed locally (crash in between) hits
+    that primary key on replay and is only removed, so every attempt is
+    applied exactly once, however long the host stays down: a batch id
+    leaves attempt_ingest_batches only after this file has recorded the
+    batch as removed (the `applied` table). Batches whose writer went
+    quiet are retaken after ATTEMPT_QUEUE_CLAIM_TIMEOUT; a batch that
+    keeps failing for non-transient reasons moves to `dead_letter`.
+    """
+
+    def __init__(self, path: str, interval: float, batch_size: int):
+        self.path = path
+        self.interval = interval
+        self.batch_size = batch_size
+        self._conn = None               # request threads, behind _lock
+        self._lock = threading.Lock()
+        self._lag = (0.0, 0.0)          # (checked at, seconds)
+        self._stop = threading.Event()
+        self._thread = None
+        self.applied = 0
+        self.dropped = 0
+        self.failures = 0
+        self.last_error = None
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={settings.ATTEMPT_QUEUE_SYNCHRONOUS}")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _shared(self):
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    # ---- request side ----
+    def enqueue(self, rows: list) -> datetime:
+        """Durably append (userId, quizId, selectedAnswer, isCorrect) rows as one unit."""
+        submitted = datetime.utcnow()
+        with self._lock:
+            conn = self._shared()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO queue (userId, quizId, selectedAnswer, isCorrect, submittedAt) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(*row, submitted.isoformat()) for row in rows],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return submitted
+
+    def lag(self) -> float:
+        """Age in seconds of the oldest queued attempt (0 when empty)."""
+        checked, seconds = self._lag
+        if time.monotonic() - checked < self.interval:
+            return seconds
+
+        with self._lock:
+            row = self._shared().execute(
+                "SELECT submittedAt FROM queue ORDER BY seq LIMIT 1"
+            ).fetchone()
+        seconds = (datetime.utcnow() - datetime.fromisoformat(row[0])).total_seconds() if row else 0.0
+        self._lag = (time.monotonic(), seconds)
+        return seconds
+
+    def accepting(self) -> bool:
+        """Queue mode, and the writer is keeping up within ATTEMPT_QUEUE_MAX_LAG."""
+        if settings.ATTEMPT_INGEST_MODE != "queue":
+            return False
+        if self.lag() > settings.ATTEMPT_QUEUE_MAX_LAG:
+            log.warning("Attempt queue lag over %.0fs; writing synchronously", settings.ATTEMPT_QUEUE_MAX_LAG)
+            return False
+        return True
+
+    # ---- writer side ----
+    def _claim(self, conn):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT batchId FROM queue WHERE batchId IS NOT NULL AND claimedAt < ? ORDER BY seq LIMIT 1",
+                (now - settings.ATTEMPT_QUEUE_CLAIM_TIMEOUT,),
+            ).fetchone()
+            if row:
+                batch_id = row[0]
+                conn.execute("UPDATE queue SET claimedAt = ? WHERE batchId = ?", (now, batch_id))
+            else:
+                batch_id = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE queue SET batchId = ?, claimedAt = ? WHERE seq IN "
+                    "(SELECT seq FROM queue WHERE batchId IS NULL ORDER BY seq LIMIT ?)",
+                    (batch_id, now, self.batch_size),
+                )
+            rows = conn.execute(
+                "SELECT userId, quizId, selectedAnswer, isCorrect, submittedAt "
+                "FROM queue WHERE batchId = ? ORDER BY seq",
+                (batch_id,),
+            ).fetchall()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return batch_id, rows
+
+    def _apply(self, conn, batch_id: str, rows: list) -> int:
+        """Write one batch and its aggregates; 0 if it was applied before."""
+        db = SessionLocal()
+        try:
+            try:
+                db.execute(insert(batches).values(batchId=batch_id, attempts=len(rows)))
+            except IntegrityError:
+                db.rollback()
+                return 0
+
+            known_users = {
+                u.userId: u for u in
+                db.query(models.User).filter(models.User.userId.in_({r[0] for r in rows}))
+            }
+            topic_of = dict(db.execute(
+                select(quizzes.c.quizId, quizzes.c.topicId)
+                .where(quizzes.c.quizId.in_({r[1] for r in rows}))
+            ).all())
+
+            # Users or quizzes deleted while their attempts were queued
+            kept = [r for r in rows if r[0] in known_users and r[1] in topic_of]
+            self.dropped += len(rows) - len(kept)
+
+            if kept:
+                db.execute(insert(models.QuizAttempt), [{
+                    "userId": user_id,
+                    "quizId": quiz_id,
+                    "selectedAnswer": selected,
+                    "isCorrect": is_correct,
+                    "createdAt": datetime.fromisoformat(submitted),
+                } for user_id, quiz_id, selected, is_correct, submitted in kept])
+
+            # Per user and day, in submission order (day buckets, mastery)
+            groups = {}
+            for user_id, quiz_id, _, is_correct, submitted in kept:
+                at = datetime.fromisoformat(submitted)
+                scored, _ = groups.get((user_id, at.date()), ([], None))
+                scored.append((topic_of[quiz_id], is_correct))
+                groups[user_id, at.date()] = (scored, at)
+            for (user_id, _), (scored, at) in groups.items():
+                apply_attempts(db, known_users[user_id], scored, at)
+
+            # A writer that retook this batch may have finished it, removed
+            # it here and pruned its id meanwhile: then it is not ours to apply
+            if conn.execute("SELECT 1 FROM queue WHERE batchId = ? LIMIT 1", (batch_id,)).fetchone() is None:
+                db.rollback()
+                return 0
+
+            db.commit()
+            return len(kept)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def drain(self, conn) -> int:
+        """Apply queued batches until the queue is empty; returns attempts written."""
+        written = 0
+        while True:
+            batch_id, rows = self._claim(conn)
+            if not rows:
+                return written
+            try:
+                applied = self._apply(conn, batch_id, rows)
+            except Exception as exc:
+                log.exception("Attempt batch %s failed; %d attempts stay queued", batch_id, len(rows))
+                self._failed(conn, batch_id, exc)
+                return written
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM queue WHERE batchId = ?", (batch_id,))
+                conn.execute("DELETE FROM failures WHERE batchId = ?", (batch_id,))
+                conn.execute("INSERT OR IGNORE INTO applied (batchId) VALUES (?)", (batch_id,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self.applied += applied
+            written += applied
+
+    def _failed(self, conn, batch_id: str, exc: Exception):
+        """
+        Keep the batch id, so a retry stays exactly-once, and retake it on
+        the next pass; after ATTEMPT_QUEUE_MAX_FAILURES non-transient
+        failures, set it aside so the batches behind it can move.
+        """
+        self.failures += 1
+        self.last_error = str(exc)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            failures = 0
+            if not isinstance(exc, TRANSIENT_ERRORS):
+                failures = conn.execute(
+                    "INSERT INTO failures (batchId, failures, lastError) VALUES (?, 1, ?) "
+                    "ON CONFLICT (batchId) DO UPDATE SET failures = failures + 1, lastError = excluded.lastError "
+                    "RETURNING failures",
+                    (batch_id, str(exc)),
+                ).fetchone()[0]
+
+            if failures >= settings.ATTEMPT_QUEUE_MAX_FAILURES:
+                conn.execute(
+                    "INSERT INTO dead_letter "
+                    "SELECT seq, userId, quizId, selectedAnswer, isCorrect, submittedAt, batchId, ?, ? "
+                    "FROM queue WHERE batchId = ?",
+                    (str(exc), time.time(), batch_id),
+                )
+                conn.execute("DELETE FROM queue WHERE batchId = ?", (batch_id,))
+                conn.execute("DELETE FROM failures WHERE batchId = ?", (batch_id,))
+                log.error("Attempt batch %s failed %d times; moved to dead_letter", batch_id, failures)
+            else:
+                conn.execute("UPDATE queue SET claimedAt = 0 WHERE batchId = ?", (batch_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _prune(self, conn):
+        """Drop the ids of batches this file no longer holds from attempt_ingest_batches."""
+        ids = [row[0] for row in conn.execute("SELECT batchId FROM applied LIMIT 1000")]
+        if not ids:
+            return
+
+        db = SessionLocal()
+        try:
+            db.execute(delete(batches).where(batches.c.batchId.in_(ids)))
+            db.commit()
+        finally:
+            db.close()
+
+        marks = ", ".join("?" * len(ids))
+        conn.execute(f"DELETE FROM applied WHERE batchId IN ({marks})", ids)
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                try:
+                    self.drain(conn)      # the first pass replays whatever a crash left behind
+                    self._prune(conn)
+                except Exception:
+                    log.exception("Attempt queue writer failed")
+                if self._stop.wait(self.interval):
+                    break
+            self.drain(conn)
+        finally:
+            conn.close()
+
+    def start(self):
+        """Run the writer in queue mode, or whenever a queue file is left to replay."""
+        if settings.ATTEMPT_INGEST_MODE != "queue" and not os.path.exists(self.path):
+            return
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="attempt-queue", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.interval, 30))
+            self._thread = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def snapshot(self) -> dict:
+        depth = dead = 0
+        if os.path.exists(self.path):
+            with self._lock:
+                conn = self._shared()
+                depth = conn.execute("SELECT COUNT(*) FROM queue").fetchone()[0]
+                dead = conn.execute("SELECT COUNT(*) FROM dead_letter").fetchone()[0]
+        return {
+            "mode": settings.ATTEMPT_INGEST_MODE,
+            "depth": depth,
+            "lagSeconds": round(self.lag(), 3) if depth else 0.0,
+            "maxLagSeconds": settings.ATTEMPT_QUEUE_MAX_LAG,
+            "applied": self.applied,
+            "dropped": self.dropped,
+            "failures": self.failures,
+            "deadLetters": dead,
+            "lastError": self.last_error,
+        }
+
+
+answer_key = AnswerKey(settings.ATTEMPT_ANSWER_CACHE_TTL)
+attempt_queue = AttemptQueue(
+    settings.ATTEMPT_QUEUE_PATH, settings.ATTEMPT_QUEUE_INTERVAL, settings.ATTEMPT_QUEUE_BATCH_SIZE,
+)
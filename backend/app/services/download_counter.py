@@ -0,0 +1,240 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.core.config import settings
+from app.db import SessionLocal, upsert
+
+log = logging.getLogger(__name__)
+
+policies = models.Policy.__table__
+stats = models.PolicyDownloadStat.__table__
+flushes = models.DownloadFlushBatch.__table__
+
+# A flush that has not finished by then is presumed dead and retaken
+CLAIM_TIMEOUT = 120.0
+FLUSH_BATCH_SIZE = 50_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hits (
+    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+    policyId  INTEGER NOT NULL,
+    day       TEXT    NOT NULL,
+    kind      TEXT    NOT NULL,
+    batchId   TEXT,
+    claimedAt REAL
+);
+CREATE INDEX IF NOT EXISTS ix_hits_batchId ON hits (batchId);
+
+-- Flushes removed here, whose ids can now leave download_flush_batches
+CREATE TABLE IF NOT EXISTS applied (batchId TEXT PRIMARY KEY);
+"""
+
+
+class DownloadCounter:
+    """
+    Journals policy download / preview hits to a local SQLite file (WAL,
+    shared by the workers of one host) and writes them in one transaction
+    per flush: a single UPDATE ... CASE for downloadCount and one
+    multi-row upsert for the per-day stats.
+
+    Each flush claims the journalled hits under a batch id that the same
+    transaction inserts into download_flush_batches, so a flush replayed
+    after a crash is recognised and not counted twice; the id is pruned
+    once this file has dropped the batch. A worker killed between flushes
+    loses nothing: the next flush, here or after a restart, picks its
+    hits up.
+    """
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self._conn = None            # request threads, behind _lock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={settings.DOWNLOAD_JOURNAL_SYNCHRONOUS}")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def hit(self, policy_id: int, kind: str):
+        day = datetime.utcnow().date().isoformat()
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            self._conn.execute(
+                "INSERT INTO hits (policyId, day, kind) VALUES (?, ?, ?)", (policy_id, day, kind)
+            )
+
+    # ---- flushing ----
+    def _claim(self, conn):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT batchId FROM hits WHERE batchId IS NOT NULL AND claimedAt < ? LIMIT 1",
+                (now - CLAIM_TIMEOUT,),
+            ).fetchone()
+            if row:
+                batch_id = row[0]
+                conn.execute("UPDATE hits SET claimedAt = ? WHERE batchId = ?", (now, batch_id))
+            else:
+                batch_id = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE hits SET batchId = ?, claimedAt = ? WHERE seq IN "
+                    "(SELECT seq FROM hits WHERE batchId IS NULL ORDER BY seq LIMIT ?)",
+                    (batch_id, now, FLUSH_BATCH_SIZE),
+                )
+            rows = conn.execute(
+                "SELECT policyId, day, kind, COUNT(*) FROM hits WHERE batchId = ? "
+                "GROUP BY policyId, day, kind",
+                (batch_id,),
+            ).fetchall()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        batch = Counter({(p, date.fromisoformat(d), k): n for p, d, k, n in rows})
+        return batch_id, batch
+
+    def _apply(self, conn, batch_id: str, batch: Counter):
+        db = SessionLocal()
+        try:
+            try:
+                db.execute(insert(flushes).values(batchId=batch_id))
+            except IntegrityError:
+                db.rollback()     # applied before a crash: only remove it here
+                return
+            self._write(db, batch)
+
+            # Retaken and finished by another worker meanwhile: not ours
+            if conn.execute("SELECT 1 FROM hits WHERE batchId = ? LIMIT 1", (batch_id,)).fetchone() is None:
+                db.rollback()
+                return
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def flush(self, conn):
+        while True:
+            batch_id, batch = self._claim(conn)
+            if not batch:
+                break
+            try:
+                self._apply(conn, batch_id, batch)
+            except Exception:
+                log.exception("Download counter flush failed; %d keys stay journalled", len(batch))
+                conn.execute("UPDATE hits SET claimedAt = 0 WHERE batchId = ?", (batch_id,))
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM hits WHERE batchId = ?", (batch_id,))
+                conn.execute("INSERT OR IGNORE INTO applied (batchId) VALUES (?)", (batch_id,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self._prune(conn)
+
+    def _prune(self, conn):
+        ids = [row[0] for row in conn.execute("SELECT batchId FROM applied LIMIT 1000")]
+        if not ids:
+            return
+
+        db = SessionLocal()
+        try:
+            db.execute(delete(flushes).where(flushes.c.batchId.in_(ids)))
+            db.commit()
+        finally:
+            db.close()
+
+        marks = ", ".join("?" * len(ids))
+        conn.execute(f"DELETE FROM applied WHERE batchId IN ({marks})", ids)
+
+    def _write(self, db, batch: Counter):
+        downloads = Counter()
+        for (policy_id, _, kind), n in batch.items():
+            if kind == "download":
+                downloads[policy_id] += n
+
+        if downloads:
+            db.execute(
+                update(policies)
+                .where(policies.c.policyId.in_(downloads))
+                .values(downloadCount=func.coalesce(policies.c.downloadCount, 0) + case(
+                    dict(downloads), value=policies.c.policyId, else_=0
+                ))
+            )
+
+        # Skip hits on policies deleted since they were counted
+        live = set(
+            db.execute(
+                select(policies.c.policyId)
+                .where(policies.c.policyId.in_({k[0] for k in batch}))
+            ).scalars()
+        )
+        rows = [
+            {"policyId": policy_id, "day": day, "kind": kind, "count": n}
+            for (policy_id, day, kind), n in batch.items()
+            if policy_id in live
+        ]
+        if rows:
+            upsert(
+                db,
+                stats,
+                rows,
+                ["policyId", "day", "kind"],
+                lambda new: [(stats.c.count, stats.c.count + new.count)],
+            )
+
+    # ---- background flusher ----
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                try:
+                    self.flush(conn)     # the first pass replays what a crash left behind
+                except Exception:
+                    log.exception("Download counter flusher failed")
+                if self._stop.wait(self.interval):
+                    break
+            self.flush(conn)
+        finally:
+            conn.close()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="download-counter", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.interval, 30))
+            self._thread = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+download_counter = DownloadCounter(settings.DOWNLOAD_JOURNAL_PATH, settings.DOWNLOAD_FLUSH_INTERVAL)
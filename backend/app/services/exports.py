@@ -0,0 +1,107 @@
+import csv
+import io
+import tempfile
+from datetime import datetime
+
+from app.core.config import settings
+from app.db import SessionLocal
+
+XLSX_MAX_ROWS = 1_048_576        # per sheet, header included
+FILE_CHUNK = 64 * 1024
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class ExportFormatError(Exception):
+    """Requested format cannot be produced; the message is user facing."""
+
+
+# ============================================
+# ROWS
+# ============================================
+def _batches(stmt):
+    """
+    Row batches of `stmt` from a server-side cursor, on a session of our
+    own: the request's session is closed before a streamed body is sent.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            stmt.execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        yield from result.partitions()
+    finally:
+        db.close()
+
+
+def _cell(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+# ============================================
+# CSV
+# ============================================
+def stream_csv(stmt, header: list):
+    """CSV text, one chunk per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    buffer.write("\ufeff")   # BOM, so Excel opens UTF-8 names correctly
+    writer.writerow(header)
+    for batch in _batches(stmt):
+        writer.writerows([_cell(v) for v in row] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+# ============================================
+# XLSX
+# ============================================
+def check_xlsx():
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        raise ExportFormatError("XLSX export needs the 'openpyxl' package")
+
+
+def stream_xlsx(stmt, header: list, title: str):
+    """
+    An XLSX workbook. The zip container can only be written once every
+    row is known, so rows go through openpyxl's write-only mode into a
+    temporary file (memory stays flat), which is then streamed out. Rows
+    past the sheet limit continue on "<title> (2)" and so on.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheets = 0
+
+    def new_sheet():
+        nonlocal sheets
+        sheets += 1
+        sheet = workbook.create_sheet(title if sheets == 1 else f"{title} ({sheets})")
+        sheet.append(header)
+        return sheet
+
+    sheet, rows = new_sheet(), 1
+    for batch in _batches(stmt):
+        for row in batch:
+            if rows == XLSX_MAX_ROWS:
+                sheet, rows = new_sheet(), 1
+            sheet.append(list(row))
+            rows += 1
+
+    with tempfile.TemporaryFile() as f:
+        workbook.save(f)
+        f.seek(0)
+        while chunk := f.read(FILE_CHUNK):
+            yield chunk
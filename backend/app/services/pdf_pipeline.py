@@ -0,0 +1,190 @@
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.core.config import settings
+from app.db import SessionLocal
+from app.services.pdf_render import process_pdf
+from app.services.policy_storage import DERIVED_DIR, derived_path
+from app.services.search import search_index
+
+log = logging.getLogger(__name__)
+
+policies = models.Policy.__table__
+jobs = models.PdfJob.__table__
+
+
+class PdfPipeline:
+    """
+    Processes uploaded policy PDFs in the background: text for search,
+    page count and a first-page thumbnail. Rendering runs on a process
+    pool; results are cached in DERIVED_DIR by content hash, so a
+    re-upload of the same file is never processed twice. Every policy
+    sharing that file is updated when the work completes.
+
+    Every worker resumes pending work at startup, so a file is only
+    rendered by the process that claims its hash in pdf_jobs; the others
+    leave it to that one.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+        self._writer = None          # applies results to the database, in order
+        self._running = {}           # sha256 -> Future, so duplicates share one job
+        self._lock = threading.Lock()
+
+    def _pools(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(1, thread_name_prefix="pdf-pipeline")
+            if self._executor is None and self.workers > 0:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+        return self._executor, self._writer
+
+    def _render(self, executor, path: str, sha256: str) -> Future:
+        args = (path, sha256, DERIVED_DIR, settings.PDF_TEXT_MAX_PAGES, settings.PDF_THUMBNAIL_WIDTH)
+        if executor is None:
+            future = Future()
+            try:
+                future.set_result(process_pdf(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        return executor.submit(process_pdf, *args)
+
+    def _claim(self, sha256: str) -> bool:
+        """Atomically take the render of one file, or a claim gone stale."""
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            try:
+                db.execute(insert(jobs).values(contentHash=sha256, claimedAt=now))
+                db.commit()
+                return True
+            except IntegrityError:
+                db.rollback()
+
+            stale = now - timedelta(seconds=settings.PDF_CLAIM_TIMEOUT)
+            taken = db.execute(
+                update(jobs)
+                .where(jobs.c.contentHash == sha256, jobs.c.claimedAt < stale)
+                .values(claimedAt=now)
+            ).rowcount
+            db.commit()
+            return taken > 0
+        finally:
+            db.close()
+
+    def _processed(self, sha256: str):
+        """Same content processed before: a future holding its manifest."""
+        manifest = derived_path(sha256, "json")
+        if not os.path.exists(manifest):
+            return None
+        future = Future()
+        with open(manifest) as fh:
+            future.set_result(json.load(fh))
+        return future
+
+    def submit(self, path: str, sha256: str):
+        """Queue one stored file; returns immediately."""
+        executor, writer = self._pools()
+
+        future = self._processed(sha256)
+        if future is None:
+            with self._lock:
+                if sha256 in self._running:
+                    return
+            # Being rendered by another worker: its results cover our rows too
+            if not self._claim(sha256):
+                return
+            future = self._processed(sha256)   # finished just before our claim
+
+        if future is None:
+            with self._lock:
+                if sha256 in self._running:
+                    return
+                future = self._running[sha256] = self._render(executor, path, sha256)
+
+        future.add_done_callback(lambda f: writer.submit(self._complete, sha256, f))
+
+    def _complete(self, sha256: str, future: Future):
+        with self._lock:
+            self._running.pop(sha256, None)
+
+        try:
+            manifest = future.result()
+            values = {
+                "processingStatus": "ready",
+                "pageCount": manifest["pages"],
+                "hasThumbnail": manifest["thumbnail"],
+            }
+        except Exception:
+            log.exception("PDF processing failed for %s", sha256)
+            values = {"processingStatus": "failed"}
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(policies)
+                .where(policies.c.contentHash == sha256)
+                .values(processedAt=datetime.utcnow(), **values)
+            )
+            db.execute(delete(jobs).where(jobs.c.contentHash == sha256))
+            db.commit()
+
+            # Re-index with the extracted text
+            for policy in db.query(models.Policy).filter(models.Policy.contentHash == sha256):
+                search_index.add("policy", policy)
+        except Exception:
+            db.rollback()
+            log.exception("Could not record PDF processing results for %s", sha256)
+        finally:
+            db.close()
+
+    def resume(self):
+        """
+        Queue policies left pending (e.g. by a restart) or never processed.
+        Work claimed by a worker that died is picked up once its claim is
+        older than PDF_CLAIM_TIMEOUT.
+        """
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(models.Policy.filePath, models.Policy.contentHash)
+                .filter(models.Policy.contentHash.isnot(None))
+                .filter(or_(
+                    models.Policy.processingStatus.is_(None),
+                    models.Policy.processingStatus == "pending",
+                ))
+                .distinct()
+                .all()
+            )
+        finally:
+            db.close()
+
+        for path, sha256 in rows:
+            self.submit(path, sha256)
+
+    def shutdown(self):
+        with self._lock:
+            executor, writer = self._executor, self._writer
+            self._executor = self._writer = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if writer is not None:
+            writer.shutdown(wait=False)
+
+
+pdf_pipeline = PdfPipeline(settings.PDF_WORKERS)
@@ -0,0 +1,73 @@
+"""
+Worker side of the policy PDF pipeline. Runs inside the pipeline's
+processes, so it imports nothing from the web app beyond the stdlib and
+the optional PDF libraries.
+"""
+import json
+import os
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.part"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _text(path: str, max_pages: int):
+    """(page count, text of the first `max_pages` pages) via pypdf."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None, None
+
+    reader = PdfReader(path)
+    pages = reader.pages
+    text = "\n".join(page.extract_text() or "" for page in pages[:max_pages])
+    return len(pages), text
+
+
+def _thumbnail(path: str, width: int):
+    """PNG bytes of the first page, `width` pixels wide, via pypdfium2."""
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        return None
+
+    pdf = pdfium.PdfDocument(path)
+    try:
+        page = pdf[0]
+        bitmap = page.render(scale=width / page.get_width())
+        image = bitmap.to_pil()
+
+        from io import BytesIO
+
+        out = BytesIO()
+        image.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+    finally:
+        pdf.close()
+
+
+def process_pdf(path: str, sha256: str, out_dir: str, max_pages: int, thumb_width: int) -> dict:
+    """
+    Extract text, render the first-page thumbnail and count pages for one
+    stored PDF, writing <sha256>.txt / .png / .json into `out_dir`. The
+    .json manifest is written last: its presence means the work is done.
+    """
+    pages, text = _text(path, max_pages)
+    thumbnail = _thumbnail(path, thumb_width)
+
+    base = os.path.join(out_dir, sha256)
+    if text is not None:
+        _write_atomic(base + ".txt", text.encode("utf-8"))
+    if thumbnail is not None:
+        _write_atomic(base + ".png", thumbnail)
+
+    manifest = {
+        "pages": pages,
+        "text": text is not None,
+        "thumbnail": thumbnail is not None,
+    }
+    _write_atomic(base + ".json", json.dumps(manifest).encode())
+    return manifest
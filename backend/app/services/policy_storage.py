@@ -0,0 +1,92 @@
+import hashlib
+import os
+import uuid
+from typing import NamedTuple
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+UPLOAD_DIR = "app/uploads/policies"
+DERIVED_DIR = os.path.join(UPLOAD_DIR, ".derived")   # text / thumbnails by hash
+os.makedirs(DERIVED_DIR, exist_ok=True)
+
+PDF_MAGIC = b"%PDF-"
+
+
+class StoredFile(NamedTuple):
+    path: str
+    sha256: str
+    size: int
+
+
+def content_path(sha256: str) -> str:
+    """Content-addressed location: identical uploads share one file."""
+    return os.path.join(UPLOAD_DIR, f"{sha256}.pdf")
+
+
+def derived_path(sha256: str, ext: str) -> str:
+    """Pipeline output for a stored file: ext is "txt", "png" or "json"."""
+    return os.path.join(DERIVED_DIR, f"{sha256}.{ext}")
+
+
+def remove_derived(sha256: str):
+    for ext in ("txt", "png", "json"):
+        path = derived_path(sha256, ext)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _write_chunk(fh, digest, chunk: bytes):
+    # Hashing and the write both release the GIL; run them off the loop
+    digest.update(chunk)
+    fh.write(chunk)
+
+
+def _finalize(tmp: str, final: str):
+    if os.path.exists(final):
+        os.remove(tmp)          # already stored: keep the existing copy
+    else:
+        os.replace(tmp, final)  # atomic on the same filesystem
+
+
+async def save_upload(upload: UploadFile) -> StoredFile:
+    """
+    Stream an uploaded PDF to disk in POLICY_UPLOAD_CHUNK_SIZE chunks,
+    computing its SHA-256 on the way and aborting with 413 as soon as it
+    exceeds POLICY_MAX_UPLOAD_BYTES.
+    """
+    tmp = os.path.join(UPLOAD_DIR, f".{uuid.uuid4()}.part")
+    digest = hashlib.sha256()
+    size = 0
+
+    fh = await run_in_threadpool(open, tmp, "wb")
+    try:
+        while True:
+            chunk = await upload.read(settings.POLICY_UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            if size == 0 and not chunk.startswith(PDF_MAGIC):
+                raise HTTPException(400, "File is not a PDF")
+
+            size += len(chunk)
+            if size > settings.POLICY_MAX_UPLOAD_BYTES:
+                raise HTTPException(413, "File exceeds the maximum upload size")
+
+            await run_in_threadpool(_write_chunk, fh, digest, chunk)
+
+        if size == 0:
+            raise HTTPException(400, "File is empty")
+
+        await run_in_threadpool(fh.close)
+        sha256 = digest.hexdigest()
+        path = content_path(sha256)
+        await run_in_threadpool(_finalize, tmp, path)
+        return StoredFile(path, sha256, size)
+    except BaseException:
+        fh.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
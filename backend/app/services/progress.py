@@ -0,0 +1,190 @@
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db import upsert
+from app.services.archive import attempt_history
+
+progress = models.UserTopicProgress.__table__
+quizzes = models.Quiz.__table__
+topics = models.Topic.__table__
+users = models.User.__table__
+
+REBUILD_CHUNK = 5000
+
+
+# ============================================
+# MASTERY
+# ============================================
+def decayed(mastery: float, since: datetime | None, now: datetime) -> float:
+    """Mastery recorded at `since`, faded to `now` (halves every half-life)."""
+    if since is None or now <= since:
+        return mastery
+    days = (now - since).total_seconds() / 86400
+    return mastery * 0.5 ** (days / settings.MASTERY_HALF_LIFE_DAYS)
+
+
+def _advance(mastery: float, outcomes: list) -> float:
+    """Move mastery towards 100 or 0 for each answer, in answer order."""
+    rate = settings.MASTERY_RATE
+    for is_correct in outcomes:
+        mastery += rate * (100.0 * is_correct - mastery)
+    return mastery
+
+
+# ============================================
+# INCREMENTAL UPDATE (called for every scored submission)
+# ============================================
+def record_progress(db: Session, user_id: int, scored: list, at: datetime | None = None):
+    """
+    Fold (topicId, isCorrect) pairs, in answer order, into the user's
+    per-topic rows. Mastery depends on the previous value, so the rows are
+    created if missing and then locked (in topic order) until commit.
+    """
+    at = at or datetime.utcnow()
+    outcomes = defaultdict(list)
+    for topic_id, is_correct in scored:
+        outcomes[topic_id].append(is_correct)
+    topic_ids = sorted(outcomes)
+
+    upsert(
+        db,
+        progress,
+        [{"userId": user_id, "topicId": t, "attempts": 0, "correctCount": 0, "mastery": 0.0}
+         for t in topic_ids],
+        ["userId", "topicId"],
+        lambda new: [(progress.c.attempts, progress.c.attempts)],  # exists: leave it alone
+    )
+
+    rows = db.execute(
+        select(progress.c.topicId, progress.c.mastery, progress.c.lastAttemptAt)
+        .where(progress.c.userId == user_id, progress.c.topicId.in_(topic_ids))
+        .order_by(progress.c.topicId)
+        .with_for_update()
+    ).all()
+
+    for row in rows:
+        results = outcomes[row.topicId]
+        mastery = _advance(decayed(row.mastery, row.lastAttemptAt, at), results)
+        db.execute(
+            update(progress)
+            .where(progress.c.userId == user_id, progress.c.topicId == row.topicId)
+            .values(
+                attempts=progress.c.attempts + len(results),
+                correctCount=progress.c.correctCount + sum(results),
+                mastery=round(mastery, 2),
+                lastAttemptAt=at,
+            )
+        )
+
+
+# ============================================
+# REBUILD FROM quiz_attempts (+ archive)
+# ============================================
+def rebuild_progress(db: Session):
+    """
+    Replay every attempt, archived ones included, per user and topic in
+    time order, into user_topic_progress. Streams the attempts and keeps
+    one dict per (user, topic) in memory; returns the row count.
+    """
+    db.execute(delete(progress))
+
+    attempts = attempt_history()
+    ordered = (
+        select(attempts.c.userId, quizzes.c.topicId, attempts.c.isCorrect, attempts.c.createdAt)
+        .select_from(attempts.join(quizzes, attempts.c.quizId == quizzes.c.quizId))
+        .order_by(attempts.c.userId, quizzes.c.topicId, attempts.c.createdAt, attempts.c.attemptId)
+        .execution_options(yield_per=REBUILD_CHUNK)
+    )
+
+    rows, current = [], None
+    for user_id, topic_id, is_correct, created in db.execute(ordered):
+        if current is None or (current["userId"], current["topicId"]) != (user_id, topic_id):
+            current = {"userId": user_id, "topicId": topic_id, "attempts": 0,
+                       "correctCount": 0, "mastery": 0.0, "lastAttemptAt": None}
+            rows.append(current)
+
+        current["mastery"] = _advance(
+            decayed(current["mastery"], current["lastAttemptAt"], created), [is_correct or 0]
+        )
+        current["attempts"] += 1
+        current["correctCount"] += is_correct or 0
+        current["lastAttemptAt"] = created
+
+    # Written after the stream is drained: a streaming cursor holds the connection
+    for r in rows:
+        r["mastery"] = round(r["mastery"], 2)
+    for i in range(0, len(rows), REBUILD_CHUNK):
+        db.execute(insert(progress), rows[i:i + REBUILD_CHUNK])
+    return len(rows)
+
+
+# ============================================
+# READS
+# ============================================
+def _accuracy(correct: int, total: int) -> float:
+    return round(correct / total * 100.0, 1) if total else 0.0
+
+
+def user_progress(db: Session, user_id: int, now: datetime | None = None) -> list:
+    """One user's rows (primary-key range), mastery faded to now."""
+    now = now or datetime.utcnow()
+    rows = db.execute(
+        select(progress, topics.c.title)
+        .select_from(progress.join(topics, progress.c.topicId == topics.c.topicId))
+        .where(progress.c.userId == user_id)
+        .order_by(progress.c.topicId)
+    ).all()
+
+    return [{
+        "topicId": r.topicId,
+        "title": r.title,
+        "attempts": r.attempts,
+        "correctCount": r.correctCount,
+        "accuracy": _accuracy(r.correctCount, r.attempts),
+        "mastery": round(decayed(r.mastery, r.lastAttemptAt, now), 1),
+        "lastAttemptAt": r.lastAttemptAt,
+    } for r in rows]
+
+
+def department_progress(db: Session, department: str | None, now: datetime | None = None) -> list:
+    """
+    Per-topic totals over a department's users (everyone when None). Reads
+    one progress row per user and topic, never quiz_attempts.
+    """
+    now = now or datetime.utcnow()
+    query = (
+        select(progress, topics.c.title)
+        .select_from(
+            progress.join(users, progress.c.userId == users.c.userId)
+            .join(topics, progress.c.topicId == topics.c.topicId)
+        )
+    )
+    if department is not None:
+        query = query.where(users.c.department == department)
+
+    by_topic = {}
+    for r in db.execute(query):
+        t = by_topic.setdefault(r.topicId, {
+            "topicId": r.topicId, "title": r.title, "learners": 0, "attempts": 0,
+            "correctCount": 0, "masterySum": 0.0, "weakLearners": 0,
+        })
+        mastery = decayed(r.mastery, r.lastAttemptAt, now)
+        t["learners"] += 1
+        t["attempts"] += r.attempts
+        t["correctCount"] += r.correctCount
+        t["masterySum"] += mastery
+        t["weakLearners"] += mastery < settings.MASTERY_WEAK_THRESHOLD
+
+    out = []
+    for topic_id in sorted(by_topic):
+        t = by_topic[topic_id]
+        mastery_sum = t.pop("masterySum")
+        t["accuracy"] = _accuracy(t["correctCount"], t["attempts"])
+        t["averageMastery"] = round(mastery_sum / t["learners"], 1)
+        out.append(t)
+    return out
@@ -0,0 +1,105 @@
+import random
+import secrets
+import threading
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+LETTERS = ("A", "B", "C", "D")
+quizzes = models.Quiz.__table__
+
+
+class PoolQuestion(NamedTuple):
+    quizId: int
+    question: str
+    options: tuple      # ((letter, text), ...) in stored order; no answer
+
+
+class QuizPool:
+    """
+    Per-topic question pools, held in memory without the correct answers.
+    A pool is loaded with one indexed query on quizzes.topicId; sessions are
+    then sampled from it without touching the database. Quiz writers call
+    invalidate(); QUIZ_POOL_TTL bounds how long other workers serve a
+    stale pool.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._pools = TTLCache(maxsize, ttl)
+        self._loading = {}             # topicId -> lock held by its loader
+        self._lock = threading.Lock()  # guards _loading
+
+    def _load(self, db: Session, topic_id: int):
+        rows = db.execute(
+            select(
+                quizzes.c.quizId, quizzes.c.question,
+                quizzes.c.optionA, quizzes.c.optionB, quizzes.c.optionC, quizzes.c.optionD,
+            )
+            .where(quizzes.c.topicId == topic_id)
+            .order_by(quizzes.c.quizId)
+        ).all()
+
+        if not rows and db.get(models.Topic, topic_id) is None:
+            return None
+
+        return tuple(
+            PoolQuestion(r.quizId, r.question, tuple(zip(LETTERS, r[2:6])))
+            for r in rows
+        )
+
+    def get(self, db: Session, topic_id: int):
+        """The topic's pool, or None when the topic does not exist."""
+        pool = self._pools.get(topic_id)
+        if pool is not None:
+            return pool
+
+        with self._lock:
+            lock = self._loading.setdefault(topic_id, threading.Lock())
+        try:
+            with lock:  # one loader per missing topic; other topics load alongside
+                pool = self._pools.get(topic_id)
+                if pool is None:
+                    pool = self._load(db, topic_id)
+                    if pool is not None:
+                        self._pools.set(topic_id, pool)
+        finally:
+            with self._lock:
+                if self._loading.get(topic_id) is lock:
+                    del self._loading[topic_id]
+        return pool
+
+    def invalidate(self, *topic_ids: int):
+        for topic_id in topic_ids:
+            self._pools.pop(topic_id)
+
+    @staticmethod
+    def session(pool: tuple, topic_id: int, count: int, seed: int | None = None) -> dict:
+        """
+        Sample `count` questions and shuffle each one's options. The same
+        seed gives the same session for as long as the pool is unchanged.
+        Options keep their original letter, which is what attempts submit.
+        """
+        if seed is None:
+            seed = secrets.randbits(32)
+        rng = random.Random(f"{topic_id}:{seed}")
+
+        questions = []
+        for i in rng.sample(range(len(pool)), min(count, len(pool))):
+            q = pool[i]
+            options = list(q.options)
+            rng.shuffle(options)
+            questions.append({
+                "quizId": q.quizId,
+                "question": q.question,
+                "options": [{"key": k, "text": t} for k, t in options],
+            })
+
+        return {"topicId": topic_id, "seed": seed, "poolSize": len(pool), "questions": questions}
+
+
+quiz_pool = QuizPool(settings.QUIZ_POOL_MAX_TOPICS, settings.QUIZ_POOL_TTL)
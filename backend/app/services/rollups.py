@@ -0,0 +1,307 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Date, String, cast, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db import SessionLocal, upsert
+from app.services.archive import attempt_history
+
+log = logging.getLogger(__name__)
+
+rollups = models.AttemptRollup.__table__
+deltas = models.AttemptRollupDelta.__table__
+quizzes = models.Quiz.__table__
+users = models.User.__table__
+
+PERIODS = ("day", "week", "month")
+
+
+# ============================================
+# BUCKETS
+# ============================================
+def bucket_start(period: str, day: date) -> date:
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(period: str, bucket: date) -> date:
+    if period == "week":
+        return bucket + timedelta(days=7)
+    if period == "month":
+        return (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return bucket + timedelta(days=1)
+
+
+def bucket_count(period: str, start: date, end: date) -> int:
+    start, end = bucket_start(period, start), bucket_start(period, end)
+    if period == "week":
+        return (end - start).days // 7 + 1
+    if period == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return (end - start).days + 1
+
+
+def _bucket_sql(dialect: str, period: str, column):
+    """Start of the bucket holding `column` (a date or datetime), in SQL."""
+    if dialect == "sqlite":
+        if period == "week":
+            return func.date(column, "-6 days", "weekday 1")
+        if period == "month":
+            return func.date(column, "start of month")
+        return func.date(column)
+
+    if dialect == "postgresql":
+        return cast(func.date_trunc(period, column), Date)
+
+    if period == "week":
+        return func.subdate(func.date(column), func.weekday(column))
+    if period == "month":
+        return func.subdate(func.date(column), func.dayofmonth(column) - 1)
+    return func.date(column)
+
+
+# ============================================
+# INCREMENTAL UPDATE (called for every scored submission)
+# ============================================
+def _increment(db: Session, tallies: dict):
+    """Upsert {(period, scope, key, bucket): [attempts, correct]} in key order."""
+    rows = [
+        {"period": period, "scope": scope, "scopeKey": key,
+         "bucket": bucket, "attempts": n, "correctCount": c}
+        for (period, scope, key, bucket), (n, c) in sorted(tallies.items())
+    ]
+    upsert(
+        db,
+        rollups,
+        rows,
+        ["period", "scope", "scopeKey", "bucket"],
+        lambda new: [
+            (rollups.c.attempts, rollups.c.attempts + new.attempts),
+            (rollups.c.correctCount, rollups.c.correctCount + new.correctCount),
+        ],
+    )
+
+
+def record_attempts(db: Session, user: models.User, scored: list, at: datetime | None = None):
+    """
+    Add (topicId, isCorrect) pairs to the user's day / week / month
+    buckets, and append the department's and topics' share to
+    attempt_rollup_deltas. Those rows are shared by every submitter, so
+    they are left to RollupFolder rather than locked here.
+    """
+    day = (at or datetime.utcnow()).date()
+
+    n, c = len(scored), sum(is_correct for _, is_correct in scored)
+    _increment(db, {
+        (period, "user", str(user.userId), bucket_start(period, day)): [n, c]
+        for period in PERIODS
+    })
+
+    shared = defaultdict(lambda: [0, 0])
+    for topic_id, is_correct in scored:
+        for scope, key in (("department", user.department or ""), ("topic", str(topic_id))):
+            shared[scope, key][0] += 1
+            shared[scope, key][1] += is_correct
+
+    db.execute(insert(deltas), [
+        {"scope": scope, "scopeKey": key, "day": day, "attempts": n, "correctCount": c}
+        for (scope, key), (n, c) in shared.items()
+    ])
+
+
+# ============================================
+# FOLDING DEPARTMENT / TOPIC DELTAS
+# ============================================
+FOLD_BATCH_SIZE = 5000
+
+
+def fold_deltas(db: Session) -> int:
+    """
+    Fold the oldest FOLD_BATCH_SIZE deltas into their day / week / month
+    buckets and delete them, all in the caller's transaction. Deltas
+    another worker has locked or already deleted are left alone, so
+    workers folding at once never count one twice. Returns the number
+    folded.
+    """
+    batch = db.execute(
+        select(deltas)
+        .order_by(deltas.c.deltaId)
+        .limit(FOLD_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not batch:
+        return 0
+
+    ids = [row.deltaId for row in batch]
+    if db.execute(delete(deltas).where(deltas.c.deltaId.in_(ids))).rowcount != len(ids):
+        db.rollback()     # taken by another worker between the read and the delete
+        return 0
+
+    tallies = defaultdict(lambda: [0, 0])
+    for row in batch:
+        for period in PERIODS:
+            tally = tallies[period, row.scope, row.scopeKey, bucket_start(period, row.day)]
+            tally[0] += row.attempts
+            tally[1] += row.correctCount
+    _increment(db, tallies)
+    return len(batch)
+
+
+class RollupFolder:
+    """
+    Folds pending department and topic deltas into attempt_rollups every
+    ROLLUP_FOLD_INTERVAL seconds, a batch per transaction. Deltas live in
+    the database, so a worker killed before folding loses none: any
+    worker picks them up on its next pass.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def fold(self) -> int:
+        folded = 0
+        while True:
+            db = SessionLocal()
+            try:
+                n = fold_deltas(db)
+                db.commit()
+            except Exception:
+                db.rollback()
+                log.exception("Rollup fold failed; deltas stay pending")
+                return folded
+            finally:
+                db.close()
+            folded += n
+            if n < FOLD_BATCH_SIZE:
+                return folded
+
+    # ---- background folder ----
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.fold()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="rollup-folder", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+        self.fold()
+
+
+# ============================================
+# BACKFILL FROM quiz_attempts (+ archive)
+# ============================================
+def rebuild_rollups(db: Session) -> int:
+    """
+    Recompute every bucket. Day buckets are aggregated from all attempts,
+    archived ones included (one pass per scope); weeks and months are
+    summed from the day rows. Pending deltas are covered by the recount
+    and dropped. Buckets follow quiz_attempts.createdAt, so keep the
+    database in UTC.
+    """
+    dialect = db.get_bind().dialect.name
+    db.execute(delete(rollups))
+    db.execute(delete(deltas))
+
+    attempts = attempt_history()
+
+    day = _bucket_sql(dialect, "day", attempts.c.createdAt)
+    keys = {
+        "user": (cast(attempts.c.userId, String), attempts),
+        "department": (
+            func.coalesce(users.c.department, ""),
+            attempts.join(users, attempts.c.userId == users.c.userId),
+        ),
+        "topic": (
+            cast(quizzes.c.topicId, String),
+            attempts.join(quizzes, attempts.c.quizId == quizzes.c.quizId),
+        ),
+    }
+    columns = ["period", "scope", "scopeKey", "bucket", "attempts", "correctCount"]
+
+    for scope, (key, source) in keys.items():
+        db.execute(insert(rollups).from_select(columns, (
+            select(
+                literal("day"), literal(scope), key, day,
+                func.count(), func.coalesce(func.sum(attempts.c.isCorrect), 0),
+            )
+            .select_from(source)
+            .group_by(key, day)
+        )))
+
+    days = rollups.alias("days")
+    for period in ("week", "month"):
+        bucket = _bucket_sql(dialect, period, days.c.bucket)
+        db.execute(insert(rollups).from_select(columns, (
+            select(
+                literal(period), days.c.scope, days.c.scopeKey, bucket,
+                func.sum(days.c.attempts), func.sum(days.c.correctCount),
+            )
+            .where(days.c.period == "day")
+            .group_by(days.c.scope, days.c.scopeKey, bucket)
+        )))
+
+    return db.scalar(select(func.count()).select_from(rollups))
+
+
+# ============================================
+# READS
+# ============================================
+def trend(db: Session, period: str, scope: str, key: str | None, start: date, end: date) -> list:
+    """
+    One point per bucket from `start` to `end` (inclusive), zero-filled.
+    scope "organization" adds up the department series, which keeps every
+    submission off a single organization-wide row. Department and topic
+    series trail submissions by up to ROLLUP_FOLD_INTERVAL seconds.
+    """
+    start, end = bucket_start(period, start), bucket_start(period, end)
+    in_range = [
+        rollups.c.period == period,
+        rollups.c.bucket >= start,
+        rollups.c.bucket <= end,
+    ]
+
+    if scope == "organization":
+        query = (
+            select(rollups.c.bucket, func.sum(rollups.c.attempts), func.sum(rollups.c.correctCount))
+            .where(rollups.c.scope == "department", *in_range)
+            .group_by(rollups.c.bucket)
+        )
+    else:
+        query = (
+            select(rollups.c.bucket, rollups.c.attempts, rollups.c.correctCount)
+            .where(rollups.c.scope == scope, rollups.c.scopeKey == key, *in_range)
+        )
+
+    found = {bucket: (n, c) for bucket, n, c in db.execute(query)}
+
+    points, bucket = [], start
+    while bucket <= end:
+        n, c = found.get(bucket, (0, 0))
+        points.append({
+            "bucket": bucket,
+            "attempts": n,
+            "correctCount": c,
+            "accuracy": round(c / n * 100.0, 1) if n else None,
+        })
+        bucket = next_bucket(period, bucket)
+    return points
+
+
+rollup_folder = RollupFolder(settings.ROLLUP_FOLD_INTERVAL)
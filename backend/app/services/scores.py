@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.db import upsert
+from app.services import progress, rollups, summaries
+from app.services.archive import attempt_history
+
+reports = models.Report.__table__
+
+
+class ReportChange(NamedTuple):
+    previous: Optional[float]  # None when this was the user's first attempt
+    current: float
+
+
+def _score(correct, total):
+    return func.round(correct * 100.0 / total, 1)
+
+
+# ============================================
+# INCREMENT ONE USER'S REPORT
+# ============================================
+def increment_report(db: Session, user_id: int, answered: int, correct: int):
+    """
+    Add `answered` attempts (`correct` of them right) to the user's report.
+
+    The counters are incremented by the database in a single upsert on the
+    unique `reports.userId`, so concurrent submissions never lose updates.
+    Returns the user's score before and after.
+    """
+    upsert(
+        db,
+        reports,
+        {
+            "userId": user_id,
+            "totalAttempts": answered,
+            "correctCount": correct,
+            "awarenessScore": round(correct / max(1, answered) * 100.0, 1),
+        },
+        ["userId"],
+        lambda new: [
+            # score first: it reads the counters before they are bumped
+            (reports.c.awarenessScore, _score(
+                reports.c.correctCount + new.correctCount,
+                reports.c.totalAttempts + new.totalAttempts,
+            )),
+            (reports.c.totalAttempts, reports.c.totalAttempts + new.totalAttempts),
+            (reports.c.correctCount, reports.c.correctCount + new.correctCount),
+        ],
+    )
+
+    # Our own row lock is held until commit, so this read is consistent
+    total, right, score = db.execute(
+        select(reports.c.totalAttempts, reports.c.correctCount, reports.c.awarenessScore)
+        .where(reports.c.userId == user_id)
+    ).one()
+
+    before = total - answered
+    previous = round((right - correct) / before * 100.0, 1) if before > 0 else None
+    return ReportChange(previous, score)
+
+
+# ============================================
+# REBUILD EVERY REPORT FROM quiz_attempts (+ archive)
+# ============================================
+def rebuild_reports(db: Session):
+    """Recompute all reports from every attempt, archived ones included, in one statement."""
+    attempts = attempt_history()
+    total = func.count(attempts.c.attemptId)
+    correct = func.coalesce(func.sum(attempts.c.isCorrect), 0)
+
+    db.execute(delete(reports))
+    result = db.execute(
+        insert(reports).from_select(
+            ["userId", "totalAttempts", "correctCount", "awarenessScore"],
+            select(attempts.c.userId, total, correct, _score(correct, total))
+            .group_by(attempts.c.userId),
+        )
+    )
+    return result.rowcount
+
+
+# ============================================
+# APPLY A SCORED SUBMISSION
+# ============================================
+def apply_attempts(db: Session, user: models.User, scored: list, at: Optional[datetime] = None):
+    """
+    Fold freshly stored attempts, as (topicId, isCorrect) pairs in answer
+    order, into every aggregate that tracks them. `at` is when they were
+    submitted, if not now (attempts applied from the ingest queue).
+    """
+    answered, correct = len(scored), sum(is_correct for _, is_correct in scored)
+    change = increment_report(db, user.userId, answered, correct)
+    summaries.touch(db, user.department)
+    progress.record_progress(db, user.userId, scored, at)
+    rollups.record_attempts(db, user, scored, at)
+    return change
@@ -0,0 +1,302 @@
+import heapq
+import logging
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db import SessionLocal
+from app.services.policy_storage import derived_path
+
+log = logging.getLogger(__name__)
+
+# A search arriving while a cold worker builds its first index waits this long
+FIRST_BUILD_WAIT = 10.0
+
+TOKEN = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or "
+    "that the this to was were will with".split()
+)
+
+# BM25 parameters; title terms count TITLE_WEIGHT times in tf and length
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3.0
+SNIPPET_CHARS = 200
+
+
+def tokenize(text) -> list:
+    if not text:
+        return []
+    return [t for t in TOKEN.findall(str(text).lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+# ============================================
+# PDF TEXT (written by the policy PDF pipeline)
+# ============================================
+def pdf_text(content_hash: str) -> str:
+    """Extracted text of a stored PDF, or "" until the pipeline has run."""
+    if not content_hash:
+        return ""
+    try:
+        with open(derived_path(content_hash, "txt"), encoding="utf-8") as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return ""
+
+
+# ============================================
+# DOCUMENT SOURCES
+# ============================================
+class Doc(NamedTuple):
+    kind: str
+    id: int
+    title: str
+    snippet: str
+    tf: dict
+    length: float
+
+
+def _snippet(text) -> str:
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= SNIPPET_CHARS else text[:SNIPPET_CHARS].rsplit(" ", 1)[0] + "…"
+
+
+def _topic(t: models.Topic):
+    return t.title, [t.description, t.category], t.description
+
+
+def _tip(t: models.AwarenessTip):
+    return t.title, [t.description, t.category], t.description
+
+
+def _training(t: models.Training):
+    return t.title, [t.description], t.description
+
+
+def _policy(p: models.Policy):
+    return p.title, [p.description, pdf_text(p.contentHash)], p.description
+
+
+SOURCES = {
+    "topic": (models.Topic, "topicId", _topic),
+    "tip": (models.AwarenessTip, "tipId", _tip),
+    "training": (models.Training, "trainingId", _training),
+    "policy": (models.Policy, "policyId", _policy),
+}
+
+
+def make_doc(kind: str, obj) -> Doc:
+    _, id_attr, fields = SOURCES[kind]
+    title, body, snippet = fields(obj)
+
+    tf = Counter()
+    for term in tokenize(title):
+        tf[term] += TITLE_WEIGHT
+    for text in body:
+        tf.update(tokenize(text))
+
+    # Untitled tips are listed by the start of their text
+    display = title or _snippet(snippet)[:80]
+    return Doc(kind, getattr(obj, id_attr), display, _snippet(snippet), dict(tf), sum(tf.values()))
+
+
+# ============================================
+# INDEX
+# ============================================
+class SearchIndex:
+    """
+    In-memory inverted index with BM25 ranking.
+
+    CRUD handlers keep it current with add()/remove() after they commit.
+    Like the memory response cache it is per worker, so a background thread
+    builds it at startup and rebuilds it every SEARCH_REINDEX_INTERVAL to
+    pick up writes made by other workers; requests only ever see a
+    finished index being swapped in.
+    """
+
+    def __init__(self):
+        self._docs = {}          # (kind, id) -> Doc
+        self._postings = {}      # term -> {(kind, id): tf}
+        self._total_length = 0.0
+        self._vocabulary = None  # sorted terms for prefix lookups; None = stale
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._replay = None      # changes made while a rebuild is running
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---- maintenance ----
+    def _insert(self, doc: Doc):
+        key = (doc.kind, doc.id)
+        self._discard(key)
+        self._docs[key] = doc
+        self._total_length += doc.length
+        for term, tf in doc.tf.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary = None
+            postings[key] = tf
+
+    def _discard(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for term in doc.tf:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+
+    def add(self, kind: str, obj):
+        doc = make_doc(kind, obj)
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(("add", doc))
+            self._insert(doc)
+
+    def remove(self, kind: str, id: int):
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(("remove", (kind, id)))
+            self._discard((kind, id))
+
+    def _rebuild(self, db: Session):
+        with self._lock:
+            self._replay = []
+
+        try:
+            fresh = SearchIndex()
+            for kind, (model, _, _) in SOURCES.items():
+                for obj in db.query(model).yield_per(500):
+                    fresh._insert(make_doc(kind, obj))
+        except BaseException:
+            with self._lock:
+                self._replay = None
+            raise
+
+        with self._lock:
+            for op, item in self._replay:
+                if op == "add":
+                    fresh._insert(item)
+                else:
+                    fresh._discard(item)
+
+            self._docs = fresh._docs
+            self._postings = fresh._postings
+            self._total_length = fresh._total_length
+            self._vocabulary = None
+            self._replay = None
+
+    def rebuild(self, db: Session):
+        """Re-read every source table into a fresh index, then swap it in."""
+        with self._build_lock:
+            self._rebuild(db)
+
+    def ensure(self):
+        """
+        Make sure the builder runs (scripts never call start()); a worker
+        still building its first index makes the request wait for it, up
+        to FIRST_BUILD_WAIT seconds, rather than build it itself.
+        """
+        if self._thread is None:
+            self.start()
+        self._ready.wait(FIRST_BUILD_WAIT)
+
+    # ---- background builder ----
+    def _refresh(self):
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        except Exception:
+            log.exception("Search index build failed")
+        finally:
+            db.close()
+
+    def _run(self):
+        self._refresh()
+        self._ready.set()      # even if it failed: serve what add() collected
+        interval = settings.SEARCH_REINDEX_INTERVAL
+        while interval and not self._stop.wait(interval):
+            self._refresh()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="search-index", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    # ---- queries ----
+    def _expand(self, prefix: str) -> list:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocab = self._vocabulary
+        terms = []
+        i = bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix) and len(terms) < 50:
+            terms.append(vocab[i])
+            i += 1
+        return terms
+
+    def search(self, query: str, kinds=None, limit: int = 20) -> list:
+        """
+        Top `limit` (score, Doc) pairs for `query`, best first. The last
+        query term also matches as a prefix ("phish" finds "phishing").
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            n = len(self._docs)
+            if not n:
+                return []
+            avg_length = self._total_length / n
+
+            weights = Counter(terms[:-1])
+            last = terms[-1]
+            if last in self._postings or len(last) < 3:
+                weights[last] += 1
+            else:
+                for term in self._expand(last):
+                    weights[term] += 1
+
+            scores = Counter()
+            for term, qtf in weights.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, tf in postings.items():
+                    if kinds and key[0] not in kinds:
+                        continue
+                    norm = K1 * (1 - B + B * self._docs[key].length / avg_length)
+                    scores[key] += qtf * idf * tf * (K1 + 1) / (tf + norm)
+
+            best = heapq.nlargest(limit, scores.items(), key=lambda kv: (kv[1], kv[0]))
+            return [(score, self._docs[key]) for key, score in best]
+
+    def __len__(self):
+        return len(self._docs)
+
+
+search_index = SearchIndex()
@@ -0,0 +1,210 @@
+import codecs
+import csv
+from itertools import islice
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.security import hasher
+
+ROLES = {"Staff", "Admin", "SuperAdmin"}
+COLUMNS = ("name", "email", "department", "role", "password")
+
+
+class ImportFormatError(ValueError):
+    """The upload cannot be read as a staff sheet at all."""
+
+
+# ============================================
+# READERS — yield (row_number, {column: value}) lazily
+# ============================================
+def _normalize(header: list) -> list:
+    return [str(h or "").strip().lower() for h in header]
+
+
+def _records(header: list, rows, first_row: int):
+    header = _normalize(header)
+    if "email" not in header or "name" not in header:
+        raise ImportFormatError("The sheet needs at least 'name' and 'email' columns")
+
+    for number, values in enumerate(rows, start=first_row):
+        record = {
+            col: (str(v).strip() if v is not None else "")
+            for col, v in zip(header, values)
+            if col in COLUMNS
+        }
+        if any(record.values()):
+            yield number, record
+
+
+def read_csv(fileobj):
+    reader = csv.reader(codecs.getreader("utf-8-sig")(fileobj))
+    header = next(reader, None)
+    if header is None:
+        raise ImportFormatError("The file is empty")
+    return _records(header, reader, first_row=2)
+
+
+def read_xlsx(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFormatError("XLSX import needs the 'openpyxl' package")
+
+    sheet = load_workbook(fileobj, read_only=True, data_only=True).active
+    rows = sheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        raise ImportFormatError("The sheet is empty")
+    return _records(list(header), rows, first_row=2)
+
+
+def read_sheet(fileobj, filename: str):
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return read_csv(fileobj)
+    if name.endswith(".xlsx"):
+        return read_xlsx(fileobj)
+    raise ImportFormatError("Only .csv and .xlsx files are supported")
+
+
+# ============================================
+# IMPORT
+# ============================================
+def _validate(number: int, record: dict, actor):
+    """Apply the create_staff rules to one row; returns (values, error)."""
+    try:
+        payload = schemas.UserCreate(
+            name=record.get("name", ""),
+            email=record.get("email", ""),
+            department=record.get("department") or None,
+            role=record.get("role") or "Staff",
+            password=record.get("password") or None,
+        )
+    except ValidationError as exc:
+        fields = ", ".join(str(e["loc"][0]) for e in exc.errors())
+        return None, f"Invalid value for: {fields}"
+
+    if not payload.name.strip():
+        return None, "Name is required"
+    if payload.role not in ROLES:
+        return None, f"Unknown role '{payload.role}'"
+
+    # Admin can ONLY create Staff in their own department
+    if actor.role == "Admin":
+        if payload.role != "Staff":
+            return None, "Admins can only create Staff users"
+        payload.department = actor.department
+
+    return payload, None
+
+
+def _exists(number: int, payload) -> dict:
+    return {"row": number, "email": payload.email, "error": "Email already exists"}
+
+
+def _insert_chunk(db: Session, valid: list):
+    """
+    Dedupe one chunk against the database, hash and bulk-insert it.
+    Returns (created, skipped-row errors).
+    """
+    # lower() on both sides: SQLite and PostgreSQL compare case-sensitively
+    emails = [p.email.lower() for _, p in valid]
+    existing = set(
+        db.execute(
+            select(func.lower(models.User.email)).where(func.lower(models.User.email).in_(emails))
+        ).scalars()
+    )
+
+    fresh, skipped = [], []
+    for number, payload in valid:
+        if payload.email.lower() in existing:
+            skipped.append(_exists(number, payload))
+        else:
+            fresh.append((number, payload))
+
+    if not fresh:
+        return 0, skipped
+
+    with_password = [p for _, p in fresh if p.password]
+    hashes = dict(zip(
+        (id(p) for p in with_password),
+        hasher.hash_many([p.password for p in with_password]),
+    ))
+
+    rows = [
+        {
+            "name": p.name,
+            "email": p.email,
+            "role": p.role,
+            "department": p.department,
+            "passwordHash": hashes.get(id(p)),
+        }
+        for _, p in fresh
+    ]
+    try:
+        with db.begin_nested():
+            db.execute(insert(models.User), rows)
+        return len(rows), skipped
+    except IntegrityError:
+        pass
+
+    # Someone created some of these emails meanwhile: row by row, so only
+    # the clashing rows are skipped and the rest of the chunk still lands
+    created = 0
+    for (number, payload), row in zip(fresh, rows):
+        try:
+            with db.begin_nested():
+                db.execute(insert(models.User), [row])
+            created += 1
+        except IntegrityError:
+            skipped.append(_exists(number, payload))
+    return created, skipped
+
+
+def import_staff(db: Session, records, actor, start_row: int = 2, chunk_size: int = 500) -> dict:
+    """
+    Import staff rows in chunks, committing after each one. Rows before
+    `start_row` are skipped, so an interrupted import resumes from the
+    `nextRow` of its last report; already-imported emails are reported as
+    skipped rather than failing.
+    """
+    report = {"created": 0, "skipped": 0, "failed": 0, "nextRow": start_row, "errors": []}
+    seen = set()
+    records = (r for r in records if r[0] >= start_row)
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+
+        valid = []
+        for number, record in chunk:
+            payload, error = _validate(number, record, actor)
+            # MySQL's collation compares emails case-insensitively
+            if payload is not None and payload.email.lower() in seen:
+                payload, error = None, "Duplicate email in file"
+
+            if error:
+                report["failed"] += 1
+                report["errors"].append({"row": number, "email": record.get("email"), "error": error})
+                continue
+
+            seen.add(payload.email.lower())
+            valid.append((number, payload))
+
+        if valid:
+            created, skipped = _insert_chunk(db, valid)
+            db.commit()
+
+            report["created"] += created
+            report["skipped"] += len(skipped)
+            report["errors"].extend(skipped)
+
+        report["nextRow"] = chunk[-1][0] + 1
+
+    report["errors"].sort(key=lambda e: e["row"])
+    return report
@@ -0,0 +1,276 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, event, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db import SessionLocal, upsert
+
+log = logging.getLogger(__name__)
+
+summaries = models.ReportSummary.__table__
+reports = models.Report.__table__
+users = models.User.__table__
+claims = models.MaintenanceClaim.__table__
+
+
+# ============================================
+# HELPERS
+# ============================================
+def _capacity():
+    # Department boards keep more than the served size: the org-wide board
+    # is merged from them
+    return settings.LEADERBOARD_SIZE * 2
+
+
+def _rank(best_first: bool):
+    if best_first:
+        return lambda e: (-e["score"], e["userId"])
+    return lambda e: (e["score"], e["userId"])
+
+
+def _department_filter(department: str):
+    if department:
+        return users.c.department == department
+    return or_(users.c.department.is_(None), users.c.department == "")
+
+
+def _replace(db: Session, values: dict):
+    upsert(
+        db,
+        summaries,
+        values,
+        ["department"],
+        lambda new: [(summaries.c[k], new[k]) for k in values if k != "department"],
+    )
+
+
+# ============================================
+# DEFERRED REFRESH (marked by every scored submission)
+# ============================================
+def touch(db: Session, department: str | None):
+    """
+    Mark a department's summary stale. Submissions never write the
+    department row themselves, which would serialize every submission in
+    the department on its lock: the refresher rebuilds it once the
+    session commits.
+    """
+    db.info.setdefault("stale_departments", set()).add(department or "")
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session):
+    stale = session.info.pop("stale_departments", None)
+    if stale:
+        summary_refresher.mark(stale)
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("stale_departments", None)
+
+
+class SummaryRefresher:
+    """
+    Rebuilds the summaries of departments with committed score changes
+    every SUMMARY_REFRESH_INTERVAL seconds, in a transaction of its own.
+    Marks are per worker, so a starting worker rebuilds everything once,
+    covering marks a dead predecessor never got to; when many start at
+    once, the first to claim it does so for all of them.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stale = set()
+        self._everything = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def mark(self, departments):
+        with self._lock:
+            self._stale.update(departments)
+
+    def refresh(self):
+        with self._lock:
+            stale, self._stale = self._stale, set()
+            everything, self._everything = self._everything, False
+        if not (stale or everything):
+            return
+
+        db = SessionLocal()
+        try:
+            if everything and claim_full_rebuild(db):
+                rebuild_summaries(db)
+            else:
+                for department in sorted(stale):
+                    rebuild_department(db, department)
+            db.commit()
+        except Exception:
+            db.rollback()
+            log.exception("Summary refresh failed; retrying %d departments", len(stale))
+            with self._lock:
+                self._stale.update(stale)
+                self._everything = self._everything or everything
+        finally:
+            db.close()
+
+    # ---- background refresher ----
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="summary-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+        self.refresh()
+
+
+# ============================================
+# FULL REBUILDS
+# ============================================
+FULL_REBUILD = "summaries.full_rebuild"
+
+
+def claim_full_rebuild(db: Session) -> bool:
+    """
+    Take the full rebuild in the caller's transaction, so it is released
+    if the rebuild fails. False when another worker holds it or ran one
+    within SUMMARY_FULL_REBUILD_WINDOW seconds.
+    """
+    now = datetime.utcnow()
+    try:
+        with db.begin_nested():
+            db.execute(insert(claims).values(name=FULL_REBUILD, claimedAt=now))
+        return True
+    except IntegrityError:
+        pass
+
+    stale = now - timedelta(seconds=settings.SUMMARY_FULL_REBUILD_WINDOW)
+    return db.execute(
+        update(claims)
+        .where(claims.c.name == FULL_REBUILD, claims.c.claimedAt < stale)
+        .values(claimedAt=now)
+    ).rowcount > 0
+
+
+def rebuild_department(db: Session, department: str | None):
+    """Recompute one department's summary from its users' reports."""
+    department = department or ""
+    joined = reports.join(users, reports.c.userId == users.c.userId)
+    in_department = _department_filter(department)
+
+    participants, total, correct, score_sum = db.execute(
+        select(
+            func.count(reports.c.reportId),
+            func.coalesce(func.sum(reports.c.totalAttempts), 0),
+            func.coalesce(func.sum(reports.c.correctCount), 0),
+            func.coalesce(func.sum(reports.c.awarenessScore), 0.0),
+        )
+        .select_from(joined)
+        .where(in_department)
+    ).one()
+
+    if not participants:
+        db.execute(delete(summaries).where(summaries.c.department == department))
+        return
+
+    def board(order):
+        rows = db.execute(
+            select(users.c.userId, users.c.name, reports.c.awarenessScore)
+            .select_from(joined)
+            .where(in_department)
+            .order_by(order, users.c.userId)
+            .limit(_capacity())
+        ).all()
+        return [{"userId": r[0], "name": r[1], "score": r[2]} for r in rows]
+
+    _replace(db, {
+        "department": department,
+        "participants": participants,
+        "totalAttempts": total,
+        "correctCount": correct,
+        "scoreSum": score_sum,
+        "averageScore": round(score_sum / participants, 1),
+        "topUsers": board(reports.c.awarenessScore.desc()),
+        "bottomUsers": board(reports.c.awarenessScore.asc()),
+    })
+
+
+def rebuild_summaries(db: Session):
+    """Recompute every department summary."""
+    departments = db.execute(
+        select(func.coalesce(users.c.department, "")).distinct()
+        .select_from(reports.join(users, reports.c.userId == users.c.userId))
+    ).scalars().all()
+
+    db.execute(delete(summaries))
+    for department in departments:
+        rebuild_department(db, department)
+
+    return len(departments)
+
+
+# ============================================
+# READ
+# ============================================
+def _out(scope: str, row, top: list, bottom: list):
+    n = settings.LEADERBOARD_SIZE
+    return {
+        "scope": scope,
+        "participants": row["participants"],
+        "totalAttempts": row["totalAttempts"],
+        "correctCount": row["correctCount"],
+        "averageScore": row["averageScore"],
+        "top": top[:n],
+        "bottom": bottom[:n],
+    }
+
+
+def organization_summary(rows: list):
+    """
+    Merge department rows into the org-wide rollup. The org's best N users
+    are always among the departments' best N, so this never reads reports.
+    """
+    participants = sum(r["participants"] for r in rows)
+    score_sum = sum(r["scoreSum"] for r in rows)
+    top = sorted((e for r in rows for e in r["topUsers"] or []), key=_rank(True))
+    bottom = sorted((e for r in rows for e in r["bottomUsers"] or []), key=_rank(False))
+
+    return _out(
+        "organization",
+        {
+            "participants": participants,
+            "totalAttempts": sum(r["totalAttempts"] for r in rows),
+            "correctCount": sum(r["correctCount"] for r in rows),
+            "averageScore": round(score_sum / participants, 1) if participants else 0.0,
+        },
+        top,
+        bottom,
+    )
+
+
+def department_summaries(db: Session, department: str | None = None):
+    query = select(summaries).order_by(summaries.c.department)
+    if department is not None:
+        query = query.where(summaries.c.department == department)
+    return [dict(r) for r in db.execute(query).mappings()]
+
+
+def department_out(row):
+    return _out(row["department"], row, row["topUsers"] or [], row["bottomUsers"] or [])
+
+
+summary_refresher = SummaryRefresher(settings.SUMMARY_REFRESH_INTERVAL)
@@ -0,0 +1,58 @@
+# archive_attempts.py
+#
+# Moves quiz attempts older than ARCHIVE_AFTER_DAYS (whole months) from
+# quiz_attempts into quiz_attempts_archive. Reports, progress and rollups
+# already hold their totals, and their rebuilds read both tables. On a
+# partitioned MySQL table it then drops the emptied monthly partitions and
+# adds the ones coming up. Run it from cron, e.g. nightly.
+#
+#   python archive_attempts.py [--dry-run]
+
+import argparse
+
+from sqlalchemy import exists, func, select
+
+from app import models
+from app.db import SessionLocal
+from app.services import archive
+from app.services.rollups import rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old quiz attempts")
+    parser.add_argument("--dry-run", action="store_true", help="only count what would move")
+    args = parser.parse_args()
+
+    cutoff = archive.archive_cutoff()
+    attempts = models.QuizAttempt
+    db = SessionLocal()
+
+    try:
+        if args.dry_run:
+            count = db.scalar(
+                select(func.count()).select_from(attempts).where(attempts.createdAt < cutoff)
+            )
+            print(f"{count} attempts created before {cutoff} would be archived")
+            return
+
+        # Archived attempts only reach the rollups through a rebuild: make
+        # sure they were folded in at least once (backfill_rollups.py)
+        if not db.scalar(select(exists().select_from(models.AttemptRollup))):
+            print(f"✅ Backfilled {rebuild_rollups(db)} rollup buckets first")
+            db.commit()
+
+        moved = archive.archive_attempts(db, cutoff)
+        print(f"✅ Archived {moved} attempts created before {cutoff}")
+
+        dropped = archive.drop_partitions(db, cutoff)
+        added = archive.add_partitions(db)
+        db.commit()
+        if dropped:
+            print(f"✅ Dropped partitions {', '.join(dropped)}")
+        if added:
+            print(f"✅ Added partitions {', '.join(added)}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
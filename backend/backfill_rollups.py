@@ -0,0 +1,24 @@
+# backfill_rollups.py
+#
+# One-time fill of attempt_rollups from quiz_attempts (after the migration
+# that creates it). Submissions keep the buckets current from then on.
+# Replaces every bucket in one transaction: attempts recorded while it
+# runs may be counted twice or missed, so run it before traffic resumes.
+
+from app.db import SessionLocal
+from app.services.rollups import rebuild_rollups
+
+
+def main():
+    db = SessionLocal()
+
+    try:
+        count = rebuild_rollups(db)
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"✅ Rebuilt {count} day / week / month buckets from quiz_attempts")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/compare.py
+#
+# Compares two reports written by benchmarks.run, endpoint by endpoint.
+#
+#   python -m benchmarks.compare base.json head.json [--fail-over PCT]
+#
+# With --fail-over, exits 1 when any endpoint's p95 grew by more than PCT
+# percent (endpoints missing from either report are listed, not judged).
+
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput")
+
+
+def change(old, new) -> str:
+    if not old or new is None:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--fail-over", type=float, help="max allowed p95 growth in percent")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.head, encoding="utf-8") as f:
+        head = json.load(f)
+
+    print(f"base {base['meta'].get('commit')}  →  head {head['meta'].get('commit')}")
+    regressions = []
+
+    for phase in sorted(set(base["phases"]) | set(head["phases"])):
+        old_phase = base["phases"].get(phase, {})
+        new_phase = head["phases"].get(phase, {})
+        print(f"\n[{phase}]")
+
+        for label in sorted(set(old_phase) | set(new_phase)):
+            old, new = old_phase.get(label), new_phase.get(label)
+            if old is None or new is None:
+                print(f"  {label}: only in {'head' if old is None else 'base'}")
+                continue
+
+            print(f"  {label}")
+            for metric in METRICS:
+                print(f"    {metric:<11} {old[metric]:>10} → {new[metric]:>10}  {change(old[metric], new[metric])}")
+            if new["errors"] != old["errors"]:
+                print(f"    errors      {old['errors']:>10} → {new['errors']:>10}")
+
+            if args.fail_over is not None and old["p95_ms"]:
+                growth = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+                if growth > args.fail_over:
+                    regressions.append(f"{phase} {label}: p95 {growth:+.1f}%")
+
+    if regressions:
+        print("\n❌ p95 regressions over {:.0f}%:".format(args.fail_over))
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
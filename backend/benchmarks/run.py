@@ -0,0 +1,290 @@
+# benchmarks/run.py
+#
+# Seeds a database and drives the API with a mixed workload, then reports
+# latency percentiles and throughput per endpoint as JSON.
+#
+#   python -m benchmarks.run [--users N] [--duration S] [--out FILE]
+#   python -m benchmarks.compare base.json head.json
+#
+# By default the app runs in-process on a fresh SQLite file (one worker,
+# no network). Pass --url to load a running server instead; it must use
+# the database given by --database-url, which has to start empty.
+#
+# Phases:
+#   login burst – --burst logins of distinct staff users at once
+#   mixed       – --concurrency virtual users for --duration seconds, each
+#                 picking a scenario by --mix weight:
+#                   quiz     quiz session, then the answers as one batch
+#                   reports  admin report list and department summary
+#                   download policy download
+#                   login    a fresh login
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+DEFAULT_MIX = "quiz=5,reports=2,download=2,login=1"
+
+
+# ============================================================
+# RECORDING
+# ============================================================
+class Recorder:
+    """Latencies (seconds) and failures per endpoint label."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.latencies[label].append(time.perf_counter() - start)
+        if response is None or response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+
+def percentile(ordered: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, -(-len(ordered) * p // 100))   # ceil without floats
+    return ordered[int(rank) - 1]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    out = {}
+    for label in sorted(recorder.latencies):
+        ordered = sorted(recorder.latencies[label])
+        ms = lambda s: round(s * 1000, 3)  # noqa: E731
+        out[label] = {
+            "count": len(ordered),
+            "errors": recorder.errors[label],
+            "throughput": round(len(ordered) / elapsed, 2) if elapsed else None,
+            "mean_ms": ms(sum(ordered) / len(ordered)),
+            "p50_ms": ms(percentile(ordered, 50)),
+            "p95_ms": ms(percentile(ordered, 95)),
+            "p99_ms": ms(percentile(ordered, 99)),
+            "max_ms": ms(ordered[-1]),
+        }
+    return out
+
+
+# ============================================================
+# SCENARIOS
+# ============================================================
+class Workload:
+    def __init__(self, fixture, password: str, rng: random.Random, quiz_size: int):
+        self.fixture = fixture
+        self.password = password
+        self.rng = rng
+        self.quiz_size = quiz_size
+        self.tokens = {}   # email -> bearer token
+
+    def auth(self, email: str) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[email]}"}
+
+    async def login(self, client, rec: Recorder, email: str):
+        r = await rec.call(client, "POST /api/auth/login", "POST", "/api/auth/login",
+                           json={"email": email, "password": self.password})
+        if r is not None and r.status_code == 200:
+            self.tokens[email] = r.json()["token"]
+
+    async def quiz(self, client, rec: Recorder):
+        user_id, _ = self.rng.choice(self.fixture.staff)
+        topic_id = self.rng.choice(self.fixture.topics)
+        r = await rec.call(client, "GET /api/topics/{topicId}/quiz-session", "GET",
+                           f"/api/topics/{topic_id}/quiz-session", params={"count": self.quiz_size})
+        if r is None or r.status_code != 200:
+            return
+        answers = [
+            {"quizId": q["quizId"], "selectedAnswer": self.rng.choice(q["options"])["key"]}
+            for q in r.json()["questions"]
+        ]
+        if answers:
+            await rec.call(client, "POST /api/attempts/batch", "POST", "/api/attempts/batch",
+                           json={"userId": user_id, "answers": answers})
+
+    async def reports(self, client, rec: Recorder):
+        admins = [email for _, email in self.fixture.admins] + [self.fixture.superadmin]
+        email = self.rng.choice([e for e in admins if e in self.tokens] or [None])
+        if email is None:
+            return
+        await rec.call(client, "GET /api/reports", "GET", "/api/reports",
+                       params={"limit": 50}, headers=self.auth(email))
+        await rec.call(client, "GET /api/reports/summary", "GET", "/api/reports/summary",
+                       headers=self.auth(email))
+
+    async def download(self, client, rec: Recorder):
+        email = self.rng.choice(list(self.tokens) or [None])
+        if email is None or not self.fixture.policies:
+            return
+        policy_id = self.rng.choice(self.fixture.policies)
+        await rec.call(client, "GET /api/policies/{policyId}/download", "GET",
+                       f"/api/policies/{policy_id}/download", headers=self.auth(email))
+
+    async def fresh_login(self, client, rec: Recorder):
+        await self.login(client, rec, self.rng.choice(self.fixture.staff)[1])
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {"quiz", "reports", "download", "login"}
+    if unknown:
+        raise SystemExit(f"Unknown scenarios in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+async def run_phases(client: httpx.AsyncClient, workload: Workload, args) -> dict:
+    fixture = workload.fixture
+    results = {}
+
+    # ------------------------- login burst
+    rec = Recorder()
+    admins = [email for _, email in fixture.admins] + [fixture.superadmin]
+    burst = [email for _, email in fixture.staff[:args.burst]]
+    start = time.perf_counter()
+    await asyncio.gather(*(workload.login(client, rec, email) for email in admins + burst))
+    results["login_burst"] = summarize(rec, time.perf_counter() - start)
+
+    # ------------------------- mixed
+    mix = parse_mix(args.mix)
+    scenarios = {
+        "quiz": workload.quiz if fixture.topics else None,
+        "reports": workload.reports,
+        "download": workload.download,
+        "login": workload.fresh_login,
+    }
+    names = [n for n in mix if scenarios[n] is not None]
+    weights = [mix[n] for n in names]
+
+    rec = Recorder()
+    deadline = time.perf_counter() + args.duration
+
+    async def virtual_user():
+        while time.perf_counter() < deadline:
+            scenario = scenarios[workload.rng.choices(names, weights)[0]]
+            await scenario(client, rec)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(args.concurrency)))
+    results["mixed"] = summarize(rec, time.perf_counter() - start)
+    return results
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def drive(args, fixture, password: str) -> dict:
+    workload = Workload(fixture, password, random.Random(args.seed), args.quiz_size)
+    timeout = httpx.Timeout(60.0)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+            return await run_phases(client, workload, args)
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+            # Warm up lazy routers and caches so the first samples are not outliers
+            await client.get("/api/ping")
+            return await run_phases(client, workload, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a database and benchmark the API")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--topics", type=int, default=20)
+    parser.add_argument("--quizzes-per-topic", type=int, default=30)
+    parser.add_argument("--attempts", type=int, default=50000)
+    parser.add_argument("--policies", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=50, help="logins in the login burst")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users in the mixed phase")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of mixed load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario weights")
+    parser.add_argument("--quiz-size", type=int, default=10, help="questions per quiz session")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for data and workload")
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--database-url", help="defaults to a fresh SQLite file")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    if args.url and not args.database_url:
+        raise SystemExit("--url needs --database-url: the database the server uses")
+
+    # Settings are read at import time: configure before touching app.*
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SCHEMA_MODE", "create")
+
+    from app.db import engine
+    from benchmarks.seed import PASSWORD, seed
+
+    started = time.perf_counter()
+    fixture = seed(
+        engine,
+        users=args.users,
+        topics=args.topics,
+        quizzes_per_topic=args.quizzes_per_topic,
+        attempts=args.attempts,
+        policies=args.policies,
+        files_dir=os.path.join(workdir, "files"),
+        rng=random.Random(args.seed),
+    )
+    seed_seconds = time.perf_counter() - started
+    print(f"Seeded {database_url} in {seed_seconds:.1f}s", file=sys.stderr)
+
+    phases = asyncio.run(drive(args, fixture, PASSWORD))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "target": args.url or "in-process",
+            "database": engine.dialect.name,
+            "seedSeconds": round(seed_seconds, 2),
+            "options": {k: v for k, v in vars(args).items() if k not in ("out", "database_url")},
+        },
+        "phases": phases,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Wrote {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# benchmarks/seed.py
+#
+# Fills an empty database with synthetic users, topics, quizzes, attempts
+# and policies for the benchmark runner. Everything is derived from one
+# random seed, so two runs with the same options see the same data.
+
+import os
+import random
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.security import hasher
+from app.db import Base
+from app.services.scores import rebuild_reports
+from app.services.summaries import rebuild_summaries
+
+PASSWORD = "Bench@12345"
+DEPARTMENTS = ["IT", "Finance", "HR", "Operations", "Sales", "Legal"]
+CATEGORIES = ["Email", "Passwords", "Devices", "Social Engineering", "Data Handling"]
+LETTERS = "ABCD"
+CHUNK = 5000
+
+# Smallest well-formed one-page PDF; downloads only move bytes
+PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+class Fixture(NamedTuple):
+    staff: list          # [(userId, email)]
+    admins: list         # [(userId, email)], one per department
+    superadmin: str      # email
+    topics: list         # topicIds that have quizzes
+    policies: list       # policyIds
+
+
+def _bulk(db: Session, table, rows: list):
+    for i in range(0, len(rows), CHUNK):
+        db.execute(insert(table), rows[i:i + CHUNK])
+
+
+def seed(
+    engine,
+    *,
+    users: int,
+    topics: int,
+    quizzes_per_topic: int,
+    attempts: int,
+    policies: int,
+    files_dir: str,
+    rng: random.Random,
+) -> Fixture:
+    """Create the schema and the data set; refuses a database that has users."""
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        if db.scalar(select(func.count()).select_from(models.User)):
+            raise SystemExit("Benchmarks need an empty database: users already exist")
+
+        # One bcrypt hash for everybody: seeding should not take minutes,
+        # logins still pay the configured cost
+        password_hash = hasher.hash(PASSWORD)
+
+        people = [{
+            "name": "Bench SuperAdmin", "email": "superadmin@bench.example.com",
+            "passwordHash": password_hash, "role": "SuperAdmin", "department": "IT",
+        }]
+        people += [{
+            "name": f"Bench Admin {d}", "email": f"admin.{d.lower()}@bench.example.com",
+            "passwordHash": password_hash, "role": "Admin", "department": d,
+        } for d in DEPARTMENTS]
+        people += [{
+            "name": f"Bench Staff {i}", "email": f"staff{i}@bench.example.com",
+            "passwordHash": password_hash, "role": "Staff",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+        } for i in range(users)]
+        _bulk(db, models.User.__table__, people)
+
+        _bulk(db, models.Topic.__table__, [{
+            "title": f"Topic {i}",
+            "description": f"Synthetic awareness topic {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+        } for i in range(topics)])
+        topic_ids = db.scalars(select(models.Topic.topicId).order_by(models.Topic.topicId)).all()
+
+        _bulk(db, models.Quiz.__table__, [{
+            "question": f"Question {n} of topic {topic_id}?",
+            "optionA": "First answer", "optionB": "Second answer",
+            "optionC": "Third answer", "optionD": "Fourth answer",
+            "correctAnswer": rng.choice(LETTERS),
+            "topicId": topic_id,
+        } for topic_id in topic_ids for n in range(quizzes_per_topic)])
+
+        accounts = db.execute(
+            select(models.User.userId, models.User.email, models.User.role)
+            .order_by(models.User.userId)
+        ).all()
+        staff = [(u.userId, u.email) for u in accounts if u.role == "Staff"]
+        admins = [(u.userId, u.email) for u in accounts if u.role == "Admin"]
+
+        quiz_ids = db.scalars(select(models.Quiz.quizId)).all()
+        if staff and quiz_ids:
+            now = datetime.utcnow()
+            _bulk(db, models.QuizAttempt.__table__, [{
+                "userId": rng.choice(staff)[0],
+                "quizId": rng.choice(quiz_ids),
+                "selectedAnswer": rng.choice(LETTERS),
+                "isCorrect": int(rng.random() < 0.7),
+                "createdAt": now - timedelta(minutes=rng.randrange(180 * 24 * 60)),
+            } for _ in range(attempts)])
+
+        os.makedirs(files_dir, exist_ok=True)
+        path = os.path.abspath(os.path.join(files_dir, "policy.pdf"))
+        with open(path, "wb") as f:
+            f.write(PDF)
+        _bulk(db, models.Policy.__table__, [{
+            "title": f"Policy {i}", "description": "Synthetic policy",
+            "filePath": path, "fileName": f"policy-{i}.pdf", "fileSize": len(PDF),
+            "uploadedBy": "superadmin@bench.example.com", "createdAt": datetime.utcnow(),
+            "downloadCount": 0, "hasThumbnail": False,
+        } for i in range(policies)])
+        policy_ids = db.scalars(select(models.Policy.policyId)).all()
+
+        rebuild_reports(db)
+        rebuild_summaries(db)
+        db.commit()
+
+    return Fixture(
+        staff=staff,
+        admins=admins,
+        superadmin="superadmin@bench.example.com",
+        topics=list(topic_ids) if quizzes_per_topic else [],
+        policies=list(policy_ids),
+    )
@@ -0,0 +1,184 @@
+# check_query_plans.py
+#
+# Runs EXPLAIN for the queries the routers issue and fails when one of them
+# falls back to a full table scan. Point DATABASE_URL at a migrated database
+# (ideally with realistic data: MySQL may rightly scan a near-empty table).
+#
+#   python check_query_plans.py [--min-rows N]
+
+import argparse
+import sys
+from datetime import date, datetime
+
+from sqlalchemy import func, select
+
+from app.db import engine
+from app import models
+
+User, Report, Quiz, Attempt = models.User, models.Report, models.Quiz, models.QuizAttempt
+Policy, Topic, Tip = models.Policy, models.Topic, models.AwarenessTip
+Stat = models.PolicyDownloadStat
+Progress = models.UserTopicProgress
+Rollup = models.AttemptRollup
+Archive = models.QuizAttemptArchive
+
+LIMIT = 101
+SINCE = datetime(2024, 1, 1)
+
+
+# ============================================================
+# QUERIES — (name, statement, scan allowed)
+# "scan allowed" marks unfiltered list pages: they walk a table in key
+# order and stop at LIMIT, which is what we want.
+# ============================================================
+QUERIES = [
+    ("auth.login",
+     select(User).where(User.email == "someone@example.com"), False),
+    ("auth.superadmin_exists",
+     select(User).where(User.role == "SuperAdmin").limit(1), False),
+
+    ("staff.list.department",
+     select(User).where(User.department == "IT").order_by(User.userId).limit(LIMIT), False),
+    ("staff.list.department_role",
+     select(User).where(User.department == "IT", User.role == "Staff")
+     .order_by(User.userId).limit(LIMIT), False),
+    ("staff.list.all",
+     select(User).order_by(User.userId).limit(LIMIT), True),
+
+    ("reports.list.all",
+     select(Report).order_by(Report.createdAt.desc(), Report.reportId.desc()).limit(LIMIT), True),
+    ("reports.list.department",
+     select(Report).join(User, Report.userId == User.userId)
+     .where(User.department == "IT")
+     .order_by(Report.createdAt.desc(), Report.reportId.desc()).limit(LIMIT), False),
+    ("reports.list.own",
+     select(Report).where(Report.userId == 1), False),
+    ("reports.list.since",
+     select(Report).where(Report.createdAt >= SINCE)
+     .order_by(Report.createdAt.desc(), Report.reportId.desc()).limit(LIMIT), False),
+
+    ("quizzes.by_topic",
+     select(Quiz).where(Quiz.topicId == 1).order_by(Quiz.quizId).limit(LIMIT), False),
+    ("quizzes.delete.attempts_exist",
+     select(Attempt).where(Attempt.quizId == 1).limit(1), False),
+    ("quizzes.delete.archived_attempts_exist",
+     select(Archive).where(Archive.quizId == 1).limit(1), False),
+    ("staff.delete.archived_attempts",
+     select(Archive.attemptId).where(Archive.userId == 1), False),
+    ("attempts.by_user",
+     select(Attempt).where(Attempt.userId == 1).order_by(Attempt.createdAt.desc()), False),
+    ("attempts.score_quizzes",
+     select(Quiz.quizId, Quiz.correctAnswer).where(Quiz.quizId.in_([1, 2, 3])), False),
+
+    ("topics.by_category",
+     select(Topic).where(Topic.category == "Email").order_by(Topic.topicId.desc()).limit(LIMIT), False),
+    ("tips.by_category",
+     select(Tip).where(Tip.category == "Email").order_by(Tip.tipId.desc()).limit(LIMIT), False),
+
+    ("policies.list",
+     select(Policy).order_by(Policy.createdAt.desc(), Policy.policyId.desc()).limit(LIMIT), True),
+    ("policies.list.since",
+     select(Policy).where(Policy.createdAt >= SINCE)
+     .order_by(Policy.createdAt.desc(), Policy.policyId.desc()).limit(LIMIT), False),
+    ("policies.delete.shared_file",
+     select(Policy.policyId).where(Policy.filePath == "app/uploads/policies/x.pdf", Policy.policyId != 1)
+     .limit(1), False),
+    ("policies.by_content_hash",
+     select(Policy).where(Policy.contentHash == "0" * 64), False),
+    ("policies.stats.policy",
+     select(Stat).where(Stat.policyId == 1).order_by(Stat.day), False),
+    ("policies.stats.days",
+     select(Stat).where(Stat.day >= date(2024, 1, 1), Stat.day <= date(2024, 1, 31)), False),
+
+    ("progress.by_user",
+     select(Progress).where(Progress.userId == 1).order_by(Progress.topicId), False),
+    ("progress.by_department",
+     select(Progress).join(User, Progress.userId == User.userId).where(User.department == "IT"), False),
+
+    ("trends.series",
+     select(Rollup).where(Rollup.period == "week", Rollup.scope == "department", Rollup.scopeKey == "IT",
+                          Rollup.bucket >= date(2024, 1, 1), Rollup.bucket <= date(2025, 1, 1)), False),
+    ("trends.organization",
+     select(Rollup.bucket, func.sum(Rollup.attempts))
+     .where(Rollup.period == "week", Rollup.scope == "department",
+            Rollup.bucket >= date(2024, 1, 1), Rollup.bucket <= date(2025, 1, 1))
+     .group_by(Rollup.bucket), False),
+    ("trends.fold",
+     select(models.AttemptRollupDelta).order_by(models.AttemptRollupDelta.deltaId).limit(LIMIT), True),
+]
+
+
+# ============================================================
+# EXPLAIN PER DIALECT → list of (table, full scan?, rows, detail)
+# ============================================================
+def _explain(conn, stmt):
+    compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positiontup is not None:
+        params = tuple(params[k] for k in compiled.positiontup)
+
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).all()
+        steps = []
+        for row in rows:
+            detail = row[-1]
+            if detail.startswith("SCAN "):
+                words = detail.split()
+                table = words[2] if words[1] == "TABLE" else words[1]   # older SQLite says "SCAN TABLE t"
+                # "SCAN t USING [COVERING] INDEX ..." walks an index in order
+                steps.append((table, "USING" not in detail, None, detail))
+        return steps
+
+    if dialect == "mysql":
+        rows = conn.exec_driver_sql("EXPLAIN " + str(compiled), params).mappings().all()
+        return [
+            (r["table"], r["type"] in ("ALL", "index"), r["rows"], f"type={r['type']} key={r['key']}")
+            for r in rows
+            if r["table"]
+        ]
+
+    if dialect == "postgresql":
+        rows = conn.exec_driver_sql("EXPLAIN " + str(compiled), params).all()
+        return [
+            (line.split(" on ")[1].split()[0], True, None, line.strip())
+            for (line,) in rows
+            if "Seq Scan on" in line
+        ]
+
+    raise SystemExit(f"EXPLAIN is not supported for dialect '{dialect}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail on router queries that full-scan a table")
+    parser.add_argument(
+        "--min-rows", type=int, default=0,
+        help="ignore scans the planner estimates at fewer rows than this (MySQL)",
+    )
+    args = parser.parse_args()
+
+    failures = 0
+    with engine.connect() as conn:
+        for name, stmt, scan_ok in QUERIES:
+            scans = [
+                s for s in _explain(conn, stmt)
+                if s[1] and (s[2] is None or s[2] >= args.min_rows)
+            ]
+            if not scans:
+                print(f"✅ {name}")
+            elif scan_ok:
+                print(f"✅ {name} (ordered scan, bounded by LIMIT)")
+            else:
+                failures += 1
+                for table, _, rows, detail in scans:
+                    estimate = f", ~{rows} rows" if rows is not None else ""
+                    print(f"❌ {name}: full scan of {table}{estimate} ({detail})")
+
+    if failures:
+        print(f"\n{failures} of {len(QUERIES)} queries fall back to a full table scan")
+        sys.exit(1)
+    print(f"\nAll {len(QUERIES)} query plans use an index")
+
+
+if __name__ == "__main__":
+    main()
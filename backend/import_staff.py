@@ -0,0 +1,48 @@
+# import_staff.py
+#
+#   python import_staff.py staff.csv [--actor admin@example.com] [--start-row N]
+
+import argparse
+import json
+
+from app.db import SessionLocal
+from app.models import User
+from app.services.staff_import import ImportFormatError, import_staff, read_sheet
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import staff from CSV or XLSX")
+    parser.add_argument("path")
+    parser.add_argument("--actor", default="superadmin@system.com",
+                        help="email of the user the import runs as (Admin rules apply)")
+    parser.add_argument("--start-row", type=int, default=2,
+                        help="resume from this row (the 'nextRow' of a previous run)")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        actor = db.query(User).filter(User.email == args.actor).first()
+        if not actor:
+            print(f"❌ Actor {args.actor} not found")
+            return
+
+        with open(args.path, "rb") as fh:
+            report = import_staff(
+                db,
+                read_sheet(fh, args.path),
+                actor,
+                start_row=args.start_row,
+                chunk_size=args.chunk_size,
+            )
+    except ImportFormatError as exc:
+        print(f"❌ {exc}")
+        return
+    finally:
+        db.close()
+
+    print(json.dumps(report, indent=2))
+    print(f"✅ Created {report['created']}, skipped {report['skipped']}, failed {report['failed']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# recompute_reports.py
+
+from app.db import SessionLocal
+from app.services.progress import rebuild_progress
+from app.services.scores import rebuild_reports
+from app.services.summaries import rebuild_summaries
+
+
+def main():
+    db = SessionLocal()
+
+    try:
+        count = rebuild_reports(db)
+        departments = rebuild_summaries(db)
+        progress = rebuild_progress(db)
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"✅ Rebuilt {count} reports from quiz_attempts")
+    print(f"✅ Rebuilt summaries for {departments} departments")
+    print(f"✅ Rebuilt {progress} user/topic progress rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+# Settings are read at import: point the app at a throwaway SQLite file first
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+import pytest
+
+from app.db import Base, SessionLocal, engine
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
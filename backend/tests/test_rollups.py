@@ -0,0 +1,69 @@
+from datetime import date, datetime
+
+from sqlalchemy import func, select
+
+from app import models
+from app.db import SessionLocal
+from app.services import rollups, scores
+
+DAY = datetime(2026, 3, 4, 10, 0)
+
+
+def _seed(db):
+    topic = models.Topic(title="Phishing")
+    db.add(topic)
+    db.flush()
+    users = [
+        models.User(name="Ada", email="ada@example.com", role="Staff", department="IT"),
+        models.User(name="Bo", email="bo@example.com", role="Staff", department="HR"),
+    ]
+    db.add_all(users)
+    db.commit()
+    return topic.topicId, [u.userId for u in users]
+
+
+def _submit(user_id, topic_id, commit):
+    """Apply one submission; return the rollup rows its transaction wrote."""
+    db = SessionLocal()
+    try:
+        user = db.get(models.User, user_id)
+        scores.apply_attempts(db, user, [(topic_id, 1), (topic_id, 0)], DAY)
+        written = {
+            (row.period, row.scope, row.scopeKey, row.bucket)
+            for row in db.execute(select(rollups.rollups))
+        }
+        db.commit() if commit else db.rollback()
+        return written
+    finally:
+        db.close()
+
+
+def test_submissions_from_two_departments_share_no_rollup_rows(db):
+    topic_id, (it_user, hr_user) = _seed(db)
+
+    it_rows = _submit(it_user, topic_id, commit=False)
+    hr_rows = _submit(hr_user, topic_id, commit=False)
+
+    assert it_rows and hr_rows
+    assert {scope for _, scope, _, _ in it_rows | hr_rows} == {"user"}
+    assert not it_rows & hr_rows
+
+
+def test_fold_adds_department_and_topic_deltas(db):
+    topic_id, (it_user, hr_user) = _seed(db)
+    _submit(it_user, topic_id, commit=True)
+    _submit(hr_user, topic_id, commit=True)
+    _submit(it_user, topic_id, commit=True)
+
+    assert db.scalar(select(func.count()).select_from(rollups.deltas)) == 6
+    assert rollups.RollupFolder(interval=1).fold() == 6
+    assert db.scalar(select(func.count()).select_from(rollups.deltas)) == 0
+
+    def series(scope, key, period="day"):
+        return rollups.trend(db, period, scope, key, DAY.date(), DAY.date())[0]
+
+    assert series("department", "IT")["attempts"] == 4
+    assert series("department", "HR")["correctCount"] == 1
+    assert series("topic", str(topic_id))["attempts"] == 6
+    assert series("topic", str(topic_id), "month")["bucket"] == date(2026, 3, 1)
+    assert series("organization", None, "week")["attempts"] == 6
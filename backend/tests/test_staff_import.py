@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+
+from sqlalchemy import func, select
+
+from app import models
+from app.services.staff_import import import_staff
+
+SUPERADMIN = SimpleNamespace(role="SuperAdmin", department=None)
+
+
+def test_existing_email_in_other_case_is_skipped(db):
+    db.add(models.User(name="Ada", email="Ada.Lovelace@example.com", role="Staff"))
+    db.commit()
+
+    records = [
+        (2, {"name": "Ada again", "email": "ada.lovelace@EXAMPLE.com"}),
+        (3, {"name": "Bo", "email": "Bo@example.com"}),
+    ]
+    report = import_staff(db, records, SUPERADMIN)
+
+    assert (report["created"], report["skipped"], report["failed"]) == (1, 1, 0)
+    assert report["errors"][0]["row"] == 2
+    emails = db.execute(select(func.lower(models.User.email))).scalars().all()
+    assert sorted(emails) == ["ada.lovelace@example.com", "bo@example.com"]